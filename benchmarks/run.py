@@ -0,0 +1,219 @@
+"""Maroon benchmark harness.
+
+Run every workload in-process with warmup and repeats and write JSON results:
+
+    python benchmarks/run.py -o results.json
+
+Compare two result files and flag regressions:
+
+    python benchmarks/run.py compare base.json new.json --threshold 0.10
+
+Each workload states the work it does in a header line, so statement and
+call rates mean the same on every build however it runs the script:
+
+    # work: 35007 statements, 0 voyage calls
+
+Print the header for each workload (after adding or changing one):
+
+    python benchmarks/run.py work
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKLOADS = os.path.join(ROOT, 'benchmarks', 'workloads')
+sys.path.insert(0, ROOT)
+
+from src.interpreter import PirateInterpreter
+
+WORK = re.compile(r'^#\s*work:\s*(\d+)\s+statements,\s*(\d+)\s+voyage calls$')
+
+def load_workloads(names=None):
+    workloads = {}
+    for path in sorted(glob.glob(os.path.join(WORKLOADS, '*.maroon'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if not names or name in names:
+            with open(path) as f:
+                workloads[name] = f.read().splitlines()
+    return workloads
+
+def fresh_interpreter():
+    interpreter = PirateInterpreter()
+    interpreter.output_sink = lambda message: None
+    interpreter.error_log = []
+    interpreter.search_dir = WORKLOADS
+    return interpreter
+
+def declared_work(name, lines):
+    for line in lines:
+        match = WORK.match(line.strip())
+        if match:
+            return int(match.group(1)), int(match.group(2))
+    raise ValueError(f"workload {name} has no '# work:' header; run 'benchmarks/run.py work'")
+
+def count_work(lines):
+    """Source statements and voyage calls a plain run executes, as the profiler counts them.
+
+    Every line run counts once, loop actions and voyage return lines
+    included, whatever inlining or batching does with it.
+    """
+    interpreter = fresh_interpreter()
+    with interpreter.profile() as profiler:
+        for _ in interpreter.execute_lines(lines):
+            pass
+    return (sum(stats.count for stats in profiler.lines.values()),
+            sum(stats.count for stats in profiler.voyages.values()))
+
+def run_once(lines):
+    interpreter = fresh_interpreter()
+    start = time.perf_counter()
+    for _ in interpreter.execute_lines(lines):
+        pass
+    elapsed = time.perf_counter() - start
+    if interpreter.error_log:
+        raise RuntimeError(f"workload raised: {interpreter.error_log[0]}")
+    return elapsed
+
+def peak_memory(lines):
+    tracemalloc.start()
+    try:
+        run_once(lines)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure_startup(repeat):
+    command = [sys.executable, '-c', 'from src.interpreter import PirateInterpreter; PirateInterpreter()']
+    process_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True)
+        process_times.append(time.perf_counter() - start)
+    construct_times = []
+    for _ in range(repeat * 10):
+        start = time.perf_counter()
+        PirateInterpreter()
+        construct_times.append(time.perf_counter() - start)
+    return {
+        'process_s': statistics.median(process_times),
+        'interpreter_s': statistics.median(construct_times),
+    }
+
+def bench_workload(name, lines, warmup, repeat):
+    statements, calls = declared_work(name, lines)
+    for _ in range(warmup):
+        run_once(lines)
+    times = [run_once(lines) for _ in range(repeat)]
+    median = statistics.median(times)
+    return {
+        'median_s': median,
+        'min_s': min(times),
+        'max_s': max(times),
+        'repeat': repeat,
+        'statements': statements,
+        'calls': calls,
+        'statements_per_s': statements / median if median else None,
+        'calls_per_s': calls / median if median and calls else None,
+        'peak_memory_bytes': peak_memory(lines),
+    }
+
+def run(args):
+    workloads = load_workloads(args.only)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'warmup': args.warmup,
+            'repeat': args.repeat,
+        },
+        'startup': measure_startup(args.startup_repeat),
+        'workloads': {},
+    }
+    for name, lines in workloads.items():
+        result = bench_workload(name, lines, args.warmup, args.repeat)
+        results['workloads'][name] = result
+        print(f"{name:<20} {result['median_s'] * 1000:>9.2f} ms  "
+              f"{result['statements_per_s'] or 0:>12,.0f} stmt/s  "
+              f"{(result['peak_memory_bytes'] or 0) / 1024:>9.1f} KiB", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+def compare(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    regressions = []
+    print(f"{'workload':<20} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    for name, base_result in sorted(base['workloads'].items()):
+        new_result = new['workloads'].get(name)
+        if new_result is None:
+            print(f"{name:<20} {'missing from new results':>30}")
+            continue
+        change = new_result['median_s'] / base_result['median_s'] - 1
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -args.threshold:
+            flag = '  faster'
+        print(f"{name:<20} {base_result['median_s'] * 1000:>10.2f} {new_result['median_s'] * 1000:>10.2f} "
+              f"{change:>+8.1%}{flag}")
+
+    startup_change = new['startup']['process_s'] / base['startup']['process_s'] - 1
+    print(f"{'startup':<20} {base['startup']['process_s'] * 1000:>10.2f} {new['startup']['process_s'] * 1000:>10.2f} "
+          f"{startup_change:>+8.1%}{'  REGRESSION' if startup_change > args.threshold else ''}")
+    if startup_change > args.threshold:
+        regressions.append('startup')
+
+    if regressions:
+        print(f"Arrr! Regressions in: {', '.join(regressions)}")
+        return 1
+    return 0
+
+def work(args):
+    for name, lines in load_workloads(args.only).items():
+        statements, calls = count_work(lines)
+        print(f"{name:<20} # work: {statements} statements, {calls} voyage calls")
+    return 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'work':
+        parser = argparse.ArgumentParser(prog='benchmarks/run.py work')
+        parser.add_argument('--only', nargs='*', default=None, help="Count only these workloads")
+        return work(parser.parse_args(argv[1:]))
+    if argv and argv[0] == 'compare':
+        parser = argparse.ArgumentParser(prog='benchmarks/run.py compare')
+        parser.add_argument('base', help="Baseline results JSON")
+        parser.add_argument('new', help="New results JSON")
+        parser.add_argument('--threshold', type=float, default=0.10, help="Slowdown fraction that counts as a regression")
+        return compare(parser.parse_args(argv[1:]))
+
+    parser = argparse.ArgumentParser(prog='benchmarks/run.py')
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed runs before measuring")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per workload")
+    parser.add_argument('--startup-repeat', type=int, default=5, help="Process launches used to time startup")
+    parser.add_argument('--only', nargs='*', default=None, help="Run only these workloads")
+    parser.add_argument('-o', '--output', default=None, help="Write JSON results here instead of stdout")
+    return run(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    sys.exit(main())
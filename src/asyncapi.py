@@ -0,0 +1,71 @@
+"""asyncio embedding: run Maroon scripts without blocking the event loop."""
+import asyncio
+import inspect
+from typing import Any, Iterable
+
+DEFAULT_YIELD_EVERY = 50
+
+async def _drain(interpreter):
+    while interpreter.pending_output:
+        pending = interpreter.pending_output
+        interpreter.pending_output = []
+        for awaitable in pending:
+            await awaitable
+    delay = interpreter.pending_sleep
+    interpreter.pending_sleep = 0
+    await asyncio.sleep(delay)
+
+def _discard_pending(interpreter):
+    for awaitable in interpreter.pending_output:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+    interpreter.pending_output = []
+    interpreter.pending_sleep = 0
+
+class _AsyncVoyage:
+    def __init__(self, interpreter, output):
+        self.interpreter = interpreter
+        self.output = output
+
+    def __enter__(self):
+        self.previous = (self.interpreter.output_sink, self.interpreter.async_mode)
+        if self.output is not None:
+            self.interpreter.output_sink = self.output
+        self.interpreter.async_mode = True
+        return self.interpreter
+
+    def __exit__(self, *exc):
+        _discard_pending(self.interpreter)
+        self.interpreter.output_sink, self.interpreter.async_mode = self.previous
+        return False
+
+async def run_lines_async(interpreter, lines: Iterable[str], yield_every: int = DEFAULT_YIELD_EVERY, output=None):
+    if yield_every < 1:
+        raise ValueError("yield_every must be at least 1")
+    with _AsyncVoyage(interpreter, output):
+        steps = interpreter.execute_lines(lines)
+        try:
+            executed = 0
+            for _ in steps:
+                executed += 1
+                if executed >= yield_every or interpreter.pending_output or interpreter.pending_sleep:
+                    executed = 0
+                    await _drain(interpreter)
+            await _drain(interpreter)
+        finally:
+            steps.close()
+
+async def run_script_async(interpreter, filename: str, yield_every: int = DEFAULT_YIELD_EVERY, output=None):
+    try:
+        with open(filename, 'r') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        interpreter.emit(f"No script found at {filename}")
+        return
+    await run_lines_async(interpreter, lines, yield_every, output)
+
+async def parse_command_async(interpreter, command: str, output=None) -> Any:
+    with _AsyncVoyage(interpreter, output):
+        result = interpreter.parse_command(command)
+        await _drain(interpreter)
+        return result
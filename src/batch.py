@@ -0,0 +1,138 @@
+"""Batch runner: sail a whole fleet of Maroon scripts across a process pool."""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+from .interpreter import PirateInterpreter
+
+_warm_interpreter: Optional[PirateInterpreter] = None
+
+def _warm_worker():
+    global _warm_interpreter
+    _warm_interpreter = PirateInterpreter()
+
+def run_job(filename: str, workers: int = None, seed: int = None) -> dict:
+    global _warm_interpreter
+    interpreter = _warm_interpreter or PirateInterpreter()
+    _warm_interpreter = None
+    interpreter.parallel_handler.workers = workers
+    interpreter.parallel_handler.seed = seed
+    interpreter.error_log = []
+    interpreter.stats.reset()
+    stdout = io.StringIO()
+    status = 'ok'
+    crash = None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            if not os.path.isfile(filename):
+                raise FileNotFoundError(filename)
+            interpreter.run_script(filename)
+    except Exception as e:
+        status = 'crashed'
+        crash = f"{type(e).__name__}: {e}"
+    finally:
+        interpreter.parallel_handler.shutdown()
+    duration = time.perf_counter() - start
+    errors = [str(e) for e in interpreter.error_log]
+    if status == 'ok' and errors:
+        status = 'error'
+    if crash:
+        errors.append(crash)
+    # Warm the next interpreter now so the next job doesn't pay for it.
+    _warm_interpreter = PirateInterpreter()
+    return {
+        'script': filename,
+        'status': status,
+        'duration': round(duration, 6),
+        'stdout': stdout.getvalue(),
+        'errors': errors,
+        'stats': interpreter.stats.snapshot(),
+    }
+
+def collect_scripts(targets: List[str]) -> List[str]:
+    scripts = []
+    for target in targets:
+        if os.path.isdir(target):
+            found = glob.glob(os.path.join(target, '**', '*.maroon'), recursive=True)
+        else:
+            found = glob.glob(target, recursive=True) or [target]
+        for path in sorted(found):
+            if path not in scripts:
+                scripts.append(path)
+    return scripts
+
+def run_batch(scripts: List[str], jobs: int = None, workers: int = None, seed: int = None) -> List[dict]:
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker) as pool:
+        futures = {pool.submit(run_job, script, workers, seed): script for script in scripts}
+        for future in as_completed(futures):
+            script = futures[future]
+            try:
+                results[script] = future.result()
+            except Exception as e:
+                results[script] = {
+                    'script': script,
+                    'status': 'crashed',
+                    'duration': None,
+                    'stdout': '',
+                    'errors': [f"{type(e).__name__}: {e}"],
+                }
+    return [results[script] for script in scripts]
+
+def summarize(results: List[dict], wall_time: float) -> dict:
+    counts = {'ok': 0, 'error': 0, 'crashed': 0}
+    for result in results:
+        counts[result['status']] += 1
+    return {
+        'summary': True,
+        'scripts': len(results),
+        **counts,
+        'wall_time': round(wall_time, 6),
+        'cpu_time': round(sum(r['duration'] or 0 for r in results), 6),
+    }
+
+def write_report(results: List[dict], summary: dict, out, fmt: str):
+    if fmt == 'jsonl':
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+        out.write(json.dumps(summary) + "\n")
+    else:
+        json.dump({'summary': summary, 'results': results}, out, indent=2)
+        out.write("\n")
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='maroon batch', description="Run many Maroon scripts across a process pool.")
+    parser.add_argument('targets', nargs='+', help="Directories, glob patterns or script paths")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('-f', '--format', choices=['json', 'jsonl'], default='json', help="Report format")
+    parser.add_argument('-o', '--output', default=None, help="Write the report here instead of stdout")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes each script may use for parallel plunder and par_map")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed the dice of parallel plunder and par_map so runs repeat exactly")
+    args = parser.parse_args(argv)
+
+    scripts = collect_scripts(args.targets)
+    if not scripts:
+        print("Arrr! No scripts found to sail with", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    results = run_batch(scripts, args.jobs, args.workers, args.seed)
+    summary = summarize(results, time.perf_counter() - start)
+
+    if args.output:
+        with open(args.output, 'w') as out:
+            write_report(results, summary, out, args.format)
+    else:
+        write_report(results, summary, sys.stdout, args.format)
+    return 0 if summary['ok'] == len(results) else 1
@@ -1,8 +1,10 @@
 """Command-line interface for Maroon."""
+import argparse
 import sys
 import traceback
 from .interpreter import PirateInterpreter
 from .exceptions import PirateException
+from .memory import parse_size
 
 def run_interactive_shell(interpreter: PirateInterpreter):
     print("Maroon Shell!")
@@ -16,6 +18,11 @@ def run_interactive_shell(interpreter: PirateInterpreter):
                 print("Farewell, ye scurvy programmer!")
                 break
             
+            if interpreter.first_mate_active:
+                guidance = interpreter.first_mate.review_line(command)
+                if guidance:
+                    print(guidance)
+
             result = interpreter.parse_command(command)
             if result is not None:
                 print(result)
@@ -33,13 +40,60 @@ def run_script(interpreter: PirateInterpreter, filename: str):
     except Exception as e:
         print(f"Arrr! Something went wrong: {e}")
 
+def run_subcommand(name: str, argv):
+    if name == 'batch':
+        from .batch import main as batch_main
+        return batch_main(argv)
+    if name == 'serve':
+        from .daemon import serve_main
+        return serve_main(argv)
+    from .daemon import client_main
+    return client_main(argv)
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ('batch', 'serve', 'client'):
+        sys.exit(run_subcommand(sys.argv[1], sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(prog='maroon', description="Run a Maroon script, or start the shell.")
+    parser.add_argument('script', nargs='?', help="Script to run; omit for the interactive shell")
+    parser.add_argument('--profile', action='store_true', help="Report per-line and per-voyage hot spots")
+    parser.add_argument('--profile-output', default=None,
+                        help="Where to write collapsed stacks for flame graphs (default: <script>.collapsed)")
+    parser.add_argument('--memory-limit', type=parse_size, default=None,
+                        help="Cap on memory held by variables and voyages, e.g. 64M")
+    parser.add_argument('--infer-types', action='store_true',
+                        help="Prove variable types up front and skip type checks that always pass")
+    parser.add_argument('-O', '--optimize', action='store_true',
+                        help="Fold constant expressions, drop if branches that can never run and share literal values")
+    parser.add_argument('--inline-threshold', type=int, default=None,
+                        help="Largest voyage body (in lines) to expand at its call sites; 0 turns inlining off")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for parallel plunder and par_map (default: all cores)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed the dice of parallel plunder and par_map so runs repeat exactly")
+    args = parser.parse_args()
+
     interpreter = PirateInterpreter()
+    interpreter.memory.limit = args.memory_limit
+    interpreter.type_inference = args.infer_types
+    interpreter.optimize = args.optimize
+    if args.inline_threshold is not None:
+        interpreter.expressions.inline_threshold = args.inline_threshold
+    interpreter.parallel_handler.workers = args.workers
+    interpreter.parallel_handler.seed = args.seed
 
-    if len(sys.argv) > 1:
-        run_script(interpreter, sys.argv[1])
-    else:
-        run_interactive_shell(interpreter)
+    try:
+        if args.script and args.profile:
+            with interpreter.profile() as profiler:
+                run_script(interpreter, args.script)
+            print(profiler.report(), file=sys.stderr)
+            profiler.write_collapsed(args.profile_output or f"{args.script}.collapsed")
+        elif args.script:
+            run_script(interpreter, args.script)
+        else:
+            run_interactive_shell(interpreter)
+    finally:
+        interpreter.parallel_handler.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
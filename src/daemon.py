@@ -0,0 +1,240 @@
+"""Long-running Maroon daemon: warm interpreters served over a Unix socket."""
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import List
+
+from .interpreter import PirateInterpreter
+from .memory import parse_size
+
+class PreparedScript:
+    """A script's lines with First Mate's review of them already done.
+
+    The expressions and choose tables a request compiles while running the
+    script are kept too, and handed to the next request for the same script.
+    Each set is lent to one request at a time, so requests running at once
+    never share one.
+    """
+
+    def __init__(self, lines: List[str], review: List[str]):
+        self.lines = lines
+        self.review = review
+        self.compiled = []
+
+    def lend(self, interpreter: PirateInterpreter):
+        try:
+            expressions, tables = self.compiled.pop()
+        except IndexError:
+            return
+        expressions.interpreter = interpreter
+        interpreter.expressions = expressions
+        interpreter.switch_handler.tables = tables
+
+    def give_back(self, interpreter: PirateInterpreter):
+        self.compiled.append((interpreter.expressions, interpreter.switch_handler.tables))
+
+class ScriptCache:
+    """Prepared scripts by path, kept until the file's mtime or size changes.
+
+    Every request gets a fresh interpreter, so a review done once by a fresh
+    interpreter holds for every later request.
+    """
+
+    def __init__(self):
+        self.scripts = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: str) -> PreparedScript:
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.scripts.get(path)
+            if cached and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+        with open(path, 'r') as f:
+            lines = f.readlines()
+        script = PreparedScript(lines, PirateInterpreter().review_lines(lines))
+        with self.lock:
+            self.misses += 1
+            self.scripts[path] = (key, script)
+        return script
+
+class InterpreterPool:
+    def __init__(self, size: int):
+        self.warm = queue.Queue()
+        for _ in range(size):
+            self.warm.put(PirateInterpreter())
+
+    def take(self) -> PirateInterpreter:
+        try:
+            return self.warm.get_nowait()
+        except queue.Empty:
+            return PirateInterpreter()
+
+    def replenish(self):
+        self.warm.put(PirateInterpreter())
+
+class MaroonDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, max_workers: int, max_pending: int, memory_limit: int = None,
+                 parallel_workers: int = None, seed: int = None):
+        self.max_workers = max_workers
+        self.memory_limit = memory_limit
+        self.parallel_workers = parallel_workers
+        self.seed = seed
+        self.max_pending = max_pending
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.pending = 0
+        self.pending_lock = threading.Lock()
+        self.interpreters = InterpreterPool(max_workers)
+        self.script_cache = ScriptCache()
+        self.request_queue_size = max(max_pending, 5)
+        super().__init__(path, VoyageRequestHandler)
+
+class VoyageRequestHandler(socketserver.StreamRequestHandler):
+    def send(self, message: dict):
+        self.wfile.write((json.dumps(message) + "\n").encode())
+        self.wfile.flush()
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self.send({'type': 'exit', 'status': 2, 'error': "Arrr! Garbled request"})
+            return
+
+        server = self.server
+        with server.pending_lock:
+            if server.pending >= server.max_workers + server.max_pending:
+                self.send({'type': 'exit', 'status': 75, 'error': "Arrr! All hands busy, try again later"})
+                return
+            server.pending += 1
+        try:
+            with server.slots:
+                self.run_request(request)
+        finally:
+            with server.pending_lock:
+                server.pending -= 1
+
+    def run_request(self, request: dict):
+        server = self.server
+        cwd = request.get('cwd')
+        try:
+            if 'path' in request:
+                path = request['path']
+                if cwd and not os.path.isabs(path):
+                    path = os.path.join(cwd, path)
+                script = server.script_cache.load(path)
+                lines, review = script.lines, script.review
+            else:
+                script = None
+                lines, review = request.get('source', '').splitlines(), None
+        except OSError as e:
+            self.send({'type': 'exit', 'status': 2, 'error': f"Arrr! No treasure map found: {e}"})
+            return
+
+        interpreter = server.interpreters.take()
+        if script is not None:
+            script.lend(interpreter)
+        interpreter.output_sink = lambda message: self.send({'type': 'output', 'line': message})
+        interpreter.error_log = []
+        interpreter.search_dir = cwd
+        interpreter.stats.reset()
+        interpreter.memory.limit = server.memory_limit
+        interpreter.parallel_handler.workers = server.parallel_workers
+        interpreter.parallel_handler.seed = server.seed
+        start = time.perf_counter()
+        status = 0
+        try:
+            for _ in interpreter.execute_lines(lines, review=review):
+                while interpreter.error_log:
+                    status = 1
+                    self.send({'type': 'error', 'line': str(interpreter.error_log.pop(0))})
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        except Exception as e:
+            status = 1
+            self.send({'type': 'error', 'line': f"Arrr! Something went wrong: {e}"})
+        finally:
+            duration = round(time.perf_counter() - start, 6)
+            stats = interpreter.stats.snapshot()
+            interpreter.parallel_handler.shutdown()
+            if script is not None:
+                script.give_back(interpreter)
+            threading.Thread(target=server.interpreters.replenish, daemon=True).start()
+        self.send({'type': 'exit', 'status': status, 'duration': duration, 'stats': stats})
+
+def serve_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='maroon serve', description="Keep warm Maroon interpreters behind a Unix socket.")
+    parser.add_argument('--socket', required=True, help="Path of the Unix socket to listen on")
+    parser.add_argument('-j', '--max-workers', type=int, default=os.cpu_count() or 1,
+                        help="Scripts allowed to run at the same time")
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help="Requests allowed to wait for a worker before being turned away")
+    parser.add_argument('--memory-limit', type=parse_size, default=None,
+                        help="Cap on memory each script's variables and voyages may hold, e.g. 64M")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes each script may use for parallel plunder and par_map")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed the dice of parallel plunder and par_map so runs repeat exactly")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    server = MaroonDaemon(args.socket, args.max_workers, args.max_pending, args.memory_limit,
+                          args.workers, args.seed)
+    print(f"Maroon daemon anchored at {args.socket} with {args.max_workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+    return 0
+
+def client_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='maroon client', description="Run a script on a Maroon daemon.")
+    parser.add_argument('--socket', required=True, help="Path of the daemon's Unix socket")
+    parser.add_argument('script', nargs='?', help="Script to run, or - to read source from stdin")
+    parser.add_argument('-c', '--source', default=None, help="Run this source text instead of a script file")
+    args = parser.parse_args(argv)
+
+    request = {'cwd': os.getcwd()}
+    if args.source is not None:
+        request['source'] = args.source
+    elif args.script == '-':
+        request['source'] = sys.stdin.read()
+    elif args.script:
+        request['path'] = os.path.abspath(args.script)
+    else:
+        parser.error("a script or --source is required")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(args.socket)
+        sock.sendall((json.dumps(request) + "\n").encode())
+        for line in sock.makefile('r'):
+            message = json.loads(line)
+            if message['type'] == 'output':
+                print(message['line'], flush=True)
+            elif message['type'] == 'error':
+                print(message['line'], file=sys.stderr, flush=True)
+            elif message['type'] == 'exit':
+                if message.get('error'):
+                    print(message['error'], file=sys.stderr)
+                return message['status']
+    print("Arrr! The daemon hung up on us", file=sys.stderr)
+    return 1
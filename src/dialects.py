@@ -1,16 +1,74 @@
 from typing import Optional
 import re
 
+FUNCTION_HEADER = re.compile(r'^(\w+)\s+(\w+)\((.*?)\):$')
+BLOCK_END = re.compile(r'^end\s+(\w+)$')
+DIALECT_START = re.compile(r'^dialect\s+(\w+):$')
+DIALECT_MAPPING = re.compile(r'^\s*"([^"]+)"\s+be\s+"([^"]+)"$')
+
+def _word_pattern(word: str) -> str:
+    return r'\b' + re.escape(word) + r'\b'
+
 class PirateDialect:
+    CACHE_SIZE = 4096
+
     def __init__(self, name: str):
         self.name = name
         self.mappings = {}
         self.special_patterns = [
-            (r'^(\w+)\s+(\w+)\((.*?)\):$', r'voyage \2(\3):'),
-            (r'^end\s+(\w+)$', r'end voyage'),
+            (FUNCTION_HEADER, r'voyage \2(\3):'),
+            (BLOCK_END, r'end voyage'),
         ]
-    
+        self._translator = None
+        self._sequential = None
+        self._translations = {}
+        self.hits = 0
+        self.misses = 0
+
+    def add_mapping(self, dialect_word: str, core_word: str):
+        self.mappings[dialect_word] = core_word
+        self.invalidate()
+
+    def invalidate(self):
+        self._translator = None
+        self._sequential = None
+        self._translations.clear()
+
+    def _compile(self):
+        words = sorted(self.mappings, key=len, reverse=True)
+        patterns = {word: re.compile(_word_pattern(word)) for word in words}
+        # One alternation only matches what the chain of per-word subs would
+        # when no dialect word can turn up inside another word or a translation.
+        overlapping = any(
+            patterns[word].search(text)
+            for word in words
+            for text in list(self.mappings.values()) + [w for w in words if w != word]
+        )
+        if overlapping:
+            self._sequential = [(patterns[word], self.mappings[word]) for word in self.mappings]
+        self._translator = re.compile('|'.join(_word_pattern(word) for word in words))
+
+    def _translate_words(self, cmd: str) -> str:
+        if self._sequential is not None:
+            for pattern, core_word in self._sequential:
+                cmd = pattern.sub(core_word, cmd)
+            return cmd
+        mappings = self.mappings
+        return self._translator.sub(lambda match: mappings[match.group(0)], cmd)
+
     def translate_to_core(self, command: str) -> str:
+        cached = self._translations.get(command)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        result = self._translate(command)
+        if len(self._translations) >= self.CACHE_SIZE:
+            del self._translations[next(iter(self._translations))]
+        self._translations[command] = result
+        return result
+
+    def _translate(self, command: str) -> str:
         parts = command.split('#', 1)
         cmd = parts[0].strip()
         comment = f"#{parts[1]}" if len(parts) > 1 else ""
@@ -19,7 +77,7 @@ class PirateDialect:
             return command
 
         for pattern, replacement in self.special_patterns:
-            match = re.match(pattern, cmd)
+            match = pattern.match(cmd)
             if match:
                 if match.re.pattern.endswith(r'\):$'): 
                     if match.group(1) in self.mappings and self.mappings[match.group(1)] == 'voyage':
@@ -29,10 +87,11 @@ class PirateDialect:
                     if match.group(1) in self.mappings and self.mappings[match.group(1)] == 'voyage':
                         return f"end voyage{' ' + comment if comment else ''}"
 
-        result = cmd
-        for dialect_word, core_word in self.mappings.items():
-            pattern = r'\b' + re.escape(dialect_word) + r'\b'
-            result = re.sub(pattern, core_word, result)
+        if not self.mappings:
+            return f"{cmd}{' ' + comment if comment else ''}"
+        if self._translator is None:
+            self._compile()
+        result = self._translate_words(cmd)
         
         return f"{result}{' ' + comment if comment else ''}"
 
@@ -48,7 +107,7 @@ class DialectManager:
         if not cmd:
             return command
 
-        dialect_start = re.match(r'^dialect\s+(\w+):$', cmd)
+        dialect_start = DIALECT_START.match(cmd)
         if dialect_start:
             self.parsing_dialect = True
             self.current_dialect = PirateDialect(dialect_start.group(1))
@@ -62,11 +121,11 @@ class DialectManager:
             return None
 
         if self.parsing_dialect and self.current_dialect:
-            mapping_match = re.match(r'^\s*"([^"]+)"\s+be\s+"([^"]+)"$', cmd)
+            mapping_match = DIALECT_MAPPING.match(cmd)
             if mapping_match:
                 dialect_word = mapping_match.group(1)
                 core_word = mapping_match.group(2)
-                self.current_dialect.mappings[dialect_word] = core_word
+                self.current_dialect.add_mapping(dialect_word, core_word)
                 return None
         
         if self.active_dialect:
@@ -75,4 +134,4 @@ class DialectManager:
         return command
 
     def get_active_dialect_name(self) -> Optional[str]:
-        return self.active_dialect.name if self.active_dialect else None
\ No newline at end of file
+        return self.active_dialect.name if self.active_dialect else None
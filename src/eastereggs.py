@@ -2,6 +2,7 @@ import random
 class PirateEasterEggs:
     def __init__(self):
         self.parrot_mode = False
+        self.interpreter = None
         self.secret_commands = {
             'arrrrr': self._handle_arrr,
             'x marks the spot': self._handle_treasure_map,
@@ -22,15 +23,21 @@ This language's made for coders like you!
             """
         ]
     
+    def _say(self, message: str):
+        if self.interpreter is not None:
+            self.interpreter.emit(message)
+        else:
+            print(message)
+
     def _handle_arrr(self):
         poem = random.choice(self.pirate_poems)
-        print("\n🏴‍☠️ Yarr! You've unlocked a pirate poem! 🏴‍☠️")
-        print(poem)
+        self._say("\n🏴‍☠️ Yarr! You've unlocked a pirate poem! 🏴‍☠️")
+        self._say(poem)
         return True
 
     def _handle_treasure_map(self):
-        print("\n🗺️  You've found a secret treasure map! 🗺️")
-        print("""
+        self._say("\n🗺️  You've found a secret treasure map! 🗺️")
+        self._say("""
     .    _..._  .   
    .   .'     '.   .
   .   .`  ^ ^  `.   .
@@ -48,11 +55,15 @@ This language's made for coders like you!
     def _toggle_parrot_mode(self):
         self.parrot_mode = not self.parrot_mode
         if self.parrot_mode:
-            print("\n🦜 Squawk! Parrot mode activated! All your outputs will be repeated! 🦜")
+            self._say("\n🦜 Squawk! Parrot mode activated! All your outputs will be repeated! 🦜")
         else:
-            print("\n🦜 Parrot mode deactivated!")
+            self._say("\n🦜 Parrot mode deactivated!")
         return True
 
+    def check_for_secrets(self, command: str) -> bool:
+        clean_command = command.strip().lower()
+        return any(secret in clean_command for secret in self.secret_commands)
+
     def check_for_easter_eggs(self, command: str) -> bool:
         clean_command = command.strip().lower()
         for secret, handler in self.secret_commands.items():
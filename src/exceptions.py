@@ -1,17 +1,39 @@
 class PirateException(Exception):
-    def __init__(self, message: str, line_number: int = None, context: str = None):
+    guided = False
+    wrapped = False
+    voyages = ()
+
+    def __init__(self, message: str, line_number: int = None, context: str = None, kind: str = 'error'):
         self.message = message
         self.line_number = line_number
         self.context = context
-        super().__init__(self.format_error())
+        self.kind = kind
+        super().__init__(message)
+
+    def annotate(self, line_number: int = None, context: str = None):
+        if self.line_number is None:
+            self.line_number = line_number
+        if self.context is None:
+            self.context = context
+
+    def add_voyage(self, name: str):
+        if not self.voyages:
+            self.voyages = []
+        self.voyages.append(name)
+
+    def __str__(self) -> str:
+        return self.format_error()
 
     def format_error(self) -> str:
         error_parts = [f"💀 Arr! {self.message}"]
         
         if self.line_number is not None:
             error_parts.append(f"📍 Line {self.line_number}")
+
+        if self.voyages:
+            error_parts.append(f"⚓ Voyage: {' <- '.join(self.voyages)}")
         
         if self.context:
             error_parts.append(f"🗺️ Context: {self.context}")
             
-        return "\n".join(error_parts)
\ No newline at end of file
+        return "\n".join(error_parts)
@@ -0,0 +1,473 @@
+import operator
+import re
+from typing import Any, Dict, Optional
+
+from .exceptions import PirateException
+from .patterns import ASSIGNMENT, LIST_INDEX
+from .types import PirateType
+
+COMPARISON_OPS = ('equals', 'greater_than', 'less_than')
+COMPARISON = re.compile(r'^(.+?)\s+(equals|greater_than|less_than)\s+(.+)$')
+ARITHMETIC_OPS = ['modulo', 'times', 'divided_by', 'power', 'plus', 'minus']
+ARITHMETIC = [(op, re.compile(r'^(.*?)\s+({})\s+(.*)$'.format(re.escape(op)))) for op in ARITHMETIC_OPS]
+ASSIGNMENT_ARITHMETIC = re.compile(r'^(.+?)\s+(plus|minus|times|divided_by|modulo|power)\s+(.+)$')
+FUNCTION_CALL = re.compile(r'^(\w+)\s+sails\s+with(?:\s+(.+))?$')
+LIST_SLICE = re.compile(r'^(\w+)\[(-?\w*):(-?\w*)\]$')
+# Assignments that parse_command would hand to some other handler first.
+NOT_PLAIN = re.compile(r'^(while|plunder|repeat|choose|case|default|brace|import|voyage|if)\s'
+                       r'|\swhere\s|\sbe\s+(reduce\s|list\s+of|set\s+of)|\s(join|split|upper|lower|trim)')
+
+# A site specializes once it has seen the same operand types this many times
+# in a row, and gives up for good after being knocked back this many times.
+WARMUP = 2
+MAX_DEOPTS = 4
+NUMERIC = (int, float)
+# Voyages with at most this many body lines are expanded at their call
+# sites; callees of callees are expanded down to this depth.
+INLINE_THRESHOLD = 2
+INLINE_DEPTH = 4
+# What an inlined body can raise from bad operands; the real call is replayed
+# for these so the error comes out the way it always has.
+INLINE_ERRORS = (PirateException, ArithmeticError, TypeError, ValueError)
+# Folding stops short of constants that would be slow to build or big to keep.
+FOLD_MAX_EXPONENT = 64
+FOLD_MAX_LENGTH = 256
+
+class Const:
+    __slots__ = ('value', 'type_name', 'pooled')
+
+    def __init__(self, value: Any, type_name: Optional[str], pooled: PirateType = None):
+        self.value = value
+        self.type_name = type_name
+        self.pooled = pooled
+
+    def evaluate(self, interpreter):
+        return self.value
+
+    def boxed(self, interpreter):
+        if self.pooled is not None:
+            return self.pooled
+        return PirateType(self.value, self.type_name)
+
+class Var:
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def lookup(self, interpreter):
+        try:
+            return interpreter.resolve_variable(self.name)
+        except PirateException:
+            raise PirateException(f"Cannot parse expression: {self.name}", kind='parse')
+
+    def boxed(self, interpreter):
+        value = self.lookup(interpreter)
+        # Numbers proven by type inference are stored unboxed.
+        return value if isinstance(value, PirateType) else PirateType(value)
+
+    def evaluate(self, interpreter):
+        # resolve_variable inlined: operands are read on every evaluation.
+        name = self.name
+        for scope in reversed(interpreter.scope_stack):
+            if name in scope:
+                value = scope[name]
+                return value.value if isinstance(value, PirateType) else value
+        raise PirateException(f"Cannot parse expression: {name}", kind='parse')
+
+class Generic:
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: str):
+        self.expr = expr
+
+    def boxed(self, interpreter):
+        return interpreter._parse_expression(self.expr)
+
+    def evaluate(self, interpreter):
+        value = interpreter._parse_expression(self.expr)
+        return value.value if isinstance(value, PirateType) else value
+
+class BinaryOp:
+    __slots__ = ('op', 'func', 'left', 'right', 'type_name', 'check_modulo',
+                 'seen', 'streak', 'guard', 'deopts', 'cache')
+
+    def __init__(self, op: str, func, left, right, type_name: Optional[str], check_modulo: bool, cache):
+        self.op = op
+        self.func = func
+        self.left = left
+        self.right = right
+        self.type_name = type_name
+        self.check_modulo = check_modulo
+        self.cache = cache
+        self.seen = None
+        self.streak = 0
+        self.guard = None
+        self.deopts = 0
+
+    def evaluate(self, interpreter):
+        return self._apply(self.left.evaluate(interpreter), self.right.evaluate(interpreter))
+
+    def _apply(self, left, right):
+        if self.check_modulo and right == 0:
+            raise PirateException("Modulo by zero!")
+        result = self.func(left, right)
+        if self.deopts < MAX_DEOPTS and self.guard is None:
+            self._observe(type(left), type(right))
+        return result
+
+    def boxed(self, interpreter):
+        return PirateType(self.evaluate(interpreter), self.type_name)
+
+    def _observe(self, left_type, right_type):
+        types = (left_type, right_type)
+        if types != self.seen:
+            self.seen = types
+            self.streak = 1
+            return
+        self.streak += 1
+        quickened = QUICKENED.get(self.func)
+        if (quickened is not None and self.streak >= WARMUP
+                and left_type in NUMERIC and right_type in NUMERIC):
+            # Rewrite the site in place, the way CPython quickens an instruction.
+            self.guard = types
+            self.__class__ = quickened
+            self.cache.specializations += 1
+
+    def _deoptimize(self):
+        self.__class__ = BinaryOp
+        self.guard = None
+        self.seen = None
+        self.streak = 0
+        self.deopts += 1
+        self.cache.deoptimizations += 1
+
+class Quickened(BinaryOp):
+    """A BinaryOp specialized for one pair of numeric operand types.
+
+    Each subclass applies its operator straight to the raw values. A value of
+    any other type turns the site back into a plain BinaryOp.
+    """
+    __slots__ = ()
+
+    def _miss(self, left, right):
+        guard = self.guard
+        if type(left) is not guard[0] or type(right) is not guard[1]:
+            self._deoptimize()
+        return self._apply(left, right)
+
+def quickened(name: str, func):
+    """A Quickened subclass that applies func to the raw operands while the guard holds."""
+    def evaluate(self, interpreter):
+        left = self.left.evaluate(interpreter)
+        right = self.right.evaluate(interpreter)
+        guard = self.guard
+        if type(left) is guard[0] and type(right) is guard[1]:
+            return func(left, right)
+        return self._miss(left, right)
+    return type(name, (Quickened,), {'__slots__': (), 'evaluate': evaluate})
+
+class QuickMod(Quickened):
+    __slots__ = ()
+
+    def evaluate(self, interpreter):
+        left = self.left.evaluate(interpreter)
+        right = self.right.evaluate(interpreter)
+        guard = self.guard
+        # A zero divisor takes the slow path, which raises the usual error.
+        if type(left) is guard[0] and type(right) is guard[1] and right:
+            return left % right
+        return self._miss(left, right)
+
+QuickAdd = quickened('QuickAdd', operator.add)
+QuickSub = quickened('QuickSub', operator.sub)
+QuickMul = quickened('QuickMul', operator.mul)
+QuickDiv = quickened('QuickDiv', operator.truediv)
+QuickPow = quickened('QuickPow', operator.pow)
+QuickEq = quickened('QuickEq', operator.eq)
+QuickLt = quickened('QuickLt', operator.lt)
+QuickGt = quickened('QuickGt', operator.gt)
+
+# Keyed by operator function rather than name, so a site only quickens when
+# it was compiled with the stock operator.
+QUICKENED = {
+    operator.add: QuickAdd, operator.sub: QuickSub, operator.mul: QuickMul,
+    operator.truediv: QuickDiv, operator.mod: QuickMod, operator.pow: QuickPow,
+    operator.eq: QuickEq, operator.lt: QuickLt, operator.gt: QuickGt,
+}
+
+class Param:
+    __slots__ = ('frame', 'index')
+
+    def __init__(self, frame, index: int):
+        self.frame = frame
+        self.index = index
+
+    def boxed(self, interpreter):
+        return self.frame.values[self.index]
+
+    def evaluate(self, interpreter):
+        value = self.frame.values[self.index]
+        return value.value if isinstance(value, PirateType) else value
+
+class Frame:
+    """The body of an inlined voyage: argument and local slots, then the return expression."""
+    __slots__ = ('args', 'steps', 'result', 'values')
+
+    def __init__(self, args: list):
+        self.args = args
+        self.steps = []
+        self.result = None
+        self.values = None
+
+    def _bind(self, interpreter):
+        interpreter.stats.voyage_calls += 1
+        values = [arg.boxed(interpreter) for arg in self.args]
+        self.values = values
+        for step in self.steps:
+            values.append(step.boxed(interpreter))
+
+    def boxed(self, interpreter):
+        self._bind(interpreter)
+        return self.result.boxed(interpreter)
+
+    def evaluate(self, interpreter):
+        self._bind(interpreter)
+        return self.result.evaluate(interpreter)
+
+class InlineCall:
+    __slots__ = ('expr', 'name', 'args', 'cache', 'frame', 'guards')
+
+    def __init__(self, expr: str, name: str, args_str: str, cache):
+        self.expr = expr
+        self.name = name
+        self.args = [arg.strip() for arg in args_str.split(',') if arg.strip()]
+        self.cache = cache
+        self.frame = None
+        self.guards = None
+
+    def _expansion(self, interpreter):
+        if (interpreter.profiler is not None or interpreter.tracer is not None
+                or interpreter.dialect_manager.active_dialect is not None):
+            return None
+        guards = self.guards
+        if guards is not None:
+            crew = interpreter.pirate_crew
+            for name, function in guards:
+                if crew.get(name) is not function:
+                    break
+            else:
+                return self.frame
+        self.frame, self.guards = self.cache.inline(self.name, self.args)
+        return self.frame
+
+    def _replay(self, interpreter, calls: int):
+        # Expansions have no side effects, so only the call counts they made
+        # need undoing before the real call runs.
+        interpreter.stats.voyage_calls = calls
+        value = interpreter._parse_expression(self.expr)
+        # The real call got through where the expansion failed, so the
+        # expansion isn't exact and this site keeps the real call from now on.
+        self.frame, self.guards = None, ()
+        return value
+
+    def boxed(self, interpreter):
+        frame = self._expansion(interpreter)
+        if frame is None:
+            return interpreter._parse_expression(self.expr)
+        calls = interpreter.stats.voyage_calls
+        try:
+            return frame.boxed(interpreter)
+        except INLINE_ERRORS:
+            return self._replay(interpreter, calls)
+
+    def evaluate(self, interpreter):
+        frame = self._expansion(interpreter)
+        if frame is None:
+            value = interpreter._parse_expression(self.expr)
+        else:
+            calls = interpreter.stats.voyage_calls
+            try:
+                return frame.evaluate(interpreter)
+            except INLINE_ERRORS:
+                value = self._replay(interpreter, calls)
+        return value.value if isinstance(value, PirateType) else value
+
+class ExpressionCache:
+    CACHE_SIZE = 4096
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.expressions: Dict[str, Any] = {}
+        self.assignments: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.specializations = 0
+        self.deoptimizations = 0
+        self.inlined = 0
+        self.inline_threshold = INLINE_THRESHOLD
+        self.literals: Dict[tuple, PirateType] = {}
+
+    def _remember(self, table: dict, key: str, node):
+        if len(table) >= self.CACHE_SIZE:
+            del table[next(iter(table))]
+        table[key] = node
+        return node
+
+    def lookup(self, expr: str):
+        node = self.expressions.get(expr)
+        if node is not None:
+            self.hits += 1
+            return node
+        self.misses += 1
+        return self._remember(self.expressions, expr, self.compile(expr))
+
+    def lookup_assignment(self, value_str: str):
+        node = self.assignments.get(value_str, False)
+        if node is not False:
+            self.hits += 1
+            return node
+        self.misses += 1
+        return self._remember(self.assignments, value_str, self.compile_assignment(value_str))
+
+    def compile(self, expr: str):
+        # Mirrors the order parse_expression tries each form in, so a cached
+        # node always takes the same reading of the text as the slow path.
+        expr = expr.strip()
+        if expr.startswith('(') and expr.endswith(')'):
+            return Generic(expr)
+        ops = self.interpreter.pirate_ops
+        # Substring tests first: on a line with no operator they are far
+        # cheaper than the failed regex scans.
+        comparison = COMPARISON.match(expr) if any(op in expr for op in COMPARISON_OPS) else None
+        if comparison:
+            op = comparison.group(2)
+            return self._fold(BinaryOp(op, ops[op], self.compile(comparison.group(1)),
+                                       self.compile(comparison.group(3)), 'boolean', False, self))
+        for op, pattern in ARITHMETIC:
+            arithmetic = pattern.match(expr) if op in expr else None
+            if arithmetic:
+                return self._fold(BinaryOp(op, ops[op], self.compile(arithmetic.group(1)),
+                                           self.compile(arithmetic.group(3)), None, op == 'modulo', self))
+        call = FUNCTION_CALL.match(expr)
+        if call:
+            if call.group(1) in self.interpreter.ship_logs:
+                return Generic(expr)
+            return InlineCall(expr, call.group(1), call.group(2) or '', self)
+        if expr.startswith('"') and expr.endswith('"'):
+            return self._const(expr[1:-1], 'string')
+        if expr.replace('.', '', 1).isdigit():
+            try:
+                return self._const(float(expr) if '.' in expr else int(expr), 'number')
+            except ValueError:
+                return Generic(expr)
+        if expr.lower() in ['true', 'false']:
+            return self._const(expr.lower() == 'true', 'boolean')
+        if LIST_INDEX.match(expr) or LIST_SLICE.match(expr):
+            return Generic(expr)
+        return Var(expr)
+
+    def compile_assignment(self, value_str: str):
+        arithmetic = ASSIGNMENT_ARITHMETIC.match(value_str)
+        if not arithmetic:
+            return None
+        op = arithmetic.group(2)
+        return self._fold(BinaryOp(op, self.interpreter.pirate_ops[op], self.compile(arithmetic.group(1)),
+                                   self.compile(arithmetic.group(3)), None, False, self))
+
+    def _const(self, value: Any, type_name: Optional[str]) -> Const:
+        if not self.interpreter.optimize:
+            return Const(value, type_name)
+        # Literals never change once boxed, so -O hands out one box per value.
+        key = (type(value), value, type_name)
+        pooled = self.literals.get(key)
+        if pooled is None:
+            pooled = self.literals[key] = PirateType(value, type_name)
+        return Const(value, type_name, pooled)
+
+    def _fold(self, node: BinaryOp):
+        if not (self.interpreter.optimize and isinstance(node.left, Const) and isinstance(node.right, Const)):
+            return node
+        left, right = node.left.value, node.right.value
+        if node.op == 'power' and isinstance(right, NUMERIC) and abs(right) > FOLD_MAX_EXPONENT:
+            return node
+        if node.op == 'times' and (isinstance(left, str) or isinstance(right, str)):
+            return node
+        try:
+            value = node.func(left, right)
+        except Exception:
+            # Left for run time, so the error is raised where it always was.
+            return node
+        if isinstance(value, str) and len(value) > FOLD_MAX_LENGTH:
+            return node
+        return self._const(value, node.type_name)
+
+    def inline(self, name: str, arg_texts: list):
+        """Expand a call to a user voyage, or return None if it can't be done exactly.
+
+        Also returns the voyages the expansion depends on; it must be redone
+        as soon as any of them is redefined.
+        """
+        guards = []
+        if self.inline_threshold <= 0:
+            return None, guards
+        args = [self._bind(self.compile(text), {}, (), guards) for text in arg_texts]
+        if any(arg is None for arg in args):
+            return None, guards
+        frame = self._expand(name, args, {}, (), guards)
+        if frame is not None:
+            self.inlined += 1
+        return frame, guards
+
+    def _expand(self, name: str, args: list, scope: dict, expanding: tuple, guards: list):
+        interpreter = self.interpreter
+        function = interpreter.pirate_crew.get(name)
+        guards.append((name, function))
+        if (function is None or name in expanding or len(expanding) >= INLINE_DEPTH
+                or len(args) > len(function.params) or len(function.body) > self.inline_threshold):
+            return None
+        frame = Frame(list(args))
+        # Voyage scopes are dynamic, so the callee still sees its caller's names.
+        scope = dict(scope)
+        for index, (param_name, default_value) in enumerate(function.params):
+            if index >= len(args):
+                if not isinstance(default_value, PirateType):
+                    return None
+                frame.args.append(Const(default_value.value, default_value.type_name))
+            scope[param_name] = Param(frame, index)
+        expanding += (name,)
+        for line in function.body:
+            line = line.strip()
+            if line.startswith('return'):
+                frame.result = self._bind(self.compile(line[7:].strip()), scope, expanding, guards)
+                return frame if frame.result is not None else None
+            assignment = ASSIGNMENT.match(line)
+            if not assignment or NOT_PLAIN.search(line) or interpreter.easter_eggs.check_for_secrets(line):
+                return None
+            value_str = assignment.group(2)
+            node = self.compile_assignment(value_str) or self.compile(value_str)
+            node = self._bind(node, scope, expanding, guards)
+            if node is None:
+                return None
+            scope[assignment.group(1)] = Param(frame, len(frame.args) + len(frame.steps))
+            frame.steps.append(node)
+        return None
+
+    def _bind(self, node, scope: dict, expanding: tuple, guards: list):
+        # Only side-effect free nodes are inlined; anything else keeps the real call.
+        if isinstance(node, Const):
+            return node
+        if isinstance(node, Var):
+            return scope.get(node.name, node)
+        if isinstance(node, BinaryOp):
+            left = self._bind(node.left, scope, expanding, guards)
+            right = self._bind(node.right, scope, expanding, guards)
+            if left is None or right is None:
+                return None
+            return BinaryOp(node.op, node.func, left, right, node.type_name, node.check_modulo, self)
+        if isinstance(node, InlineCall):
+            args = [self._bind(self.compile(text), scope, expanding, guards) for text in node.args]
+            if any(arg is None for arg in args):
+                return None
+            return self._expand(node.name, args, scope, expanding, guards)
+        return None
@@ -1,72 +1,131 @@
 import re
+from typing import Iterable, List, Optional
+
+from .dialects import DialectManager
+from .exceptions import PirateException
+from .patterns import CONDITIONAL, FUNCTION_CALLS, VOYAGE_HEADER
+
+VARIABLE_DECLARATION = re.compile(r'^(\w+)\s+be\s+')
+LOOP_VARIABLE = re.compile(r'^plunder\s+each\s+(\w+)\s+from\s+')
+FUNCTION_USE = re.compile(r'^(\w+)\s+sails\s+with\s+([^,]+(?:\s*,\s*[^,]+)*)$')
+ARITHMETIC = re.compile(r'^\w+\s+be\s+.+?\s+(plus|minus|times|divided_by)\s+.+$')
+VARIABLE_USAGE = re.compile(r'\b(\w+)\s+be\s+')
+NUMBER = re.compile(r'^-?\d*\.?\d+$')
+
 class FirstMate:
     def __init__(self, interpreter):
         self.interpreter = interpreter
         self.declared_variables = set()
+        self.variable_lines = {}
+        self.voyages = {}
         self.in_function = False
         self.current_function_params = set()
         self.current_function_name = None
+        self.dialects = None
 
-    def track_variable_declaration(self, code_line: str):
-        var_match = re.match(r'^(\w+)\s+be\s+', code_line)
+    def track_variable_declaration(self, code_line: str, line_number: int = None):
+        var_match = VARIABLE_DECLARATION.match(code_line) or LOOP_VARIABLE.match(code_line)
         if var_match:
             self.declared_variables.add(var_match.group(1))
+            self.variable_lines.setdefault(var_match.group(1), line_number)
             
-        func_match = re.match(r'^voyage\s+(\w+)\((.*?)\):$', code_line)
+        func_match = VOYAGE_HEADER.match(code_line)
         if func_match:
             self.in_function = True
             self.current_function_name = func_match.group(1)
-            params = [p.strip() for p in func_match.group(2).split(',') if p.strip()]
+            params = [p.strip().split(' be ')[0].strip() for p in func_match.group(2).split(',') if p.strip()]
             self.current_function_params = set(params)
+            self.voyages[self.current_function_name] = (line_number, params)
             
         if code_line.strip() == 'end voyage':
             self.in_function = False
-            self.current_function_params.clear()
+            self.current_function_params = set()
             self.current_function_name = None
 
-    def analyze_code(self, code_line: str) -> str:
-        self.track_variable_declaration(code_line)
+    def analyze_code(self, code_line: str, line_number: int = None, known_voyages: Iterable[str] = ()) -> Optional[str]:
+        self.track_variable_declaration(code_line, line_number)
         code_line = code_line.strip()
 
         if not code_line or code_line.startswith('#'):
             return None
 
+        for func_name in FUNCTION_CALLS.findall(code_line):
+            if (func_name not in self.interpreter.ship_logs and
+                func_name not in self.interpreter.pirate_crew and
+                func_name not in self.voyages and
+                func_name not in known_voyages):
+                return f"Voyage '{func_name}' hasn't been charted! Use 'voyage' to create it first."
+
         if 'sails with' in code_line:
-            func_pattern = r'^(\w+)\s+sails\s+with\s+([^,]+(?:\s*,\s*[^,]+)*)$'
-            if not re.match(func_pattern, code_line):
+            if not FUNCTION_USE.match(code_line):
                 return None
 
         if any(op in code_line for op in ['plus', 'minus', 'times', 'divided_by']):
-            op_pattern = r'^\w+\s+be\s+.+?\s+(plus|minus|times|divided_by)\s+.+$'
-            if not re.match(op_pattern, code_line):
+            if not ARITHMETIC.match(code_line):
                 return None
 
-        var_usage = re.search(r'\b(\w+)\s+be\s+', code_line)
+        var_usage = VARIABLE_USAGE.search(code_line)
         if var_usage:
             var_name = var_usage.group(1)
             if (var_name not in self.declared_variables and 
                 var_name not in self.current_function_params and 
-                not re.match(r'^-?\d*\.?\d+$', var_name)):
+                not NUMBER.match(var_name)):
                 return f"Variable '{var_name}' not found in the treasure chest!"
 
         if code_line.startswith('if'):
-            cond_pattern = r'^if\s+.+?\s+be\s+(less_than|greater_than|equals|greater_or_equal|less_or_equal)\s+.+?\s*,\s*then\s+.+?(?:\s+else\s+.+)?$'
-            if not re.match(cond_pattern, code_line):
+            if not CONDITIONAL.match(code_line):
                 return "Invalid conditional! Use: if x be less_than y, then action else action"
 
         return None
 
-    def provide_guidance(self, code_line: str, error: Exception = None) -> str:
+    def _translate(self, line: str) -> Optional[str]:
+        if self.dialects is None:
+            self.dialects = DialectManager()
+            self.dialects.active_dialect = self.interpreter.dialect_manager.active_dialect
+        return self.dialects.parse_dialect_command(line)
+
+    def review_line(self, line: str, line_number: int = None, known_voyages: Iterable[str] = ()) -> Optional[str]:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return None
+        translated = self._translate(line)
+        if translated is None:
+            return None
+        analysis = self.analyze_code(translated.strip(), line_number, known_voyages)
+        if not analysis:
+            return None
+        if line_number is None:
+            return f"First Mate: {analysis}"
+        return f"First Mate (line {line_number}): {analysis}"
+
+    def review_program(self, lines: List[str], start_line: int = 1, active: bool = True) -> List[str]:
+        self.dialects = None
+        known_voyages = set()
+        for line in lines:
+            header = VOYAGE_HEADER.match(line.strip())
+            if header:
+                known_voyages.add(header.group(1))
+
+        diagnostics = []
+        for line_number, line in enumerate(lines, start_line):
+            command = line.strip()
+            if command == 'revive first mate':
+                active = True
+            elif command == 'kill first mate':
+                active = False
+            diagnostic = self.review_line(line, line_number, known_voyages)
+            if diagnostic and active:
+                diagnostics.append(diagnostic)
+        self.dialects = None
+        return diagnostics
+
+    def provide_guidance(self, code_line: str, error: Exception = None) -> Optional[str]:
         if error:
-            error_str = str(error)
+            error_str = error.message if isinstance(error, PirateException) else str(error)
             if "Unknown function" in error_str:
                 return f"First Mate: Ye haven't declared the function yet! Use 'voyage' to create it first."
             if "No treasure found" in error_str:
                 var_match = re.search(r"No treasure found for (\w+)", error_str)
                 if var_match:
                     return f"First Mate: '{var_match.group(1)}' isn't in the treasure chest! Declare it first."
-        
-        analysis = self.analyze_code(code_line)
-        if analysis:
-            return f"First Mate: {analysis}"
-        return None
\ No newline at end of file
+        return None
@@ -1,15 +1,59 @@
-from typing import List, Any, Optional
+from typing import Any, Callable, List, Optional
 
 from .exceptions import PirateException
+from .expressions import NOT_PLAIN
+from .patterns import ASSIGNMENT
+from .streams import Stream, yields
 from .types import PirateType
 
+LAZY_FIELDS = ('params', 'body', 'line_numbers')
+
 class PirateFunction:
-    def __init__(self, name: str, params: List[tuple], body: List[str]):
+    def __init__(self, name: str, params: List[tuple], body: List[str],
+                 line_numbers: List[Optional[int]] = None, source_file: str = None):
         self.name = name
         self.params = params
         self.body = body
+        self.line_numbers = line_numbers if line_numbers is not None else [None] * len(body)
+        self.source_file = source_file
+
+    @classmethod
+    def lazy(cls, name: str, load: Callable[[], tuple], source_file: str = None) -> 'PirateFunction':
+        """A voyage whose params, body and line numbers come from load() the first time one is needed."""
+        function = cls.__new__(cls)
+        function.name = name
+        function.source_file = source_file
+        function._load = load
+        return function
+
+    def __getattr__(self, name: str):
+        load = self.__dict__.get('_load')
+        if load is None or name not in LAZY_FIELDS:
+            raise AttributeError(name)
+        self.params, self.body, self.line_numbers = load()
+        del self._load
+        return self.__dict__[name]
+
+    @property
+    def is_stream(self) -> bool:
+        """A voyage with a yield in its body hands back a stream instead of running to the end."""
+        stream = self.__dict__.get('_stream')
+        if stream is None:
+            stream = self._stream = any(yields(line) for line in self.body)
+        return stream
+
+    def __getstate__(self):
+        if '_load' in self.__dict__:
+            self.body
+        return self.__dict__
 
     def __call__(self, interpreter, args: List[Any]) -> Any:
+        interpreter.stats.voyage_calls += 1
+        if interpreter.profiler is not None or interpreter.tracer is not None:
+            return interpreter.monitor_voyage(self, self._call, interpreter, args)
+        return self._call(interpreter, args)
+
+    def _call(self, interpreter, args: List[Any]) -> Any:
         required_params = sum(1 for p in self.params if p[1] is None)
         
         if len(args) < required_params:
@@ -36,18 +80,118 @@ class PirateFunction:
                     arg if isinstance(arg, PirateType) 
                     else PirateType(arg)
                 )
+            if self.is_stream:
+                return PirateType(Stream(interpreter, self, interpreter.treasure_chest), 'stream')
             result = None
-            for line in self.body:
+            for line, line_number in zip(self.body, self.line_numbers):
                 line = line.strip()
                 if line.startswith('return'):
-                    result = interpreter.parse_expression(line[6:].strip())
+                    result = interpreter.return_value(line, line_number)
                     break
-                result = interpreter.parse_command(line)
+                result = interpreter.parse_command(line, line_number)
             return result
+        except PirateException as e:
+            e.add_voyage(self.name)
+            raise
         except Exception as e:
             raise PirateException(
                 f"Mutiny in function {self.name}!",
-                context=str(e)
+                context=str(e),
+                kind='internal'
             )
         finally:
-            interpreter.pop_scope()
\ No newline at end of file
+            interpreter.pop_scope()
+
+class VoyageBatch:
+    """Calls one voyage many times from map/filter/reduce, reusing a single frame.
+
+    The body is compiled once per batch: the return expression and plain
+    assignments become expression nodes, and only other lines are parsed
+    again for each element.
+    """
+
+    def __init__(self, interpreter, function: PirateFunction):
+        self.interpreter = interpreter
+        self.function = function
+        self.frame = None
+        self.stream = function.is_stream
+        self.steps = []
+        expressions = interpreter.expressions
+        for cmd, line_number in zip(function.body, function.line_numbers):
+            cmd = cmd.strip()
+            if cmd.startswith('return'):
+                self.steps.append((None, expressions.lookup(cmd[7:].strip()), cmd, line_number))
+                break
+            assignment = ASSIGNMENT.match(cmd)
+            if (assignment and not NOT_PLAIN.search(cmd)
+                    and not interpreter.easter_eggs.check_for_secrets(cmd)):
+                value_str = assignment.group(2)
+                node = expressions.lookup_assignment(value_str) or expressions.lookup(value_str)
+                self.steps.append((assignment.group(1), node, cmd, line_number))
+            else:
+                self.steps.append((None, None, cmd, line_number))
+
+    def __enter__(self):
+        self.interpreter.push_scope()
+        self.frame = self.interpreter.treasure_chest
+        return self
+
+    def __exit__(self, *exc):
+        self.interpreter.pop_scope()
+        return False
+
+    def __call__(self, *args) -> Any:
+        interpreter = self.interpreter
+        interpreter.stats.voyage_calls += 1
+        try:
+            if interpreter.profiler is not None or interpreter.tracer is not None:
+                result = interpreter.monitor_voyage(self.function, self._run, list(args))
+            else:
+                result = self._run(args)
+        except PirateException as e:
+            e.add_voyage(self.function.name)
+            raise
+        return result.value if isinstance(result, PirateType) else result
+
+    def _run(self, args) -> Any:
+        interpreter = self.interpreter
+        frame = self.frame
+        if interpreter.scope_stack[-1] is not frame:
+            interpreter.push_scope()
+            frame = self.frame = interpreter.treasure_chest
+        frame.clear()
+        for i, (param_name, default_value) in enumerate(self.function.params):
+            frame[param_name] = args[i] if i < len(args) else default_value
+        if self.stream:
+            return interpreter._execute_function(self.function, list(args))
+        # Anything that watches or rewrites statements needs them to go the usual way.
+        compiled = (interpreter.profiler is None and interpreter.tracer is None
+                    and interpreter.dialect_manager.active_dialect is None
+                    and not interpreter.try_catch_handler.in_try_block)
+        type_facts = interpreter.type_facts
+        result = None
+        for target, node, cmd, line_number in self.steps:
+            if target is None and node is not None:
+                try:
+                    if interpreter.profiler is not None:
+                        return interpreter.profiler.statement(lambda *_: node.evaluate(interpreter), cmd, line_number)
+                    return node.evaluate(interpreter)
+                except PirateException as e:
+                    raise interpreter.command_error(e, cmd, line_number)
+                except Exception as e:
+                    raise interpreter.command_error(e, cmd, line_number) from e
+            if target is not None and compiled:
+                interpreter.stats.statements += 1
+                try:
+                    if type_facts is not None and target in type_facts.numeric:
+                        frame[target] = node.evaluate(interpreter)
+                    else:
+                        frame[target] = node.boxed(interpreter)
+                except PirateException as e:
+                    raise interpreter.command_error(e, cmd, line_number)
+                except Exception as e:
+                    raise interpreter.command_error(e, cmd, line_number) from e
+                result = None
+                continue
+            result = interpreter.parse_command(cmd, line_number)
+        return result
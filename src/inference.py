@@ -0,0 +1,269 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+from .expressions import LIST_SLICE, BinaryOp, Const, Generic, Var
+from .patterns import (ASSIGNMENT, CATCH_AS, CONDITIONAL, FILTER, FUNCTION_CALLS, LIST_APPEND,
+                       LIST_COMPREHENSION, LIST_INDEX, LIST_ITEMS, LIST_LITERAL, PARALLEL_PLUNDER,
+                       PLUNDER, REDUCE, REPEAT, STRING_OPERATION, VOYAGE_HEADER, WHILE)
+from .types import PirateType
+
+UNKNOWN = 'unknown'
+NOT_PROVEN = object()
+
+IMPORT = re.compile(r'^import\s+')
+DIALECT = re.compile(r'^dialect\s+\w+:$')
+PATTERN_FORMS = [LIST_COMPREHENSION, FILTER, REDUCE, STRING_OPERATION]
+BULK_LIST = re.compile(r'^(add\s+all\s.+\sto\s|add\s.+\sto\s+\w+\s+at\s|fill\s+\w+.*\swith\s|remove\s+\w+\[|\w+\[[^\]]*:[^\]]*\]\s+be\s)')
+CALL_NAME = re.compile(r'^(\w+)\s+sails\s+with\b')
+# Builtins that put new items into a list they are handed.
+LIST_MUTATORS = ('insert_sorted',)
+NAME = re.compile(r'\b[A-Za-z_]\w*\b')
+STRING = re.compile(r'^"([^"]*)"$')
+NUMERIC_OPS = ('plus', 'minus', 'times', 'divided_by', 'modulo')
+CONST_TYPES = {'number': 'number', 'string': 'str', 'boolean': 'bool'}
+VALUE_TYPES = {int: 'number', float: 'number', str: 'str', bool: 'bool'}
+# Builtins whose results always have the same check_type name.
+RETURN_TYPES = {
+    'count_booty': 'number', 'to_int': 'number', 'to_float': 'number', 'sqrt': 'number',
+    'round': 'number', 'abs': 'number', 'roll_dice': 'number', 'to_str': 'str', 'flip_coin': 'str',
+    'build': 'str', 'find_sorted': 'number', 'sort_loot': 'list', 'top_k': 'list', 'bottom_k': 'list',
+    'to_set': 'set', 'union': 'set', 'intersection': 'set', 'difference': 'set',
+}
+TYPE_CHECKS = ('check_type', 'assert_type', 'is_list_of_type')
+
+def _join(a, b):
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return ('list', _join(a[1], b[1]))
+    return UNKNOWN
+
+class TypeFacts:
+    def __init__(self, types: Dict[str, object] = None):
+        self.types = types or {}
+        self.numeric = {name for name, kind in self.types.items() if kind == 'number'}
+
+    def type_of(self, name: str):
+        kind = self.types.get(name, UNKNOWN)
+        return 'list' if isinstance(kind, tuple) else kind
+
+    def element_type(self, name: str):
+        kind = self.types.get(name)
+        return kind[1] if isinstance(kind, tuple) else UNKNOWN
+
+    def prove(self, func_name: str, arg_texts: List[str], args: List):
+        if len(arg_texts) != 2 or not self.types:
+            return NOT_PROVEN
+        type_name = STRING.match(arg_texts[1].strip())
+        name = arg_texts[0].strip()
+        if not type_name or name not in self.types:
+            return NOT_PROVEN
+        type_name = type_name.group(1).lower()
+        if func_name == 'is_list_of_type':
+            element = self.element_type(name)
+            if element == UNKNOWN:
+                return NOT_PROVEN
+            return PirateType(not args[0] or element == type_name, 'boolean')
+        known = self.type_of(name)
+        if known == UNKNOWN or known is None:
+            return NOT_PROVEN
+        if func_name == 'check_type':
+            return PirateType(known == type_name, 'boolean')
+        return None if known == type_name else NOT_PROVEN
+
+class TypeInference:
+    """Flow-insensitive pass: a name is proven only if every place that can bind it agrees."""
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def analyze(self, lines: Iterable[str]) -> TypeFacts:
+        lines = [line.strip() for line in lines]
+        lines += [line for function in self.interpreter.pirate_crew.values() for line in function.body]
+        if any(IMPORT.match(line) or DIALECT.match(line) for line in lines):
+            return TypeFacts()
+
+        self.bindings: Dict[str, list] = {}
+        self.adds: Dict[str, list] = {}
+        self.escaped = set()
+        self.nodes = {}
+        for line in lines:
+            if line:
+                self._statement(line)
+
+        for function in self.interpreter.pirate_crew.values():
+            for name, _ in function.params:
+                self._bind(name, UNKNOWN)
+
+        for scope in self.interpreter.scope_stack:
+            for name in scope:
+                self._bind(name, UNKNOWN)
+
+        types: Dict[str, object] = {}
+        while True:
+            updated = {name: self._type_of_name(name, types) for name in self.bindings}
+            if updated == types:
+                break
+            types = updated
+        return TypeFacts({name: kind for name, kind in types.items() if kind not in (None, UNKNOWN)})
+
+    def _bind(self, name: str, source):
+        self.bindings.setdefault(name, []).append(source)
+
+    def _escape(self, text: str):
+        self.escaped.update(NAME.findall(text))
+
+    def _statement(self, cmd: str):
+        cmd = cmd.strip()
+        if not cmd or cmd.startswith('#'):
+            return
+        for call in FUNCTION_CALLS.finditer(cmd):
+            if call.group(1) not in self.interpreter.ship_logs or call.group(1) in LIST_MUTATORS:
+                self._escape(cmd[call.end():])
+        if cmd.startswith('return'):
+            self._escape(cmd[6:])
+            return
+        for pattern in PATTERN_FORMS:
+            match = pattern.match(cmd)
+            if match:
+                self._bind(match.group(1), UNKNOWN)
+                return
+        match = WHILE.match(cmd)
+        if match:
+            self._bind(match.group(1), UNKNOWN)
+            return self._statement(match.group(3))
+        match = PARALLEL_PLUNDER.match(cmd)
+        if match:
+            return
+        match = PLUNDER.match(cmd)
+        if match:
+            self._bind(match.group(1), ('element', match.group(2)))
+            return self._statement(match.group(3))
+        match = REPEAT.match(cmd)
+        if match:
+            return self._statement(match.group(2))
+        if cmd.startswith('case '):
+            parts = cmd[5:].split(':', 1)
+            if len(parts) == 2:
+                self._statement(parts[1])
+            return
+        if cmd.startswith('default:'):
+            return self._statement(cmd[8:])
+        if cmd.startswith('if capsized'):
+            match = CATCH_AS.match(cmd)
+            if match:
+                self._bind(match.group(1), UNKNOWN)
+                return self._statement(match.group(2))
+            return self._statement(cmd[len("if capsized,"):])
+        match = VOYAGE_HEADER.match(cmd)
+        if match:
+            for param in match.group(2).split(','):
+                name, _, default = param.partition(' be ')
+                if name.strip():
+                    self._bind(name.strip(), UNKNOWN)
+                self._escape(default)
+            return
+        if BULK_LIST.match(cmd):
+            # Splices, inserts and fills can put anything into a list.
+            self._escape(cmd)
+            return
+        match = ASSIGNMENT.match(cmd)
+        if match:
+            name, value = match.group(1), match.group(2)
+            list_match = LIST_LITERAL.match(value)
+            if list_match:
+                items = [item.strip() for item in LIST_ITEMS.split(list_match.group(1))] if list_match.group(1).strip() else []
+                for item in items:
+                    self._escape(item)
+                self._bind(name, ('list', items))
+            else:
+                if NAME.fullmatch(value.strip()) or LIST_SLICE.match(value.strip()):
+                    self._escape(value)
+                self._bind(name, ('value', value))
+            return
+        match = LIST_APPEND.match(cmd)
+        if match:
+            self._escape(match.group(1))
+            self.adds.setdefault(match.group(2), []).append(match.group(1))
+            return
+        match = CONDITIONAL.match(cmd)
+        if match:
+            self._statement(match.group(4))
+            if match.group(5):
+                self._statement(match.group(5))
+
+    def _type_of_name(self, name: str, types: dict):
+        kind = None
+        for source in self.bindings.get(name, ()):
+            if source == UNKNOWN:
+                return UNKNOWN
+            if source[0] == 'element':
+                element = types.get(source[1])
+                element = element[1] if isinstance(element, tuple) else (UNKNOWN if element is not None else None)
+                kind = _join(kind, element)
+            elif source[0] == 'list':
+                element = None
+                if name in self.escaped:
+                    element = UNKNOWN
+                for item in source[1]:
+                    element = _join(element, self._type_of_expression(item, types))
+                for item in self.adds.get(name, ()):
+                    element = _join(element, self._type_of_expression(item, types))
+                kind = _join(kind, ('list', element))
+            else:
+                value_type = self._type_of_value(source[1], types)
+                if value_type == 'list':
+                    value_type = ('list', UNKNOWN)
+                kind = _join(kind, value_type)
+            if kind == UNKNOWN:
+                return UNKNOWN
+        return kind
+
+    def _compile(self, text: str, assignment: bool = False):
+        key = (text, assignment)
+        if key not in self.nodes:
+            expressions = self.interpreter.expressions
+            self.nodes[key] = expressions.compile_assignment(text) if assignment else expressions.compile(text)
+        return self.nodes[key]
+
+    def _type_of_value(self, value: str, types: dict):
+        node = self._compile(value, assignment=True) or self._compile(value)
+        return self._type_of_node(node, types)
+
+    def _type_of_expression(self, expr: str, types: dict):
+        return self._type_of_node(self._compile(expr), types)
+
+    def _type_of_node(self, node, types: dict):
+        if isinstance(node, Const):
+            if node.type_name is None:
+                # Folded by -O; the value itself is known.
+                return VALUE_TYPES.get(type(node.value), UNKNOWN)
+            return CONST_TYPES[node.type_name]
+        if isinstance(node, Var):
+            kind = types.get(node.name)
+            return 'list' if isinstance(kind, tuple) else kind
+        if isinstance(node, BinaryOp):
+            if node.type_name == 'boolean':
+                return 'bool'
+            left = self._type_of_node(node.left, types)
+            right = self._type_of_node(node.right, types)
+            if left is None or right is None:
+                return None
+            if node.op in NUMERIC_OPS and left == right == 'number':
+                return 'number'
+            if node.op == 'plus' and left == right == 'str':
+                return 'str'
+            return UNKNOWN
+        if isinstance(node, Generic):
+            call = CALL_NAME.match(node.expr)
+            if call and call.group(1) in self.interpreter.ship_logs:
+                return RETURN_TYPES.get(call.group(1), UNKNOWN)
+            index = LIST_INDEX.match(node.expr)
+            if index:
+                kind = types.get(index.group(1))
+                if isinstance(kind, tuple):
+                    return kind[1]
+                return None if kind is None else UNKNOWN
+        return UNKNOWN
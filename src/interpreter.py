@@ -1,30 +1,68 @@
+import os
 import re
 import math
 import operator
-from typing import Any, List
+import inspect
+import time
+from typing import Any, Callable, List, Optional
 from random import uniform, choice, sample, gauss, randint, shuffle as random_shuffle
 from math import sin, cos, tan, log, exp, factorial
+from itertools import islice
+from bisect import bisect_left, insort
+import heapq
+from contextlib import contextmanager
 
 from .exceptions import PirateException
-from .types import PirateType   
-from .functions import PirateFunction
+from .types import ALLOCATIONS, AllocationCounter, PirateType
+from .functions import PirateFunction, VoyageBatch
 from .eastereggs import PirateEasterEggs
 from .dialects import DialectManager
 from .firstmate import FirstMate
-from .patterns import PatternHandler
+from .patterns import (PatternHandler, ASSIGNMENT, CONDITIONAL, LIST_APPEND, LIST_INDEX, LIST_ITEMS,
+                       LIST_LITERAL, SET_LITERAL, VOYAGE_HEADER)
 from .loops import LoopHandler
 from .switchcase import SwitchCaseHandler
 from .trycatch import TryCatchHandler
+from .parallel import ParallelHandler
+from .profiler import Profiler
+from .tracing import Tracer, TraceEvent
+from .shipstats import ShipStats
+from .memory import MemoryAccountant
+from .expressions import FUNCTION_CALL, ExpressionCache, Const
+from .inference import TypeInference, TYPE_CHECKS, NOT_PROVEN
+from .optimizer import Optimizer
+from .streams import Stream
+from .scrolls import Scroll
+from .slices import LIST_SLICE, ListSlice, SliceHandler
+from . import asyncapi
+from .asyncapi import DEFAULT_YIELD_EVERY
+
+IMPORT = re.compile(r'^import\s+(?:"([^"]+)"|(\S+))$')
+CALL_STATEMENT = re.compile(r'^(\w+)\s+sails\s+with\s*\(?(.*?)\)?$')
+CALL_ARGS = re.compile(r',(?![^[]*\])')
+CALL_IN_BARK = re.compile(r'\bsails\s+with\b')
+REMOVE_ITEM = re.compile(r'^remove\s+(.+)\s+from\s+(\w+)$')
+# Which part of the statement cascade a line can reach, by its first word.
+# Every handler's own check still runs, so this only skips handlers that
+# could never match; lines with any other first word go by their shape.
+STATEMENT_KINDS = {
+    'kill': 'first_mate', 'revive': 'first_mate',
+    'while': 'loop', 'plunder': 'loop', 'repeat': 'loop',
+    'choose': 'switch', 'case': 'switch', 'end': 'end',
+    'brace': 'try', 'if': 'if',
+    'import': 'import', 'voyage': 'voyage', 'add': 'add', 'debug_chest': 'debug',
+    'yield': 'yield', 'remove': 'remove', 'fill': 'fill',
+}
 
 class PirateInterpreter:
     def __init__(self):
         self.scope_stack = [{}]
         self.ship_logs = {
             'bark': self.pirate_print,
-            'count_booty': len,
+            'count_booty': self.pirate_count_booty,
             'plunder': lambda x: max(x.value if isinstance(x, PirateType) else x),
             'abandon': lambda x: min(x.value if isinstance(x, PirateType) else x),
-            'type_of': lambda x: type(x).__name__,
+            'type_of': lambda x: 'list' if isinstance(x, ListSlice) else type(x).__name__,
             'debug_chest': self.debug_treasure_chest,
             'sqrt': math.sqrt,
             'abs': abs,
@@ -58,6 +96,7 @@ class PirateInterpreter:
             'median': lambda lst: sorted(lst.value if hasattr(lst, 'value') else lst)[len(lst.value if hasattr(lst, 'value') else lst) // 2],
             'sum': lambda lst: sum(lst.value if hasattr(lst, 'value') else lst),
             'map': self.pirate_map,
+            'par_map': lambda collection, func_ref: self.parallel_handler.par_map(collection, func_ref),
             'filter': self.pirate_filter,
             'reduce': self.pirate_reduce,
             'shuffle': self.pirate_shuffle,
@@ -65,10 +104,29 @@ class PirateInterpreter:
             'shout': self.pirate_shout,
             'split_loot': self.pirate_split,
             'join_crew': self.pirate_join,
+            'scroll': self.pirate_scroll,
+            'append': self.pirate_append,
+            'append_line': lambda scroll, value='': self.pirate_append(scroll, value, '\n'),
+            'build': self.pirate_build,
             'help': self.pirate_help,
+            'sleep': self.pirate_sleep,
             'check_type': lambda value, type_name: self._check_type(value, type_name),
             'assert_type': lambda value, type_name: self._assert_type(value, type_name),
             'is_list_of_type': self._is_list_of_type,
+            'error_kind': lambda error: self._error_field(error, 'kind'),
+            'error_message': lambda error: self._error_field(error, 'message'),
+            'error_line': lambda error: self._error_field(error, 'line_number'),
+            'ship_stats': self.pirate_ship_stats,
+            'chest_weight': self.pirate_chest_weight,
+            'sort_loot': self.pirate_sort_loot,
+            'top_k': lambda collection, k, func_ref=None: self.pirate_top_k('top_k', heapq.nlargest, collection, k, func_ref),
+            'bottom_k': lambda collection, k, func_ref=None: self.pirate_top_k('bottom_k', heapq.nsmallest, collection, k, func_ref),
+            'find_sorted': self.pirate_find_sorted,
+            'insert_sorted': self.pirate_insert_sorted,
+            'to_set': lambda collection: self._set_of_values([collection]),
+            'union': lambda first, second: self.pirate_set_algebra('union', first, second),
+            'intersection': lambda first, second: self.pirate_set_algebra('intersection', first, second),
+            'difference': lambda first, second: self.pirate_set_algebra('difference', first, second),
         }
         self.pirate_crew = {}
         self.pirate_ops = {
@@ -86,16 +144,36 @@ class PirateInterpreter:
             'and': lambda x, y: x and y,
             'or': lambda x, y: x or y,
             'not': lambda x: not x,
+            'in': lambda x, y: x in y,
         }
         self.easter_eggs = PirateEasterEggs()
         self.easter_eggs.interpreter = self
         self.dialect_manager = DialectManager()
         self.first_mate = FirstMate(self)
         self.first_mate_active = False
+        self.error_log = None
+        self.search_dir = None
+        self.current_file = None
+        self.profiler = None
+        self.tracer = None
+        self.output_sink = None
+        self.pending_output = []
+        self.async_mode = False
+        self.pending_sleep = 0
+        self.type_inference = False
+        self.type_facts = None
+        self.optimize = False
         self.pattern_handler = PatternHandler(self)
         self.loop_handler = LoopHandler(self)
+        self.slice_handler = SliceHandler(self)
         self.switch_handler = SwitchCaseHandler(self)
         self.try_catch_handler = TryCatchHandler(self)
+        self.parallel_handler = ParallelHandler(self)
+        self.expressions = ExpressionCache(self)
+        self.optimizer = Optimizer(self)
+        self.allocations = AllocationCounter()
+        self.stats = ShipStats(self)
+        self.memory = MemoryAccountant(self)
         self.ship_help = {
             'bark': "Prints messages to the console. Usage: bark <message1>, <message2>, ...",
             'count_booty': "Returns the number of items in a list. Usage: count_booty <list>",
@@ -126,6 +204,7 @@ class PirateInterpreter:
             'median': "Finds the median of a list. Usage: median <list>",
             'sum': "Sums all elements in a list. Usage: sum <list>",
             'map': "Applies a function to each item in a list. Usage: map <list> <function>",
+            'par_map': "Applies a function to each item across all cores, keeping order. Usage: par_map <list> <function>",
             'filter': "Filters a list using a function. Usage: filter <list> <function>",
             'reduce': "Reduces a list using a function. Usage: reduce <list> <function> [initial]",
             'shuffle': "Shuffles a list. Usage: shuffle <list>",
@@ -133,10 +212,29 @@ class PirateInterpreter:
             'shout': "Converts a string to uppercase. Usage: shout <string>",
             'split_loot': "Splits a string into a list. Usage: split_loot <string> [separator]",
             'join_crew': "Joins a list of strings into a single string. Usage: join_crew <list> <separator>",
+            'scroll': "Starts a scroll to write text onto a piece at a time. Usage: scroll [text]",
+            'append': "Writes a value onto the end of a scroll. Usage: append <scroll> <value>",
+            'append_line': "Writes a value and then a newline onto a scroll. Usage: append_line <scroll> [value]",
+            'build': "Returns all the text written on a scroll. Usage: build <scroll>",
+            'sleep': "Drops anchor for a number of seconds without blocking other async voyages. Usage: sleep <seconds>",
             'help': "Displays help information. Usage: help [function_name]",
             'check_type': "Checks if a value matches a type. Returns boolean. Usage: check_type <value> <type>",
             'assert_type': "Throws error if value doesn't match type. Usage: assert_type <value> <type>",
             'is_list_of_type': "Checks if all list elements match a type. Usage: is_list_of_type <list> <type>",
+            'error_kind': "Returns the kind of a caught error, like 'parse' or 'unknown_function'. Usage: error_kind <error>",
+            'error_message': "Returns the plain message of a caught error. Usage: error_message <error>",
+            'error_line': "Returns the line a caught error happened on, if known. Usage: error_line <error>",
+            'ship_stats': "Returns the ship's running counters, or just one of them. Usage: ship_stats [counter]",
+            'chest_weight': "Returns the approximate bytes held by all variables and voyages, or by one variable. Usage: chest_weight [variable]",
+            'sort_loot': "Returns a list sorted smallest first, optionally by what a function gives for each item. Usage: sort_loot <list> [function]",
+            'top_k': "Returns the k largest items, largest first. Usage: top_k <list> <k> [function]",
+            'bottom_k': "Returns the k smallest items, smallest first. Usage: bottom_k <list> <k> [function]",
+            'find_sorted': "Finds a value in a sorted list by halving, returning its index or -1. Usage: find_sorted <list> <value>",
+            'insert_sorted': "Adds a value to a sorted list where it keeps the list sorted. Usage: insert_sorted <list> <value>",
+            'to_set': "Makes a set of the distinct values in a list. Usage: to_set <list>",
+            'union': "Returns a set of everything in either set or list. Usage: union <set> <set>",
+            'intersection': "Returns a set of everything in both sets or lists. Usage: intersection <set> <set>",
+            'difference': "Returns a set of everything in the first but not the second. Usage: difference <set> <set>",
         }
         
     def pirate_flip_coin(self):
@@ -163,6 +261,8 @@ class PirateInterpreter:
             s_val = s.value
         else:
             s_val = s
+        if isinstance(s_val, Scroll):
+            s_val = s_val.build()
         if not isinstance(s_val, str):
             raise PirateException("Ye can only split text loot!")
         sep_val = None
@@ -175,6 +275,8 @@ class PirateInterpreter:
                 raise PirateException("Splitter must be text!")
         split_list = s_val.split(sep_val) if sep_val else s_val.split()
         pirate_list = [PirateType(item, 'string') for item in split_list]
+        if self.memory.limit is not None:
+            self.memory.charge(pirate_list)
         return PirateType(pirate_list, 'list')
     
     def pirate_help(self, *args):
@@ -201,7 +303,7 @@ class PirateInterpreter:
             items_val = items.value
         else:
             items_val = items
-        if not isinstance(items_val, list):
+        if not isinstance(items_val, (list, ListSlice)):
             raise PirateException("Ye need a crew list to join!")
         if isinstance(sep, PirateType):
             sep_val = sep.value
@@ -209,10 +311,35 @@ class PirateInterpreter:
             sep_val = sep
         if not isinstance(sep_val, str):
             raise PirateException("Crew bond must be text!")
-        str_items = [str(item.value if isinstance(item, PirateType) else item) 
-                    for item in items_val]
-        return PirateType(sep_val.join(str_items), 'string')
+        try:
+            joined = sep_val.join(items_val)
+        except TypeError:
+            joined = sep_val.join([str(item.value if isinstance(item, PirateType) else item)
+                                   for item in items_val])
+        if self.memory.limit is not None:
+            self.memory.charge(joined)
+        return PirateType(joined, 'string')
     
+    def pirate_scroll(self, text=''):
+        text = text.value if isinstance(text, PirateType) else text
+        scroll = Scroll()
+        scroll.append(text)
+        return scroll
+
+    def pirate_append(self, scroll, value, end=''):
+        if not isinstance(scroll, Scroll):
+            raise PirateException("Ye can only write on a scroll!")
+        if self.memory.limit is not None:
+            self.memory.charge(value, len(end))
+        scroll.append(value)
+        if end:
+            scroll.append(end)
+
+    def pirate_build(self, scroll):
+        if not isinstance(scroll, Scroll):
+            raise PirateException("Ye can only build a scroll!")
+        return scroll.build()
+
     def pirate_weighted_choice(self, items, weights):
         items_list = items.value if isinstance(items, PirateType) else items
         weights_list = weights.value if isinstance(weights, PirateType) else weights
@@ -241,10 +368,15 @@ class PirateInterpreter:
         k_value = k.value if isinstance(k, PirateType) else k
         return sample(lst_value, k_value)
     
+    def pirate_count_booty(self, collection):
+        if isinstance(collection, Stream):
+            return sum(1 for _ in collection)
+        return len(collection)
+
     def pirate_map(self, collection, func_ref):
         if isinstance(collection, PirateType):
             collection = collection.value
-        if not isinstance(collection, list):
+        if not isinstance(collection, (list, ListSlice, Stream)):
             raise PirateException("Map requires a list as the first argument")
         if isinstance(func_ref, PirateType):
             func_ref = func_ref.value
@@ -259,17 +391,17 @@ class PirateInterpreter:
                     mapped.append(result)
                 except Exception as e:
                     raise PirateException(f"Error in map function {func_ref}: {e}")
+            if self.memory.limit is not None:
+                self.memory.charge(mapped)
             return mapped
         elif func_ref in self.pirate_crew:
             func = self.pirate_crew[func_ref]
             if len(func.params) < 1:
                 raise PirateException(f"Function {func_ref} must take at least one parameter for map")
-            mapped = []
-            for item in collection:
-                arg = PirateType(item)
-                result = self.execute_function(func_ref, [arg])
-                mapped_value = result.value if isinstance(result, PirateType) else result
-                mapped.append(mapped_value)
+            with VoyageBatch(self, func) as voyage:
+                mapped = [voyage(PirateType(item)) for item in collection]
+            if self.memory.limit is not None:
+                self.memory.charge(mapped)
             return mapped
         else:
             raise PirateException(f"Function {func_ref} not found")
@@ -277,7 +409,7 @@ class PirateInterpreter:
     def pirate_filter(self, collection, func_ref):
         if isinstance(collection, PirateType):
             collection = collection.value
-        if not isinstance(collection, list):
+        if not isinstance(collection, (list, ListSlice, Stream)):
             raise PirateException("Filter requires a list as the first argument")
         if isinstance(func_ref, PirateType):
             func_ref = func_ref.value
@@ -297,35 +429,33 @@ class PirateInterpreter:
             func = self.pirate_crew[func_ref]
             if len(func.params) < 1:
                 raise PirateException(f"Function {func_ref} must take at least one parameter for filter")
-            for item in collection:
-                arg = PirateType(item)
-                result = self.execute_function(func_ref, [arg])
-                condition = result.value if isinstance(result, PirateType) else result
-                if condition:
-                    filtered.append(item)
+            with VoyageBatch(self, func) as voyage:
+                filtered = [item for item in collection if voyage(PirateType(item))]
         else:
             raise PirateException(f"Function {func_ref} not found")
         return filtered
     def pirate_reduce(self, collection, func_ref, initial=None):
         if isinstance(collection, PirateType):
             collection = collection.value
-        if not isinstance(collection, list):
+        if not isinstance(collection, (list, ListSlice, Stream)):
             raise PirateException("Reduce requires a list as the first argument")
         if isinstance(func_ref, PirateType):
             func_ref = func_ref.value
         if not isinstance(func_ref, str):
             raise PirateException("Function reference must be a string")
         if initial is None:
-            if not collection:
+            first = list(islice(collection, 1))
+            if not first:
                 raise PirateException("Reduce of empty collection with no initial value")
-            accumulator = collection[0]
-            start_index = 1
+            accumulator = first[0]
+            # A stream has already moved past its first item.
+            rest = collection if isinstance(collection, Stream) else islice(collection, 1, None)
         else:
             accumulator = initial.value if isinstance(initial, PirateType) else initial
-            start_index = 0
+            rest = collection
         if func_ref in self.ship_logs:
             func = self.ship_logs[func_ref]
-            for item in collection[start_index:]:
+            for item in rest:
                 try:
                     accumulator = func(accumulator, item)
                 except Exception as e:
@@ -334,17 +464,133 @@ class PirateInterpreter:
             func = self.pirate_crew[func_ref]
             if len(func.params) < 2:
                 raise PirateException(f"Function {func_ref} must take at least two parameters for reduce")
-            for item in collection[start_index:]:
-                args = [PirateType(accumulator), PirateType(item)]
-                result = self.execute_function(func_ref, args)
-                if isinstance(result, PirateType):
-                    accumulator = result.value
-                else:
-                    accumulator = result
+            with VoyageBatch(self, func) as voyage:
+                for item in rest:
+                    accumulator = voyage(PirateType(accumulator), PirateType(item))
         else:
             raise PirateException(f"Function {func_ref} not found")
         return accumulator
+
+    @contextmanager
+    def _sort_key(self, func_ref, purpose: str):
+        """Yields the key for sorted() or heapq; both work out each item's key only once."""
+        if isinstance(func_ref, PirateType):
+            func_ref = func_ref.value
+        if func_ref is None:
+            yield None
+        elif not isinstance(func_ref, str):
+            raise PirateException("Function reference must be a string")
+        elif func_ref in self.ship_logs:
+            func = self.ship_logs[func_ref]
+
+            def key(item):
+                value = func(item)
+                return value.value if isinstance(value, PirateType) else value
+            yield key
+        elif func_ref in self.pirate_crew:
+            func = self.pirate_crew[func_ref]
+            if len(func.params) < 1:
+                raise PirateException(f"Function {func_ref} must take at least one parameter for {purpose}")
+            with VoyageBatch(self, func) as voyage:
+                yield lambda item: voyage(PirateType(item))
+        else:
+            raise PirateException(f"Function {func_ref} not found")
+
+    def _sortable(self, collection, purpose: str):
+        if isinstance(collection, PirateType):
+            collection = collection.value
+        if not isinstance(collection, (list, ListSlice, Stream)):
+            raise PirateException(f"{purpose} requires a list as the first argument")
+        return collection
+
+    def pirate_sort_loot(self, collection, func_ref=None):
+        collection = self._sortable(collection, "sort_loot")
+        with self._sort_key(func_ref, "sort_loot") as key:
+            try:
+                result = sorted(collection, key=key)
+            except TypeError as e:
+                raise PirateException(f"Can't sort loot of different kinds: {e}")
+        if self.memory.limit is not None:
+            self.memory.charge(result)
+        return result
+
+    def pirate_top_k(self, name: str, select, collection, k, func_ref=None):
+        collection = self._sortable(collection, name)
+        k = k.value if isinstance(k, PirateType) else k
+        if not isinstance(k, int) or isinstance(k, bool) or k < 0:
+            raise PirateException("Ye need a whole number of treasures to pick!")
+        with self._sort_key(func_ref, name) as key:
+            try:
+                return select(k, collection, key=key)
+            except TypeError as e:
+                raise PirateException(f"Can't rank loot of different kinds: {e}")
+
+    def pirate_find_sorted(self, collection, value):
+        collection = self._sortable(collection, "find_sorted")
+        if isinstance(collection, Stream):
+            raise PirateException("find_sorted needs a list it can look back into, not a stream")
+        value = value.value if isinstance(value, PirateType) else value
+        try:
+            index = bisect_left(collection, value)
+        except TypeError as e:
+            raise PirateException(f"Can't search loot of different kinds: {e}")
+        if index < len(collection) and collection[index] == value:
+            return index
+        return -1
+
+    def pirate_insert_sorted(self, collection, value):
+        if isinstance(collection, PirateType):
+            collection = collection.value
+        if not isinstance(collection, list):
+            raise PirateException("insert_sorted requires a list as the first argument")
+        value = value.value if isinstance(value, PirateType) else value
+        if self.memory.limit is not None:
+            self.memory.charge(value, 8)
+        try:
+            insort(collection, value)
+        except TypeError as e:
+            raise PirateException(f"Can't sort loot of different kinds: {e}")
+
+    def _set_of_values(self, items: list) -> set:
+        # 'set of names' is the distinct names, not a set holding one list.
+        if len(items) == 1:
+            only = items[0].value if isinstance(items[0], PirateType) else items[0]
+            if isinstance(only, (list, ListSlice, Stream, set)):
+                items = only
+        chest = self._chest(items)
+        if self.memory.limit is not None:
+            self.memory.charge(chest)
+        return chest
+
+    def _chest(self, items) -> set:
+        if isinstance(items, Stream):
+            items = list(items)
+        try:
+            return set(items)
+        except TypeError:
+            pass
+        try:
+            return {item.value if isinstance(item, PirateType) else item for item in items}
+        except TypeError:
+            raise PirateException("Only plain loot can go in a set, not lists or chests!")
+
+    def pirate_set_algebra(self, operation: str, first, second):
+        first = first.value if isinstance(first, PirateType) else first
+        second = second.value if isinstance(second, PirateType) else second
+        for value in (first, second):
+            if not isinstance(value, (set, list, ListSlice)):
+                raise PirateException(f"{operation} needs sets or lists, not {type(value).__name__}")
+        first = first if isinstance(first, set) else self._chest(first)
+        second = second if isinstance(second, set) else self._chest(second)
+        chest = getattr(first, operation)(second)
+        if self.memory.limit is not None:
+            self.memory.charge(chest)
+        return chest
+
     def parse_expression(self, expr: str) -> Any:
+        return self.expressions.lookup(expr.strip()).boxed(self)
+
+    def _parse_expression(self, expr: str) -> Any:
         expr = expr.strip()
         if expr.startswith('(') and expr.endswith(')'):
             args = []
@@ -388,23 +634,22 @@ class PirateInterpreter:
                     raise PirateException("Modulo by zero!")
                     
                 return PirateType(self.pirate_ops[op](left_val, right_val))
-        func_call = re.match(r'^(\w+)\s+sails\s+with(?:\s+(.+))?$', expr)
+        func_call = FUNCTION_CALL.match(expr)
         if func_call:
             func_name = func_call.group(1)
             args_str = func_call.group(2) or ''
             args = []
-            for arg in args_str.split(','):
-                arg = arg.strip()
-                if arg:
-                    parsed_arg = self.parse_expression(arg)
-                    args.append(parsed_arg)
+            arg_texts = [arg.strip() for arg in args_str.split(',') if arg.strip()]
+            for arg in arg_texts:
+                parsed_arg = self.parse_expression(arg)
+                args.append(parsed_arg)
             if func_name in self.ship_logs:
                 unboxed_args = [arg.value if isinstance(arg, PirateType) else arg for arg in args]
-                result = self.ship_logs[func_name](*unboxed_args)
+                result = self.call_builtin(func_name, arg_texts, unboxed_args)
                 return PirateType(result)
             if func_name in self.pirate_crew:
                 return self.execute_function(func_name, args)
-            raise PirateException(f"Unknown function: {func_name}")
+            raise PirateException(f"Unknown function: {func_name}", kind='unknown_function')
         if expr.startswith('"') and expr.endswith('"'):
             return PirateType(expr[1:-1], 'string')
         if expr.replace('.','',1).isdigit():
@@ -412,28 +657,46 @@ class PirateInterpreter:
             return PirateType(value, 'number')
         if expr.lower() in ['true', 'false']:
             return PirateType(expr.lower() == 'true', 'boolean')
-        list_index = re.match(r'^(\w+)\[(\d+)\]$', expr)
+        list_index = LIST_INDEX.match(expr)
         if list_index:
             list_name = list_index.group(1)
             index = int(list_index.group(2))
             lst = self.resolve_variable(list_name)
-            if isinstance(lst, PirateType) and isinstance(lst.value, list):
+            if isinstance(lst, PirateType) and isinstance(lst.value, (list, ListSlice)):
                 return PirateType(lst.value[index])
             raise PirateException(f"{list_name} is not a list")
+        list_slice = LIST_SLICE.match(expr)
+        if list_slice:
+            return self.slice_handler.view(*list_slice.groups())
         try:
             return self.resolve_variable(expr)
         except PirateException:
-            raise PirateException(f"Cannot parse expression: {expr}")
+            raise PirateException(f"Cannot parse expression: {expr}", kind='parse')
+    def call_builtin(self, func_name: str, arg_texts: List[str], args: List[Any]) -> Any:
+        if self.type_facts is not None and func_name in TYPE_CHECKS:
+            proven = self.type_facts.prove(func_name, arg_texts, args)
+            if proven is not NOT_PROVEN:
+                return proven
+        return self.ship_logs[func_name](*args)
+
     def kill_first_mate(self):
         self.first_mate_active = False
-        print("First Mate has walked the plank!")
+        self.emit("First Mate has walked the plank!")
     def revive_first_mate(self):
         self.first_mate_active = True
-        print("First Mate has returned from Davy Jones' locker!")
+        self.emit("First Mate has returned from Davy Jones' locker!")
     def execute_function(self, func_name: str, args: List[Any]) -> Any:
         if func_name in self.pirate_crew:
-            self.push_scope()
+            self.stats.voyage_calls += 1
             func = self.pirate_crew[func_name]
+            if self.profiler is not None or self.tracer is not None:
+                return self.monitor_voyage(func, self._execute_function, func, args)
+            return self._execute_function(func, args)
+        raise PirateException(f"Unknown function: {func_name}", kind='unknown_function')
+
+    def _execute_function(self, func: PirateFunction, args: List[Any]) -> Any:
+        self.push_scope()
+        try:
             combined_args = []
             for i, param_info in enumerate(func.params):
                 param_name, default_value = param_info
@@ -444,19 +707,29 @@ class PirateInterpreter:
             for param_info, arg in zip(func.params, combined_args):
                 param_name = param_info[0]
                 self.treasure_chest[param_name] = arg
+            if func.is_stream:
+                return PirateType(Stream(self, func, self.treasure_chest), 'stream')
             result = None
-            for cmd in func.body:
+            for cmd, line_number in zip(func.body, func.line_numbers):
                 if cmd.strip().startswith('return'):
-                    result = self.parse_expression(cmd.strip()[7:])
+                    result = self.return_value(cmd, line_number)
                     break
-                result = self.parse_command(cmd)
-            self.pop_scope()
+                result = self.parse_command(cmd, line_number)
             return result
-        raise PirateException(f"Unknown function: {func_name}")
+        except PirateException as e:
+            e.add_voyage(func.name)
+            raise
+        finally:
+            self.pop_scope()
+
     def pirate_print(self, *args):
         printed_args = []
         for arg in args:
-            if isinstance(arg, PirateType):
+            if isinstance(arg, PirateType) and isinstance(arg.value, Scroll):
+                printed_args.append(arg.value)
+            elif isinstance(arg, Scroll):
+                printed_args.append(arg)
+            elif isinstance(arg, PirateType):
                 printed_args.append(f"{arg.value}")
             elif isinstance(arg, str):
                 try:
@@ -469,18 +742,58 @@ class PirateInterpreter:
                     printed_args.append(arg)
             else:
                 printed_args.append(str(arg))
-        message = " ".join(str(arg) for arg in printed_args)
-        print(message)
+        if len(printed_args) == 1 and isinstance(printed_args[0], Scroll):
+            message = printed_args[0]
+        else:
+            message = " ".join(str(arg) for arg in printed_args)
+        self.emit(message)
         if self.easter_eggs.parrot_mode:
-            print(message)
+            self.emit(message)
             
     
+    def emit(self, message):
+        if self.output_sink is None:
+            if isinstance(message, Scroll):
+                # Straight out piece by piece; the text is never joined.
+                print(*message.pieces, sep='')
+                return
+            print(message)
+            return
+        result = self.output_sink(str(message))
+        if inspect.isawaitable(result):
+            self.pending_output.append(result)
+
+    def pirate_sleep(self, seconds=0):
+        seconds = seconds.value if isinstance(seconds, PirateType) else seconds
+        if not isinstance(seconds, (int, float)) or seconds < 0:
+            raise PirateException("Ye can only drop anchor for a positive number of seconds!")
+        if self.async_mode:
+            self.pending_sleep += seconds
+        else:
+            time.sleep(seconds)
+
+    def pirate_ship_stats(self, name=None):
+        stats = self.stats.snapshot()
+        if name is None:
+            return stats
+        name = name.value if isinstance(name, PirateType) else name
+        if name not in stats:
+            raise PirateException(f"No such counter in the ship's log: {name}")
+        return stats[name]
+
+    def pirate_chest_weight(self, name=None):
+        if name is None:
+            return self.memory.weigh()
+        name = name.value if isinstance(name, PirateType) else name
+        return self.memory.size_of(self.resolve_variable(name))
+
     def debug_treasure_chest(self):
-        print("🏴‍☠️ Current Treasure Chest Contents:")
+        self.emit("🏴‍☠️ Current Treasure Chest Contents:")
         for name, value in self.treasure_chest.items():
-            print(f"{name}: {value}")
+            self.emit(f"{name}: {value}")
     
     def push_scope(self):
+        self.stats.scope_pushes += 1
         self.scope_stack.append({})
     
     def pop_scope(self):
@@ -492,6 +805,8 @@ class PirateInterpreter:
             type_name = type_name.value
         if isinstance(value, PirateType):
             actual_type = value.type
+        elif isinstance(value, ListSlice):
+            actual_type = 'list'
         else:
             actual_type = type(value).__name__
             if actual_type in ['int', 'float']:
@@ -504,12 +819,17 @@ class PirateInterpreter:
 
     def _is_list_of_type(self, lst, element_type):
         lst = lst.value if isinstance(lst, PirateType) else lst
-        if not isinstance(lst, list):
+        if not isinstance(lst, (list, ListSlice)):
             return PirateType(False, 'boolean')
         return PirateType(
             all(self._check_type(item, element_type).value for item in lst),
             'boolean'
         )
+    def _error_field(self, error, field: str):
+        if not isinstance(error, PirateException):
+            raise PirateException("That ain't a capsized error, matey!", kind='type')
+        return getattr(error, field)
+
     @property
     def treasure_chest(self):
         return self.scope_stack[-1]
@@ -518,9 +838,56 @@ class PirateInterpreter:
         for scope in reversed(self.scope_stack):
             if var_name in scope:
                 return scope[var_name]
-        raise PirateException(f"No treasure found for {var_name}")  
+        raise PirateException(f"No treasure found for {var_name}", kind='undefined_variable')  
     
+    def profile(self) -> Profiler:
+        return Profiler(self)
+
+    def set_trace(self, hook: Optional[Callable[[TraceEvent], Any]], every: int = 1, events=None) -> Optional[Tracer]:
+        self.tracer = Tracer(self, hook, every, events) if hook is not None else None
+        return self.tracer
+
+    def monitor_voyage(self, func: PirateFunction, run, *args) -> Any:
+        tracer = self.tracer
+        if tracer is None:
+            return self.profiler.voyage(func, run, *args)
+        tracer.call(func, args[-1])
+        try:
+            if self.profiler is not None:
+                result = self.profiler.voyage(func, run, *args)
+            else:
+                result = run(*args)
+        except BaseException:
+            tracer.unwind()
+            raise
+        tracer.ret(func, result)
+        return result
+
     def parse_command(self, command: str, line_number: int = None) -> Any:
+        if ALLOCATIONS.get() is not self.allocations:
+            ALLOCATIONS.set(self.allocations)
+        self.stats.statements += 1
+        if self.tracer is not None:
+            self.tracer.statement(command, line_number)
+        # Lines only being written into a voyage's body aren't run yet.
+        if self.profiler is not None and not hasattr(self, 'current_function'):
+            return self.profiler.statement(self._parse_command, command, line_number)
+        return self._parse_command(command, line_number)
+
+    def return_value(self, command: str, line_number: int = None) -> Any:
+        if self.profiler is not None:
+            return self.profiler.statement(self._return_value, command, line_number)
+        return self._return_value(command, line_number)
+
+    def _return_value(self, command: str, line_number: int = None) -> Any:
+        try:
+            return self.parse_expression(command.strip()[7:])
+        except PirateException as e:
+            raise self.command_error(e, command.strip(), line_number)
+        except Exception as e:
+            raise self.command_error(e, command.strip(), line_number) from e
+
+    def _parse_command(self, command: str, line_number: int = None) -> Any:
         try:
             command = command.strip()
             if not command or command.startswith('#'):
@@ -531,89 +898,93 @@ class PirateInterpreter:
                 return None
               
             command = dialect_result
-            
-            processed_command = self.pattern_handler.handle_pattern(command)
-            if processed_command is None:
+
+            if hasattr(self, 'current_function'):
+                if command == 'end voyage':
+                    self.pirate_crew[self.current_function.name] = self.current_function
+                    delattr(self, 'current_function')
+                else:
+                    self.current_function.body.append(command)
+                    self.current_function.line_numbers.append(line_number)
                 return None
             
-            if command.strip() == "kill first mate":
-                return self.kill_first_mate()
-            if command.strip() == "revive first mate":
-                return self.revive_first_mate()
+            words = command.split(None, 2) or ['']
+            kind = STATEMENT_KINDS.get(words[0])
+            shape = words[1] if len(words) > 1 else None
+
+            if shape == 'be':
+                processed_command = self.pattern_handler.handle_pattern(command)
+                if processed_command is None:
+                    return None
+            
+            if kind == 'first_mate':
+                if command == "kill first mate":
+                    return self.kill_first_mate()
+                if command == "revive first mate":
+                    return self.revive_first_mate()
             
             if self.easter_eggs.check_for_easter_eggs(command):
                 return None
             
-            loop_result = self.loop_handler.handle_loop(command)
-            if loop_result is True:
-                return None
+            if kind == 'loop':
+                loop_result = self.loop_handler.handle_loop(command)
+                if loop_result is True:
+                    return None
             
-            if self.switch_handler.handle_switch(command):
-                return None
-            if self.switch_handler.handle_case(command):
-                return None
-            if self.switch_handler.handle_default(command):
-                return None
-            if self.switch_handler.handle_end_switch(command):
-                return None
-            if self.try_catch_handler.handle_try_start(command):
+            if kind == 'switch' or kind == 'end' or command.startswith('default:'):
+                if self.switch_handler.handle_switch(command):
+                    return None
+                if self.switch_handler.handle_case(command):
+                    return None
+                if self.switch_handler.handle_default(command):
+                    return None
+                if self.switch_handler.handle_end_switch(command):
+                    return None
+            if kind == 'try' and self.try_catch_handler.handle_try_start(command):
                 return None
-            if self.try_catch_handler.handle_catch(command):
+            if kind == 'if' and self.try_catch_handler.handle_catch(command):
                 return None
             if self.try_catch_handler.collect_try_command(command):
                 return None
             
-            import_match = re.match(r'^import\s+(?:"([^"]+)"|(\S+))$', command)
+            import_match = IMPORT.match(command) if kind == 'import' else None
             if import_match:
                 filename = import_match.group(1) or import_match.group(2)
                 if not filename.endswith('.maroon'):
                     filename += '.maroon'
+                if self.search_dir and not os.path.isabs(filename):
+                    filename = os.path.join(self.search_dir, filename)
+                self.stats.imports += 1
                 self.run_script(filename, in_global_scope=True)
                 return None
             
-            func_match = re.match(r'^voyage\s+(\w+)\((.*?)\):$', command)
+            func_match = VOYAGE_HEADER.match(command) if kind == 'voyage' else None
             if func_match:
                 func_name = func_match.group(1)
-                params_str = func_match.group(2)
-                params = []
-                for p in params_str.split(','):
-                    p = p.strip()
-                    if not p:
-                        continue
-                    if ' be ' in p:
-                        name_part, default_part = p.split(' be ', 1)
-                        name = name_part.strip()
-                        default_value = self.parse_expression(default_part.strip())
-                        params.append( (name, default_value) )
-                    else:
-                        params.append( (p, None) )
+                params = [
+                    (name, self.parse_expression(default) if default is not None else None)
+                    for name, default in self._voyage_params(func_match.group(2))
+                ]
                 
-                self.current_function = PirateFunction(func_name, params, [])
+                self.current_function = PirateFunction(func_name, params, [], source_file=self.current_file)
                 return None
 
             if command == 'end voyage':
-                if hasattr(self, 'current_function'):
-                    self.pirate_crew[self.current_function.name] = self.current_function
-                    delattr(self, 'current_function')
                 return None
 
-            if hasattr(self, 'current_function'):
-                self.current_function.body.append(command)
-                return None
-            func_call = re.match(r'^(\w+)\s+sails\s+with\s*\(?(.*?)\)?$', command)
+            func_call = CALL_STATEMENT.match(command) if shape == 'sails' else None
             if func_call:
                 func_name = func_call.group(1)
                 args_str = func_call.group(2) or ''
                 args = []
-                for arg in re.split(r',(?![^[]*\])', args_str):
-                    arg = arg.strip()
-                    if arg:
-                        parsed_arg = self.parse_expression(arg)
-                        args.append(parsed_arg)
+                arg_texts = [arg.strip() for arg in CALL_ARGS.split(args_str) if arg.strip()]
+                for arg in arg_texts:
+                    parsed_arg = self.parse_expression(arg)
+                    args.append(parsed_arg)
                 
                 if func_name in self.ship_logs:
                     unboxed_args = [arg.value if isinstance(arg, PirateType) else arg for arg in args]
-                    result = self.ship_logs[func_name](*unboxed_args)
+                    result = self.call_builtin(func_name, arg_texts, unboxed_args)
                     if result is not None:
                         return PirateType(result)
                     return None
@@ -621,46 +992,46 @@ class PirateInterpreter:
                 if func_name in self.pirate_crew:
                     return self.pirate_crew[func_name](self, args)
                 
-                raise PirateException(f"Unknown function: {func_name}")
-            
-            guidance = None
-            if self.first_mate_active:
-                guidance = self.first_mate.provide_guidance(command)
-                if guidance:
-                    print(guidance)
+                raise PirateException(f"Unknown function: {func_name}", kind='unknown_function')
             
-            var_match = re.match(r'^(\w+)\s+be\s+(.+)$', command)
+            var_match = ASSIGNMENT.match(command) if shape == 'be' else None
             if var_match:
                 var_name = var_match.group(1)
                 value_str = var_match.group(2)
 
-                list_match = re.match(r'^list\s+of\s*\[?(.*?)\]?$', value_str)
+                list_match = LIST_LITERAL.match(value_str)
                 if list_match:
                     items = []
                     if list_match.group(1).strip():
                         items = [self.parse_expression(item.strip()).value 
-                                for item in re.split(r',(?![^\[]*\])', list_match.group(1))]
+                                for item in LIST_ITEMS.split(list_match.group(1))]
+                    if self.memory.limit is not None:
+                        self.memory.charge(items)
                     self.treasure_chest[var_name] = PirateType(items, 'list')
                     return None
 
-                arith_match = re.match(r'^(.+?)\s+(plus|minus|times|divided_by|modulo|power)\s+(.+)$', value_str)
-                if arith_match:
-                    left = self.parse_expression(arith_match.group(1))
-                    op = arith_match.group(2)
-                    right = self.parse_expression(arith_match.group(3))
-                    
-                    left_val = left.value if isinstance(left, PirateType) else left
-                    right_val = right.value if isinstance(right, PirateType) else right
-                    
-                    result = self.pirate_ops[op](left_val, right_val)
-                    self.treasure_chest[var_name] = PirateType(result)
+                set_match = SET_LITERAL.match(value_str) if value_str.startswith('set') else None
+                if set_match:
+                    items = []
+                    if set_match.group(1).strip():
+                        items = [self.parse_expression(item.strip()).value
+                                for item in LIST_ITEMS.split(set_match.group(1))]
+                    self.treasure_chest[var_name] = PirateType(self._set_of_values(items), 'set')
+                    return None
+
+                arith_node = self.expressions.lookup_assignment(value_str)
+                if arith_node is not None:
+                    if self.type_facts is not None and var_name in self.type_facts.numeric:
+                        self.treasure_chest[var_name] = arith_node.evaluate(self)
+                    else:
+                        self.treasure_chest[var_name] = arith_node.boxed(self)
                     return None
 
                 value = self.parse_expression(value_str)
                 self.treasure_chest[var_name] = value
                 return None
 
-            if command.startswith('bark'):
+            if words[0].startswith('bark'):
                 args = command[4:].strip()
                 if not args:
                     self.pirate_print()
@@ -671,7 +1042,7 @@ class PirateInterpreter:
                 merged_parts = []
                 while i < len(arg_parts):
                     part = arg_parts[i].strip()
-                    if re.search(r'\bsails\s+with\b', part):
+                    if CALL_IN_BARK.search(part):
                         merged = [part]
                         i += 1
                         while i < len(arg_parts):
@@ -693,18 +1064,58 @@ class PirateInterpreter:
                 
                 self.pirate_print(*parsed_args)
                 return None
-            list_append = re.match(r'^add\s+(.+)\s+to\s+(\w+)$', command)
+            if (kind == 'remove' or kind == 'fill' or (shape == 'be' and '[' in words[0])
+                    or (kind == 'add' and (shape == 'all' or ' at ' in command))):
+                if self.slice_handler.handle_list_command(command, kind):
+                    return None
+            list_append = LIST_APPEND.match(command) if kind == 'add' else None
             if list_append:
                 item = self.parse_expression(list_append.group(1))
                 list_name = list_append.group(2)
                 lst = self.resolve_variable(list_name)
                 if isinstance(lst, PirateType) and isinstance(lst.value, list):
-                    lst.value.append(item.value if isinstance(item, PirateType) else item)
+                    value = item.value if isinstance(item, PirateType) else item
+                    if self.memory.limit is not None:
+                        self.memory.charge(value, 8)
+                    lst.value.append(value)
+                    return None
+                if isinstance(lst, PirateType) and isinstance(lst.value, set):
+                    value = item.value if isinstance(item, PirateType) else item
+                    if self.memory.limit is not None:
+                        self.memory.charge(value, 8)
+                    try:
+                        lst.value.add(value)
+                    except TypeError:
+                        raise PirateException("Only plain loot can go in a set, not lists or chests!")
+                    return None
+                if isinstance(lst, PirateType) and isinstance(lst.value, ListSlice):
+                    value = item.value if isinstance(item, PirateType) else item
+                    if self.memory.limit is not None:
+                        self.memory.charge(value, 8)
+                    lst.value.append(value)
                     return None
                 raise PirateException(f"{list_name} is not a list")
-            if command == 'debug_chest':
+            remove_item = REMOVE_ITEM.match(command) if kind == 'remove' else None
+            if remove_item:
+                item = self.parse_expression(remove_item.group(1))
+                value = item.value if isinstance(item, PirateType) else item
+                target_name = remove_item.group(2)
+                target = self.resolve_variable(target_name)
+                target = target.value if isinstance(target, PirateType) else target
+                if isinstance(target, set):
+                    try:
+                        target.discard(value)
+                    except TypeError:
+                        pass
+                    return None
+                if isinstance(target, list):
+                    if value in target:
+                        target.remove(value)
+                    return None
+                raise PirateException(f"{target_name} is not a list or set")
+            if kind == 'debug' and command == 'debug_chest':
                 return self.debug_treasure_chest()
-            if_match = re.match(r'^if\s+(.+?)\s+be\s+(less_than|greater_than|equals|greater_or_equal|less_or_equal)\s+(.+?)\s*,\s*then\s+(.+?)(?:\s+else\s+(.+))?$', command)
+            if_match = CONDITIONAL.match(command) if kind == 'if' else None
             if if_match:
                 cond_left = self.parse_expression(if_match.group(1))
                 comparison = if_match.group(2)
@@ -720,19 +1131,145 @@ class PirateInterpreter:
                 elif else_action:
                     return self.parse_command(else_action)
                 return None
-            raise PirateException(f"Cannot parse command: {command}")   
+            if kind == 'yield':
+                raise PirateException("Ye can only yield from inside a voyage, matey!", kind='parse')
+            raise PirateException(f"Cannot parse command: {command}", kind='parse')   
+        except PirateException as e:
+            raise self.command_error(e, command, line_number)
         except Exception as e:
-            suggestion = self.first_mate.provide_guidance(command, e)
-            if suggestion:
-                print(suggestion)
-                raise PirateException(str(e), line_number, f"Error in command: {command}")
-            if isinstance(e, PirateException):
-                raise
-            raise PirateException(str(e), line_number, f"Error in command: {command}")
+            raise self.command_error(e, command, line_number) from e
+
+    def command_error(self, e: Exception, command: str, line_number: int = None) -> PirateException:
+        """The error a failed statement raises, counted, traced and with the First Mate's guidance."""
+        if isinstance(e, PirateException):
+            if not e.guided:
+                e.guided = True
+                self.stats.exceptions += 1
+                if self.tracer is not None:
+                    self.tracer.exception(e, line_number)
+                suggestion = self.first_mate.provide_guidance(command, e)
+                if suggestion:
+                    self.emit(suggestion)
+                    e.wrapped = True
+            if e.wrapped:
+                e.annotate(line_number, f"Error in command: {command}")
+            return e
+        error = PirateException(str(e), line_number, f"Error in command: {command}", kind='internal')
+        error.guided = error.wrapped = True
+        self.stats.exceptions += 1
+        if self.tracer is not None:
+            self.tracer.exception(error, line_number)
+        return error
+    def report_error(self, error):
+        if self.error_log is not None:
+            self.error_log.append(error)
+        else:
+            self.emit(error)
+
+    def review_lines(self, lines: List[str], start_line: int = 1) -> List[str]:
+        if self.first_mate_active or any('revive first mate' in line for line in lines):
+            return self.first_mate.review_program(lines, start_line, self.first_mate_active)
+        return []
+
+    def _voyage_params(self, params_str: str) -> List[tuple]:
+        params = []
+        for p in params_str.split(','):
+            p = p.strip()
+            if not p:
+                continue
+            if ' be ' in p:
+                name_part, default_part = p.split(' be ', 1)
+                params.append( (name_part.strip(), default_part.strip()) )
+            else:
+                params.append( (p, None) )
+        return params
+
+    def _define_lazily(self, lines: List[str], index: int, start_line: int, header: str) -> Optional[int]:
+        """Register a voyage from its header alone, leaving the body to be read on first use.
+
+        Only done when skipping the body lines can't be told apart from feeding
+        them through parse_command; returns the index after 'end voyage'.
+        """
+        if (self.profiler is not None or self.tracer is not None or hasattr(self, 'current_function')
+                or self.try_catch_handler.in_try_block or self.dialect_manager.active_dialect is not None
+                or self.dialect_manager.parsing_dialect):
+            return None
+        func_match = VOYAGE_HEADER.match(header)
+        if not func_match or self.easter_eggs.check_for_secrets(header):
+            return None
+        # Literal defaults can be boxed whenever; anything else might read a
+        # variable or call a voyage, so it has to run at definition time.
+        params = []
+        for name, default in self._voyage_params(func_match.group(2)):
+            node = self.expressions.lookup(default) if default is not None else None
+            if node is not None and not isinstance(node, Const):
+                return None
+            params.append((name, node))
+        end = next((i for i in range(index, len(lines)) if lines[i].strip() == 'end voyage'), None)
+        if end is None:
+            return None
+        span = lines[index:end]
+
+        def load():
+            body, line_numbers = [], []
+            for line_number, line in enumerate(span, start_line + index):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    body.append(line)
+                    line_numbers.append(line_number)
+            return [(name, node.boxed(self) if node is not None else None) for name, node in params], body, line_numbers
+
+        self.stats.statements += 1
+        name = func_match.group(1)
+        self.pirate_crew[name] = PirateFunction.lazy(name, load, source_file=self.current_file)
+        return end + 1
+
+    def execute_lines(self, lines, start_line: int = 1, review: Optional[List[str]] = None):
+        """Runs a script a line at a time; pass First Mate's review of it if ye already have one."""
+        lines = list(lines)
+        if review is None:
+            review = self.review_lines(lines, start_line)
+        for diagnostic in review:
+            self.emit(diagnostic)
+        if self.optimize:
+            lines = self.optimizer.optimize(lines)
+        inferring = self.type_inference and self.type_facts is None
+        if inferring:
+            self.type_facts = TypeInference(self).analyze(lines)
+        # Dialects can rewrite any line, voyage headers and 'end voyage' included.
+        lazy = not any('dialect' in line for line in lines)
+        try:
+            index = 0
+            while index < len(lines):
+                line_num = start_line + index
+                line = lines[index].strip()
+                index += 1
+                if line:
+                    if lazy and line.startswith('voyage'):
+                        end = self._define_lazily(lines, index, start_line, line)
+                        if end is not None:
+                            index = end
+                            yield line_num
+                            continue
+                    try:
+                        result = self.parse_command(line, line_num)
+                        if result and not isinstance(result, str):
+                            self.emit(result)
+                    except PirateException as e:
+                        self.report_error(e)
+                    except Exception as e:
+                        self.report_error(f"Error on line {line_num}: {e}")
+                    yield line_num
+        finally:
+            if inferring:
+                self.type_facts = None
+
     def run_script(self, filename: str, in_global_scope=False):
         try:
             with open(filename, 'r') as f:
                 original_scope_stack = None
+                original_file = self.current_file
+                self.current_file = filename
                 if in_global_scope:
                     original_scope_stack = self.scope_stack.copy()
                     if original_scope_stack:
@@ -740,21 +1277,22 @@ class PirateInterpreter:
                     else:
                         self.scope_stack = [{}]
                 try:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if line:
-                            try:
-                                result = self.parse_command(line, line_num)
-                                if result and not isinstance(result, str):
-                                    print(result)
-                            except PirateException as e:
-                                print(e)
-                            except Exception as e:
-                                print(f"Error on line {line_num}: {e}")
+                    for _ in self.execute_lines(f):
+                        pass
                 finally:
+                    self.current_file = original_file
                     if in_global_scope and original_scope_stack is not None:
                         self.scope_stack = original_scope_stack
         except FileNotFoundError:
-            print(f"No script found at {filename}")
+            self.emit(f"No script found at {filename}")
         except Exception as e:
-            print(f"Arrr! Something went wrong: {e}")
\ No newline at end of file
+            self.emit(f"Arrr! Something went wrong: {e}")
+
+    async def run_script_async(self, filename: str, yield_every: int = DEFAULT_YIELD_EVERY, output=None):
+        return await asyncapi.run_script_async(self, filename, yield_every, output)
+
+    async def run_source_async(self, source: str, yield_every: int = DEFAULT_YIELD_EVERY, output=None):
+        return await asyncapi.run_lines_async(self, source.splitlines(), yield_every, output)
+
+    async def parse_command_async(self, command: str, output=None) -> Any:
+        return await asyncapi.parse_command_async(self, command, output)
@@ -1,7 +1,9 @@
-from typing import Any, List, Optional
+from typing import Any, Iterator, List, Optional
 from .types import PirateType
 from .exceptions import PirateException
-import re
+from .slices import ListSlice
+from .streams import Stream
+from .patterns import PARALLEL_PLUNDER, PLUNDER, REPEAT, WHILE, WHILE_COMPARISON
 from shlex import split
 
 class LoopHandler:
@@ -14,6 +16,10 @@ class LoopHandler:
             if while_match:
                 self.execute_while_loop(*while_match)
                 return True
+            parallel_match = self.parse_parallel_plunder_loop(command)
+            if parallel_match:
+                self.interpreter.parallel_handler.plunder(*parallel_match)
+                return True
             plunder_match = self.parse_plunder_loop(command)
             if plunder_match:
                 self.execute_plunder_loop(*plunder_match)
@@ -30,14 +36,14 @@ class LoopHandler:
             raise PirateException(str(e))
 
     def parse_while_loop(self, command: str) -> Optional[tuple]:
-        basic_match = re.match(r'^while\s+(\w+)\s+be\s+(.+?)\s+(.+)$', command)
+        basic_match = WHILE.match(command)
         if basic_match:
             var_name = basic_match.group(1)
             condition = basic_match.group(2)
             action = basic_match.group(3)
             return (var_name, condition, action, None, None)
 
-        comp_match = re.match(r'^while\s+(\w+)\s+be\s+(less_than|greater_than|equals|greater_or_equal|less_or_equal)\s+(.+?)\s+(.+)$', command)
+        comp_match = WHILE_COMPARISON.match(command)
         if comp_match:
             var_name = comp_match.group(1)
             comparison = comp_match.group(2)
@@ -48,7 +54,7 @@ class LoopHandler:
         return None
 
     def parse_plunder_loop(self, command: str) -> Optional[tuple]:
-        match = re.match(r'^plunder\s+each\s+(\w+)\s+from\s+(\w+)\s+(.+)$', command)
+        match = PLUNDER.match(command)
         if match:
             var_name = match.group(1)
             list_name = match.group(2)
@@ -56,8 +62,14 @@ class LoopHandler:
             return (var_name, list_name, action)
         return None
 
+    def parse_parallel_plunder_loop(self, command: str) -> Optional[tuple]:
+        match = PARALLEL_PLUNDER.match(command)
+        if match:
+            return (match.group(1), match.group(2), match.group(3))
+        return None
+
     def parse_repeat_loop(self, command: str) -> Optional[tuple]:
-        match = re.match(r'^repeat\s+(.+?)\s+times\s+(.+)$', command)
+        match = REPEAT.match(command)
         if match:
             count = match.group(1)
             action = match.group(2)
@@ -65,21 +77,41 @@ class LoopHandler:
         return None
 
     def execute_plunder_loop(self, var_name: str, list_name: str, action: str) -> None:
+        for cmd in self.plunder_steps(var_name, list_name, action):
+            self.interpreter.parse_command(cmd)
+
+    def execute_while_loop(self, var_name: str, condition: str, action: str, comparison: str = None, target: str = None) -> None:
+        for cmd in self.while_steps(var_name, condition, action, comparison, target):
+            self.interpreter.parse_command(cmd)
+
+    def execute_repeat_loop(self, count: str, action: str) -> None:
+        for cmd in self.repeat_steps(count, action):
+            self.interpreter.parse_command(cmd)
+
+    # The loops themselves are generators that yield each command to run, so a
+    # generator voyage can suspend part way through one (see streams.py).
+
+    def plunder_steps(self, var_name: str, list_name: str, action: str) -> Iterator[str]:
         try:
             lst = self.interpreter.resolve_variable(list_name)
-            if not isinstance(lst, PirateType) or not isinstance(lst.value, list):
+            if not isinstance(lst, PirateType) or not isinstance(lst.value, (list, ListSlice, Stream, set)):
                 raise PirateException(f"Blimey! {list_name} ain't a chest of treasure!")
 
+            tracer = self.interpreter.tracer
             self.interpreter.push_scope()
-            for item in lst.value:
+            stats = self.interpreter.stats
+            for iteration, item in enumerate(lst.value):
+                stats.loop_iterations += 1
                 self.interpreter.treasure_chest[var_name] = item if isinstance(item, PirateType) else PirateType(item)
+                if tracer is not None:
+                    tracer.loop('plunder', iteration, item)
                 
                 try:
                     action_parts = split(action)
                     cmd = ' '.join(action_parts)
-                    self.interpreter.parse_command(cmd)
                 except ValueError:
                     raise PirateException("Mismatched quotes in plunder action")
+                yield cmd
             self.interpreter.pop_scope()
             
         except Exception as e:
@@ -87,9 +119,11 @@ class LoopHandler:
                 raise e
             raise PirateException(f"Failed to plunder the booty: {str(e)}")
 
-    def execute_while_loop(self, var_name: str, condition: str, action: str, comparison: str = None, target: str = None) -> None:
+    def while_steps(self, var_name: str, condition: str, action: str, comparison: str = None, target: str = None) -> Iterator[str]:
         MAX_ITERATIONS = 10000
         iterations = 0
+        tracer = self.interpreter.tracer
+        stats = self.interpreter.stats
         
         try:
             while iterations < MAX_ITERATIONS:
@@ -103,7 +137,10 @@ class LoopHandler:
                         break
                 elif str(current_val) != condition:
                     break
-                action_result = self.interpreter.parse_command(action)
+                stats.loop_iterations += 1
+                if tracer is not None:
+                    tracer.loop('while', iterations, current_val)
+                yield action
                 
                 if comparison and isinstance(current_val, (int, float)):
                     updated_value = current_val
@@ -124,7 +161,7 @@ class LoopHandler:
                 raise e
             raise PirateException(f"Lost our bearings: {str(e)}")
 
-    def execute_repeat_loop(self, count: str, action: str) -> None:
+    def repeat_steps(self, count: str, action: str) -> Iterator[str]:
         try:
             if count.isdigit():
                 iterations = int(count)
@@ -137,8 +174,13 @@ class LoopHandler:
             if iterations > 10000:
                 raise PirateException("That's too many times, ye trying to sink us?!")
             
-            for _ in range(iterations):
-                self.interpreter.parse_command(action)
+            tracer = self.interpreter.tracer
+            stats = self.interpreter.stats
+            for iteration in range(iterations):
+                stats.loop_iterations += 1
+                if tracer is not None:
+                    tracer.loop('repeat', iteration)
+                yield action
                 
         except Exception as e:
             if isinstance(e, PirateException):
@@ -0,0 +1,80 @@
+import sys
+from typing import Any, Optional
+
+from .exceptions import PirateException
+
+SIZE_SUFFIXES = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower().rstrip('b')
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+PLAIN = (str, bytes, int, float, bool)
+
+def deep_size(value: Any, seen: set = None, skip: frozenset = frozenset()) -> int:
+    """Bytes held by a value and everything it reaches, leaving out objects whose ids are in skip."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or id(obj) in skip:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, PLAIN) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    return total
+
+class MemoryAccountant:
+    # Near the cap, a recount waits until this fraction of the last weight has
+    # been charged; recounting on every charge there makes filling a list
+    # quadratic. The cap can be overrun by up to that much before it raises.
+    RECOUNT_FRACTION = 8
+
+    def __init__(self, interpreter, limit: Optional[int] = None):
+        self.interpreter = interpreter
+        self.limit = limit
+        self.weighed = 0
+        self.pending = 0
+
+    def crew(self) -> frozenset:
+        """The interpreter and its handlers: values like streams point back at them, but don't own them."""
+        interpreter = self.interpreter
+        return frozenset([id(interpreter)] + [id(part) for part in vars(interpreter).values()
+                                              if getattr(part, 'interpreter', None) is interpreter])
+
+    def size_of(self, value: Any) -> int:
+        if isinstance(value, PLAIN) or value is None:
+            return sys.getsizeof(value)
+        return deep_size(value, skip=self.crew())
+
+    def weigh(self) -> int:
+        seen = set()
+        crew = self.crew()
+        return (deep_size(self.interpreter.scope_stack, seen, crew)
+                + deep_size(self.interpreter.pirate_crew, seen, crew))
+
+    def charge(self, value: Any, overhead: int = 0):
+        # Charges only ever overestimate growth, so a full recount is needed
+        # only once the running estimate has used up the headroom.
+        size = self.size_of(value) + overhead
+        self.pending += size
+        if self.pending <= max(self.limit - self.weighed, self.weighed // self.RECOUNT_FRACTION):
+            return
+        self.weighed = self.weigh()
+        self.pending = size
+        if self.weighed + self.pending > self.limit:
+            raise PirateException(
+                f"Yer chest be too heavy! {self.weighed + self.pending} bytes would sink past the {self.limit} byte limit",
+                kind='memory'
+            )
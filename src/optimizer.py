@@ -0,0 +1,52 @@
+import re
+from typing import List
+
+from .expressions import Const
+from .inference import DIALECT
+from .patterns import CONDITIONAL
+
+# Actions that mean something different as a line of their own than when an
+# if runs them, because a voyage body or try block looks at the raw line.
+STRUCTURAL = re.compile(r'^(return|brace for impact:|if capsized)|^end voyage$')
+
+class Optimizer:
+    """Rewrites a program's lines before they run (-O): ifs with constant conditions become the branch they take."""
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.eliminated = 0
+
+    def optimize(self, lines: List[str]) -> List[str]:
+        if self.interpreter.dialect_manager.active_dialect is not None:
+            return lines
+        if any(DIALECT.match(line.strip()) for line in lines):
+            return lines
+        return [self.statement(line) for line in lines]
+
+    def statement(self, line: str) -> str:
+        command = line.strip()
+        while True:
+            match = CONDITIONAL.match(command)
+            if not match or command.startswith('if capsized') or self.interpreter.easter_eggs.check_for_secrets(command):
+                return command
+            taken = self._condition(match.group(1), match.group(2), match.group(3))
+            if taken is None:
+                return command
+            action = match.group(4) if taken else match.group(5)
+            if action is not None and STRUCTURAL.match(action.strip()):
+                return command
+            self.eliminated += 1
+            if action is None:
+                return ''
+            command = action.strip()
+
+    def _condition(self, left: str, comparison: str, right: str):
+        expressions = self.interpreter.expressions
+        left = expressions.compile(left)
+        right = expressions.compile(right)
+        if not (isinstance(left, Const) and isinstance(right, Const)):
+            return None
+        try:
+            return bool(self.interpreter.pirate_ops[comparison](left.value, right.value))
+        except Exception:
+            return None
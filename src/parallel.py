@@ -0,0 +1,132 @@
+import contextlib
+import io
+import os
+import pickle
+import random
+from shlex import split
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from typing import Any, List, Optional
+
+from .exceptions import PirateException
+from .types import PirateType
+
+_state_tokens = count(1)
+_worker_state = {'token': None, 'interpreter': None}
+
+def _worker_interpreter(token: int, state: bytes):
+    if _worker_state['token'] != token:
+        from .interpreter import PirateInterpreter
+        crew, variables = pickle.loads(state)
+        interpreter = PirateInterpreter()
+        interpreter.pirate_crew = crew
+        interpreter.scope_stack = [variables]
+        _worker_state['token'] = token
+        _worker_state['interpreter'] = interpreter
+    return _worker_state['interpreter']
+
+def _run_chunk(token: int, state: bytes, kind: str, target: str, action: Optional[str],
+               seed: int, chunk: List[tuple]) -> List[tuple]:
+    interpreter = _worker_interpreter(token, state)
+    results = []
+    for index, item in chunk:
+        random.seed(seed + index)
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                if kind == 'plunder':
+                    interpreter.push_scope()
+                    try:
+                        interpreter.treasure_chest[target] = item if isinstance(item, PirateType) else PirateType(item)
+                        interpreter.parse_command(action)
+                    finally:
+                        interpreter.pop_scope()
+                    result = None
+                else:
+                    result = interpreter.pirate_map([item], target)[0]
+            results.append((index, True, output.getvalue(), result))
+        except Exception as e:
+            results.append((index, False, output.getvalue(), str(e)))
+            break
+    return results
+
+class ParallelHandler:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.workers = None
+        self.seed = None
+        self.pool = None
+        self.pool_size = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self.pool is None:
+            self.pool_size = self.workers or os.cpu_count() or 1
+            self.pool = ProcessPoolExecutor(max_workers=self.pool_size)
+        return self.pool
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def _snapshot(self) -> bytes:
+        variables = {}
+        for scope in self.interpreter.scope_stack:
+            variables.update(scope)
+        try:
+            return pickle.dumps((self.interpreter.pirate_crew, variables))
+        except Exception as e:
+            raise PirateException(f"Can't ship the crew to other vessels: {e}")
+
+    def _run(self, kind: str, target: str, action: Optional[str], items: List[Any], label: str) -> List[Any]:
+        if not items:
+            return []
+        pool = self._get_pool()
+        token = next(_state_tokens)
+        state = self._snapshot()
+        seed = self.seed if self.seed is not None else random.getrandbits(32)
+        chunk_size = max(1, len(items) // (self.pool_size * 4))
+        indexed = list(enumerate(items))
+        futures = [
+            pool.submit(_run_chunk, token, state, kind, target, action, seed, indexed[i:i + chunk_size])
+            for i in range(0, len(indexed), chunk_size)
+        ]
+
+        results = []
+        for future in futures:
+            for index, ok, output, value in future.result():
+                for line in output.splitlines():
+                    self.interpreter.emit(line)
+                if not ok:
+                    for pending in futures:
+                        pending.cancel()
+                    raise PirateException(
+                        f"{label} failed on element {index} ({items[index]})",
+                        context=value
+                    )
+                results.append(value)
+        return results
+
+    def plunder(self, var_name: str, list_name: str, action: str) -> None:
+        lst = self.interpreter.resolve_variable(list_name)
+        if not isinstance(lst, PirateType) or not isinstance(lst.value, list):
+            raise PirateException(f"Blimey! {list_name} ain't a chest of treasure!")
+        try:
+            action = ' '.join(split(action))
+        except ValueError:
+            raise PirateException("Mismatched quotes in plunder action")
+        self.interpreter.stats.loop_iterations += len(lst.value)
+        self._run('plunder', var_name, action, lst.value, "Parallel plunder")
+
+    def par_map(self, collection, func_ref) -> List[Any]:
+        if isinstance(collection, PirateType):
+            collection = collection.value
+        if not isinstance(collection, list):
+            raise PirateException("par_map requires a list as the first argument")
+        if isinstance(func_ref, PirateType):
+            func_ref = func_ref.value
+        if not isinstance(func_ref, str):
+            raise PirateException("Function reference must be a string")
+        if func_ref not in self.interpreter.ship_logs and func_ref not in self.interpreter.pirate_crew:
+            raise PirateException(f"Function {func_ref} not found")
+        return self._run('map', func_ref, None, collection, f"par_map with {func_ref}")
@@ -2,13 +2,40 @@ import re
 from typing import Optional, Any
 from .types import PirateType
 from .exceptions import PirateException
+from .scrolls import Scroll
+
+LIST_COMPREHENSION = re.compile(r'^(\w+)\s+be\s+list\s+of\s+(.+?)\s+where\s+each\s+(.+)$')
+FILTER = re.compile(r'^(\w+)\s+be\s+(.+?)\s+where\s+(.+)$')
+REDUCE = re.compile(r'^(\w+)\s+be\s+reduce\s+(.+?)\s+with\s+(.+)$')
+STRING_OPERATION = re.compile(r'^(\w+)\s+be\s+(.+?)\s+(join|split|upper|lower|trim)\s*(.*)$')
+STRING_OPERATIONS = ('join', 'split', 'upper', 'lower', 'trim')
+# Statement forms read by the runtime, First Mate, type inference and the
+# optimizer; keep them here only so every reader parses a line the same way.
+ASSIGNMENT = re.compile(r'^(\w+)\s+be\s+(.+)$')
+VOYAGE_HEADER = re.compile(r'^voyage\s+(\w+)\((.*?)\):$')
+LIST_LITERAL = re.compile(r'^list\s+of\s*\[?(.*?)\]?$')
+SET_LITERAL = re.compile(r'^set\s+of\s*\[?(.*?)\]?$')
+LIST_ITEMS = re.compile(r',(?![^\[]*\])')
+LIST_INDEX = re.compile(r'^(\w+)\[(\d+)\]$')
+FUNCTION_CALLS = re.compile(r'\b(\w+)\s+sails\s+with\b')
+LIST_APPEND = re.compile(r'^add\s+(.+)\s+to\s+(\w+)$')
+CATCH_AS = re.compile(r'^if capsized\s+as\s+(\w+)\s*,\s*(.*)$')
+WHILE = re.compile(r'^while\s+(\w+)\s+be\s+(.+?)\s+(.+)$')
+WHILE_COMPARISON = re.compile(r'^while\s+(\w+)\s+be\s+(less_than|greater_than|equals|greater_or_equal|less_or_equal)\s+(.+?)\s+(.+)$')
+PARALLEL_PLUNDER = re.compile(r'^plunder\s+each\s+(\w+)\s+from\s+(\w+)\s+in\s+parallel\s+(.+)$')
+PLUNDER = re.compile(r'^plunder\s+each\s+(\w+)\s+from\s+(\w+)\s+(.+)$')
+REPEAT = re.compile(r'^repeat\s+(.+?)\s+times\s+(.+)$')
+CONDITIONAL = re.compile(r'^if\s+(.+?)\s+be\s+(less_than|greater_than|equals|greater_or_equal|less_or_equal|in)\s+(.+?)\s*,\s*then\s+(.+?)(?:\s+else\s+(.+))?$')
 
 class PatternHandler:
     def __init__(self, interpreter):
         self.interpreter = interpreter
         
     def handle_pattern(self, command: str) -> Optional[str]:
-        list_comp = re.match(r'^(\w+)\s+be\s+list\s+of\s+(.+?)\s+where\s+each\s+(.+)$', command)
+        # Each form needs its keyword somewhere in the line, and a substring
+        # test is much cheaper than a failed match on a long line.
+        where = 'where' in command
+        list_comp = LIST_COMPREHENSION.match(command) if where else None
         if list_comp:
             return self._handle_list_comprehension(
                 list_comp.group(1), 
@@ -16,7 +43,7 @@ class PatternHandler:
                 list_comp.group(3)
             )
             
-        filter_match = re.match(r'^(\w+)\s+be\s+(.+?)\s+where\s+(.+)$', command)
+        filter_match = FILTER.match(command) if where else None
         if filter_match:
             return self._handle_filter(
                 filter_match.group(1),
@@ -24,7 +51,7 @@ class PatternHandler:
                 filter_match.group(3)
             )
 
-        reduce_match = re.match(r'^(\w+)\s+be\s+reduce\s+(.+?)\s+with\s+(.+)$', command)
+        reduce_match = REDUCE.match(command) if 'reduce' in command else None
         if reduce_match:
             return self._handle_reduce(
                 reduce_match.group(1),
@@ -32,7 +59,9 @@ class PatternHandler:
                 reduce_match.group(3)
             )
 
-        string_op = re.match(r'^(\w+)\s+be\s+(.+?)\s+(join|split|upper|lower|trim)\s*(.*)$', command)
+        string_op = None
+        if any(operation in command for operation in STRING_OPERATIONS):
+            string_op = STRING_OPERATION.match(command)
         if string_op:
             return self._handle_string_operation(
                 string_op.group(1),
@@ -99,6 +128,8 @@ class PatternHandler:
 
     def _handle_string_operation(self, var_name: str, source: str, operation: str, args: str) -> None:
         source_val = self.interpreter.parse_expression(source)
+        if isinstance(source_val.value, Scroll):
+            source_val = PirateType(source_val.value.build(), 'string')
         if not isinstance(source_val.value, (str, list)):
             raise PirateException("String operations require string or list input")
             
@@ -0,0 +1,115 @@
+import time
+from typing import Dict, List, Optional
+
+class ProfileStats:
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.cumulative = 0.0
+        self.self_time = 0.0
+        self.allocations = 0
+
+class Profiler:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.lines: Dict[tuple, ProfileStats] = {}
+        self.voyages: Dict[str, ProfileStats] = {}
+        self.stacks: Dict[str, float] = {}
+        self.frames: List[list] = []
+        self.files: List[Optional[str]] = []
+        self.active: Dict[object, int] = {}
+
+    def __enter__(self):
+        self.interpreter.profiler = self
+        return self
+
+    def __exit__(self, *exc):
+        self.interpreter.profiler = None
+        return False
+
+    def _enter(self, key, stats: ProfileStats, label: str):
+        self.active[key] = self.active.get(key, 0) + 1
+        stats.count += 1
+        self.frames.append([key, stats, label, time.perf_counter(), 0.0, self.interpreter.allocations.count, 0])
+
+    def _exit(self):
+        key, stats, label, start, child_time, start_allocs, child_allocs = self.frames[-1]
+        elapsed = time.perf_counter() - start
+        allocs = self.interpreter.allocations.count - start_allocs
+        stack = ';'.join(frame[2] for frame in self.frames)
+        self.frames.pop()
+        self.active[key] -= 1
+        if not self.active[key]:
+            stats.cumulative += elapsed
+        stats.self_time += elapsed - child_time
+        stats.allocations += allocs - child_allocs
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - child_time
+        if self.frames:
+            self.frames[-1][4] += elapsed
+            self.frames[-1][6] += allocs
+
+    def statement(self, run, command: str, line_number: Optional[int]):
+        stripped = command.strip()
+        if not stripped or stripped.startswith('#'):
+            return run(command, line_number)
+        if line_number is None:
+            # Loop, if and choose actions belong to the line that runs them.
+            if not self.frames or not isinstance(self.frames[-1][0][1], int):
+                return run(command, line_number)
+            key = self.frames[-1][0]
+        else:
+            filename = self.files[-1] if self.files else self.interpreter.current_file
+            key = (filename or '<shell>', line_number)
+        stats = self.lines.get(key)
+        if stats is None:
+            stats = self.lines[key] = ProfileStats(command.strip())
+        self._enter(key, stats, f"{key[0]}:{key[1]}")
+        try:
+            return run(command, line_number)
+        finally:
+            self._exit()
+
+    def voyage(self, function, call, *args):
+        stats = self.voyages.get(function.name)
+        if stats is None:
+            stats = self.voyages[function.name] = ProfileStats(function.name)
+        self.files.append(function.source_file)
+        self._enter(('voyage', function.name), stats, f"voyage {function.name}")
+        try:
+            return call(*args)
+        finally:
+            self._exit()
+            self.files.pop()
+
+    def report(self, limit: int = 20) -> str:
+        lines = [
+            "🏴‍☠️ Hot spots by self time",
+            f"{'count':>8} {'self s':>10} {'cum s':>10} {'allocs':>8}  location",
+        ]
+        ranked = sorted(self.lines.items(), key=lambda item: item[1].self_time, reverse=True)
+        for (filename, line_number), stats in ranked[:limit]:
+            lines.append(
+                f"{stats.count:>8} {stats.self_time:>10.6f} {stats.cumulative:>10.6f} {stats.allocations:>8}"
+                f"  {filename}:{line_number}  {stats.label}"
+            )
+        if self.voyages:
+            lines.append("")
+            lines.append("⚓ Voyages by cumulative time")
+            lines.append(f"{'calls':>8} {'self s':>10} {'cum s':>10} {'allocs':>8}  voyage")
+            ranked = sorted(self.voyages.values(), key=lambda stats: stats.cumulative, reverse=True)
+            for stats in ranked[:limit]:
+                lines.append(
+                    f"{stats.count:>8} {stats.self_time:>10.6f} {stats.cumulative:>10.6f} {stats.allocations:>8}"
+                    f"  {stats.label}"
+                )
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        return "\n".join(
+            f"{stack} {round(seconds * 1_000_000)}"
+            for stack, seconds in sorted(self.stacks.items())
+        ) + "\n"
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
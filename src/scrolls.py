@@ -0,0 +1,45 @@
+from typing import Any, List
+
+from .types import PirateType
+
+class Scroll:
+    """Text written a piece at a time; the pieces are only joined once the whole text is needed."""
+
+    def __init__(self, text: str = ''):
+        self.pieces: List[str] = [text] if text else []
+        self.length = len(text)
+
+    def append(self, value: Any):
+        if isinstance(value, PirateType):
+            value = value.value
+        if isinstance(value, Scroll):
+            self.pieces.extend(list(value.pieces))
+            self.length += value.length
+            return
+        text = value if isinstance(value, str) else str(value)
+        if text:
+            self.pieces.append(text)
+            self.length += len(text)
+
+    def build(self) -> str:
+        pieces = self.pieces
+        if len(pieces) > 1:
+            # Keep the joined text, so building twice costs nothing extra.
+            pieces[:] = [''.join(pieces)]
+        return pieces[0] if pieces else ''
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return self.build()
+
+    def __repr__(self):
+        return repr(self.build())
+
+    def __eq__(self, other):
+        if isinstance(other, Scroll):
+            other = other.build()
+        return self.build() == other
+
+    __hash__ = None
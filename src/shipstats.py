@@ -0,0 +1,49 @@
+from typing import Dict
+
+COUNTERS = ('statements', 'voyage_calls', 'loop_iterations', 'scope_pushes', 'exceptions', 'imports')
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 6) if total else 0.0
+
+class ShipStats:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.reset()
+
+    def reset(self):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.allocation_base = self.interpreter.allocations.count
+        for dialect in self.interpreter.dialect_manager.dialects.values():
+            dialect.hits = dialect.misses = 0
+        self.interpreter.switch_handler.hits = self.interpreter.switch_handler.misses = 0
+        expressions = self.interpreter.expressions
+        expressions.hits = expressions.misses = 0
+        expressions.specializations = expressions.deoptimizations = 0
+        expressions.inlined = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        stats = {name: getattr(self, name) for name in COUNTERS}
+        stats['allocations'] = self.interpreter.allocations.count - self.allocation_base
+
+        dialects = self.interpreter.dialect_manager.dialects.values()
+        hits = sum(dialect.hits for dialect in dialects)
+        misses = sum(dialect.misses for dialect in dialects)
+        stats['dialect_cache_hits'] = hits
+        stats['dialect_cache_misses'] = misses
+        stats['dialect_cache_hit_rate'] = _hit_rate(hits, misses)
+
+        switch_handler = self.interpreter.switch_handler
+        stats['switch_cache_hits'] = switch_handler.hits
+        stats['switch_cache_misses'] = switch_handler.misses
+        stats['switch_cache_hit_rate'] = _hit_rate(switch_handler.hits, switch_handler.misses)
+
+        expressions = self.interpreter.expressions
+        stats['expression_cache_hits'] = expressions.hits
+        stats['expression_cache_misses'] = expressions.misses
+        stats['expression_cache_hit_rate'] = _hit_rate(expressions.hits, expressions.misses)
+        stats['specializations'] = expressions.specializations
+        stats['deoptimizations'] = expressions.deoptimizations
+        stats['inlined_sites'] = expressions.inlined
+        return stats
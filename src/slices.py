@@ -0,0 +1,191 @@
+import re
+from collections.abc import Sequence
+from typing import Any, Iterator, Optional, Tuple
+
+from .exceptions import PirateException
+from .expressions import LIST_SLICE
+from .patterns import LIST_ITEMS, LIST_LITERAL
+from .streams import Stream
+from .types import PirateType
+
+BOUND = r'(-?\w*)'
+SLICE_ASSIGNMENT = re.compile(rf'^(\w+)\[{BOUND}:{BOUND}\]\s+be\s+(.+)$')
+LIST_EXTEND = re.compile(r'^add\s+all\s+(.+)\s+to\s+(\w+)(?:\s+at\s+(.+))?$')
+LIST_INSERT = re.compile(r'^add\s+(.+)\s+to\s+(\w+)\s+at\s+(.+)$')
+REMOVE_RANGE = re.compile(rf'^remove\s+(\w+)\[{BOUND}:{BOUND}\]$')
+FILL = re.compile(rf'^fill\s+(\w+)(?:\[{BOUND}:{BOUND}\])?\s+with\s+(.+)$')
+WHOLE_NUMBER = re.compile(r'^-?\d+$')
+
+class ListSlice(Sequence):
+    """A window onto part of a list; reading or writing through it goes straight to the list underneath."""
+
+    def __init__(self, items: list, start: int, stop: int):
+        self.items = items
+        self.start = start
+        self.stop = stop
+
+    @classmethod
+    def of(cls, value, start: Optional[int], stop: Optional[int]) -> 'ListSlice':
+        items, start, stop = window(value, start, stop)
+        return cls(items, start, stop)
+
+    def __len__(self):
+        return max(0, min(self.stop, len(self.items)) - self.start)
+
+    def __iter__(self) -> Iterator[Any]:
+        items = self.items
+        return map(items.__getitem__, range(self.start, min(self.stop, len(items))))
+
+    def _index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return self.start + index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ListSlice.of(self, index.start, index.stop)
+        return self.items[self._index(index)]
+
+    def __setitem__(self, index, value):
+        self.items[self._index(index)] = value
+
+    def insert(self, index: int, value):
+        """Puts value into the list underneath, widening the window so it stays in view."""
+        length = len(self)
+        if index < 0:
+            index += length
+        index = max(0, min(index, length))
+        self.items.insert(self.start + index, value)
+        self.stop = self.start + length + 1
+
+    def append(self, value):
+        self.insert(len(self), value)
+
+    def to_list(self) -> list:
+        return self.items[self.start:self.stop]
+
+    def __repr__(self):
+        return repr(self.to_list())
+
+    def __eq__(self, other):
+        if isinstance(other, ListSlice):
+            other = other.to_list()
+        return self.to_list() == other
+
+    __hash__ = None
+
+def window(value, start: Optional[int], stop: Optional[int]) -> Tuple[list, int, int]:
+    """The list under a list or slice, and where start:stop falls in it."""
+    if isinstance(value, ListSlice):
+        items, offset, length = value.items, value.start, len(value)
+    else:
+        items, offset, length = value, 0, len(value)
+    start, stop, _ = slice(start, stop).indices(length)
+    return items, offset + start, offset + max(start, stop)
+
+class SliceHandler:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def view(self, list_name: str, start: str, stop: str) -> PirateType:
+        lst = self._resolve_list(list_name)
+        return PirateType(ListSlice.of(lst, self._bound(start), self._bound(stop)), 'list')
+
+    def handle_list_command(self, command: str, kind: Optional[str]) -> Optional[bool]:
+        """Runs the bulk list statements; None if the line isn't one of them."""
+        if kind == 'add':
+            extend = LIST_EXTEND.match(command) if command.startswith('add all ') else None
+            if extend:
+                self._splice(extend.group(2), extend.group(3), extend.group(1))
+                return True
+            insert = LIST_INSERT.match(command) if ' at ' in command else None
+            if insert:
+                items = self._resolve_list(insert.group(2), whole=True)
+                value = self._value(insert.group(1))
+                if self.interpreter.memory.limit is not None:
+                    self.interpreter.memory.charge(value, 8)
+                items.insert(self._position(insert.group(3)), value)
+                return True
+            return None
+        if kind == 'remove':
+            remove = REMOVE_RANGE.match(command)
+            if remove:
+                items, start, stop = self._window(remove.group(1), remove.group(2), remove.group(3))
+                del items[start:stop]
+                return True
+            return None
+        if kind == 'fill':
+            fill = FILL.match(command)
+            if fill:
+                items, start, stop = self._window(fill.group(1), fill.group(2), fill.group(3))
+                value = self._value(fill.group(4))
+                items[start:stop] = [value] * (stop - start)
+                return True
+            return None
+        assignment = SLICE_ASSIGNMENT.match(command)
+        if assignment:
+            items, start, stop = self._window(assignment.group(1), assignment.group(2), assignment.group(3))
+            items[start:stop] = self._values(assignment.group(4))
+            return True
+        return None
+
+    def _splice(self, list_name: str, position: Optional[str], source: str):
+        target = self.interpreter.resolve_variable(list_name)
+        if isinstance(target, PirateType) and isinstance(target.value, set) and position is None:
+            values = self._values(source)
+            target.value.update(values if isinstance(values, set) else self.interpreter._chest(values))
+            return
+        items = self._resolve_list(list_name, whole=True)
+        values = self._values(source)
+        if position is None:
+            items.extend(values)
+        else:
+            index = self._position(position)
+            items[index:index] = values
+
+    def _resolve_list(self, list_name: str, whole: bool = False):
+        lst = self.interpreter.resolve_variable(list_name)
+        value = lst.value if isinstance(lst, PirateType) else lst
+        if isinstance(value, list) or (isinstance(value, ListSlice) and not whole):
+            return value
+        raise PirateException(f"{list_name} is not a list")
+
+    def _window(self, list_name: str, start: Optional[str], stop: Optional[str]) -> Tuple[list, int, int]:
+        return window(self._resolve_list(list_name), self._bound(start), self._bound(stop))
+
+    def _bound(self, text: Optional[str]) -> Optional[int]:
+        if not text:
+            return None
+        if WHOLE_NUMBER.match(text):
+            return int(text)
+        value = self._value(text)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise PirateException(f"Slice bounds must be whole numbers, not {text}")
+        return value
+
+    def _position(self, text: str) -> int:
+        return self._bound(text.strip())
+
+    def _value(self, expr: str) -> Any:
+        value = self.interpreter.parse_expression(expr)
+        return value.value if isinstance(value, PirateType) else value
+
+    def _values(self, expr: str):
+        literal = LIST_LITERAL.match(expr)
+        if literal:
+            items = literal.group(1)
+            values = [self._value(item.strip()) for item in LIST_ITEMS.split(items)] if items.strip() else []
+        else:
+            values = self._value(expr)
+        if isinstance(values, ListSlice):
+            values = values.to_list()
+        elif isinstance(values, Stream):
+            values = list(values)
+        elif not isinstance(values, (list, set)):
+            raise PirateException(f"Ye can only splice in a list, not {expr}")
+        if self.interpreter.memory.limit is not None:
+            self.interpreter.memory.charge(values)
+        return values
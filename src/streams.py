@@ -0,0 +1,125 @@
+import re
+from typing import Any, Iterator, Optional
+
+from .exceptions import PirateException
+from .patterns import CONDITIONAL, PARALLEL_PLUNDER, PLUNDER, REPEAT, WHILE
+from .types import PirateType
+
+YIELD = re.compile(r'^yield\s+(.+)$')
+
+def yields(command: str) -> bool:
+    """Whether running this line can reach a yield: directly, or as the action of a loop or if."""
+    command = command.strip()
+    if YIELD.match(command):
+        return True
+    match = WHILE.match(command)
+    if match:
+        return yields(match.group(3))
+    if PARALLEL_PLUNDER.match(command):
+        return False
+    match = PLUNDER.match(command)
+    if match:
+        return yields(match.group(3))
+    match = REPEAT.match(command)
+    if match:
+        return yields(match.group(2))
+    match = CONDITIONAL.match(command)
+    if match:
+        return yields(match.group(4)) or (match.group(5) is not None and yields(match.group(5)))
+    return False
+
+class Stream:
+    """A suspended generator voyage; each item pulled from it runs the body up to its next yield.
+
+    Between items the voyage's frame, and any loop scopes it has open, come off
+    the scope stack and wait here until the next pull puts them back.
+    """
+
+    def __init__(self, interpreter, function, frame: dict):
+        self.interpreter = interpreter
+        self.function = function
+        self.suspended = [frame]
+        self.steps = self._body()
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        stack = self.interpreter.scope_stack
+        base = len(stack)
+        stack.extend(self.suspended)
+        try:
+            value = next(self.steps)
+        except BaseException:
+            self.suspended = []
+            del stack[base:]
+            raise
+        self.suspended = stack[base:]
+        del stack[base:]
+        return value
+
+    def __repr__(self):
+        return f"<stream from {self.function.name}>"
+
+    def _body(self) -> Iterator[Any]:
+        function = self.function
+        try:
+            for line, line_number in zip(function.body, function.line_numbers):
+                line = line.strip()
+                if line.startswith('return'):
+                    return
+                yield from self._statement(line, line_number)
+        except PirateException as e:
+            e.add_voyage(function.name)
+            raise
+        except Exception as e:
+            raise PirateException(
+                f"Mutiny in function {function.name}!",
+                context=str(e),
+                kind='internal'
+            )
+
+    def _statement(self, command: str, line_number: Optional[int] = None) -> Iterator[Any]:
+        interpreter = self.interpreter
+        # Anything a handler would take over before the loop or if runs
+        # (try blocks, voyage definitions, dialects, easter eggs) goes the usual way.
+        if (not yields(command) or interpreter.try_catch_handler.in_try_block
+                or hasattr(interpreter, 'current_function')
+                or interpreter.dialect_manager.active_dialect is not None
+                or interpreter.easter_eggs.check_for_secrets(command)):
+            interpreter.parse_command(command, line_number)
+            return
+        interpreter.stats.statements += 1
+        if interpreter.tracer is not None:
+            interpreter.tracer.statement(command, line_number)
+
+        match = YIELD.match(command)
+        if match:
+            value = interpreter.parse_expression(match.group(1))
+            yield value.value if isinstance(value, PirateType) else value
+            return
+        loops = interpreter.loop_handler
+        parsed = loops.parse_while_loop(command)
+        if parsed:
+            for action in loops.while_steps(*parsed):
+                yield from self._statement(action)
+            return
+        parsed = loops.parse_plunder_loop(command)
+        if parsed:
+            for action in loops.plunder_steps(*parsed):
+                yield from self._statement(action)
+            return
+        parsed = loops.parse_repeat_loop(command)
+        if parsed:
+            for action in loops.repeat_steps(*parsed):
+                yield from self._statement(action)
+            return
+        match = CONDITIONAL.match(command)
+        left = interpreter.parse_expression(match.group(1))
+        right = interpreter.parse_expression(match.group(3))
+        left_val = left.value if isinstance(left, PirateType) else left
+        right_val = right.value if isinstance(right, PirateType) else right
+        if interpreter.pirate_ops[match.group(2)](left_val, right_val):
+            yield from self._statement(match.group(4))
+        elif match.group(5):
+            yield from self._statement(match.group(5))
@@ -1,32 +1,118 @@
-from typing import List, Any, Dict
+import re
+from typing import List, Any, Dict, Optional
 from .exceptions import PirateException
+from .expressions import NOT_PLAIN
+from .patterns import ASSIGNMENT
 from .types import PirateType
 
+NON_CONSTANT = re.compile(r'\s(equals|greater_than|less_than|modulo|times|divided_by|power|plus|minus)\s|\bsails\s+with\b')
+
+class SwitchAction:
+    """A case's action, parsed once when its table is built.
+
+    Plain assignments keep their target and value text and run straight
+    from there; every other action goes back through parse_command.
+    """
+
+    def __init__(self, command: str, interpreter):
+        self.command = command
+        self.target = self.value = None
+        assignment = ASSIGNMENT.match(command)
+        if (assignment and not NOT_PLAIN.search(command)
+                and not interpreter.easter_eggs.check_for_secrets(command)):
+            self.target, self.value = assignment.group(1), assignment.group(2)
+
+    def run(self, interpreter):
+        if (self.target is None or interpreter.profiler is not None
+                or interpreter.try_catch_handler.in_try_block
+                or hasattr(interpreter, 'current_function')
+                or interpreter.dialect_manager.active_dialect is not None):
+            interpreter.parse_command(self.command)
+            return
+        interpreter.stats.statements += 1
+        if interpreter.tracer is not None:
+            interpreter.tracer.statement(self.command, None)
+        node = interpreter.expressions.lookup_assignment(self.value)
+        if node is None:
+            value = interpreter.parse_expression(self.value)
+        elif interpreter.type_facts is not None and self.target in interpreter.type_facts.numeric:
+            value = node.evaluate(interpreter)
+        else:
+            value = node.boxed(interpreter)
+        interpreter.treasure_chest[self.target] = value
+
+class SwitchTable:
+    def __init__(self, value_expr: str):
+        self.value_expr = value_expr
+        self.constants: Dict[Any, int] = {}
+        self.dynamic: List[tuple] = []
+        self.actions: List[SwitchAction] = []
+        self.default: Optional[SwitchAction] = None
+
+    def add_case(self, index: int, case_expr: str, action: str, interpreter):
+        self.actions.append(SwitchAction(action, interpreter))
+        if self._is_constant(case_expr):
+            value = interpreter.parse_expression(case_expr)
+            if isinstance(value, PirateType):
+                value = value.value
+            try:
+                self.constants.setdefault(value, index)
+                return
+            except TypeError:
+                pass
+        self.dynamic.append((index, case_expr))
+
+    @staticmethod
+    def _is_constant(expr: str) -> bool:
+        if NON_CONSTANT.search(expr):
+            return False
+        if expr.startswith('"') and expr.endswith('"') and len(expr) > 1:
+            return True
+        return expr.replace('.', '', 1).isdigit() or expr.lower() in ['true', 'false']
+
+    def select(self, switch_value, interpreter) -> Optional[SwitchAction]:
+        try:
+            match = self.constants.get(switch_value)
+        except TypeError:
+            match = None
+        for index, case_expr in self.dynamic:
+            if match is not None and index > match:
+                break
+            try:
+                case_value = interpreter.parse_expression(case_expr)
+            except Exception as e:
+                raise PirateException(f"Invalid case value: {str(e)}")
+            if isinstance(case_value, PirateType):
+                case_value = case_value.value
+            if case_value == switch_value:
+                match = index
+                break
+        if match is not None:
+            return self.actions[match]
+        return self.default
+
 class SwitchCaseHandler:
+    CACHE_SIZE = 4096
+
     def __init__(self, interpreter):
         self.interpreter = interpreter
+        self.tables: Dict[tuple, SwitchTable] = {}
+        self.hits = 0
+        self.misses = 0
         
     def handle_switch(self, command: str) -> bool:
         if command.startswith('choose '):
             self._process_switch_block(command)
             return True
         return False
-    def _process_switch_block(self, command: str):
-        value_expr = command[7:].strip().rstrip(':')
-        try:
-            switch_value = self.interpreter.parse_expression(value_expr)
-            if isinstance(switch_value, PirateType):
-                switch_value = switch_value.value
 
-            self.interpreter.current_switch = {
-                'value': switch_value,
-                'cases': [],
-                'default': None,
-                'in_progress': True
-            }
-            
-        except Exception as e:
-            raise PirateException(f"Invalid switch value: {str(e)}")
+    def _process_switch_block(self, command: str):
+        self.interpreter.current_switch = {
+            'value': command[7:].strip().rstrip(':'),
+            'cases': [],
+            'default': None,
+            'in_progress': True
+        }
     
     def handle_case(self, command: str) -> bool:
         if not command.startswith('case '):
@@ -38,23 +124,9 @@ class SwitchCaseHandler:
         parts = command[5:].split(':', 1)
         if len(parts) != 2:
             raise PirateException("Invalid case syntax")
-            
-        case_expr = parts[0].strip()
-        action = parts[1].strip()
-        
-        try:
-            case_value = self.interpreter.parse_expression(case_expr)
-            if isinstance(case_value, PirateType):
-                case_value = case_value.value
-                
-            self.interpreter.current_switch['cases'].append({
-                'value': case_value,
-                'action': action
-            })
-            return True
-            
-        except Exception as e:
-            raise PirateException(f"Invalid case value: {str(e)}")
+
+        self.interpreter.current_switch['cases'].append((parts[0].strip(), parts[1].strip()))
+        return True
     
     def handle_default(self, command: str) -> bool:
         if not command.startswith('default:'):
@@ -66,6 +138,28 @@ class SwitchCaseHandler:
         action = command[8:].strip()
         self.interpreter.current_switch['default'] = action
         return True
+
+    def compile_switch(self, switch_data: dict) -> SwitchTable:
+        key = (switch_data['value'], tuple(switch_data['cases']), switch_data['default'])
+        table = self.tables.get(key)
+        if table is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            table = SwitchTable(switch_data['value'])
+            for index, (case_expr, action) in enumerate(switch_data['cases']):
+                try:
+                    table.add_case(index, case_expr, action, self.interpreter)
+                except PirateException:
+                    raise
+                except Exception as e:
+                    raise PirateException(f"Invalid case value: {str(e)}")
+            if switch_data['default'] is not None:
+                table.default = SwitchAction(switch_data['default'], self.interpreter)
+            if len(self.tables) >= self.CACHE_SIZE:
+                del self.tables[next(iter(self.tables))]
+            self.tables[key] = table
+        return table
     
     def handle_end_switch(self, command: str) -> bool:
         if command != 'end choose':
@@ -75,16 +169,16 @@ class SwitchCaseHandler:
             raise PirateException("end choose without matching choose")
             
         switch_data = self.interpreter.current_switch
-        switch_value = switch_data['value']
-        for case in switch_data['cases']:
-            if case['value'] == switch_value:
-                result = self.interpreter.parse_command(case['action'])
-                delattr(self.interpreter, 'current_switch')
-                return True
-        if switch_data['default'] is not None:
-            result = self.interpreter.parse_command(switch_data['default'])
-            delattr(self.interpreter, 'current_switch')
-            return True
-            
         delattr(self.interpreter, 'current_switch')
-        return True
\ No newline at end of file
+        table = self.compile_switch(switch_data)
+        try:
+            switch_value = self.interpreter.parse_expression(table.value_expr)
+            if isinstance(switch_value, PirateType):
+                switch_value = switch_value.value
+        except Exception as e:
+            raise PirateException(f"Invalid switch value: {str(e)}")
+
+        action = table.select(switch_value, self.interpreter)
+        if action is not None:
+            action.run(self.interpreter)
+        return True
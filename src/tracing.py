@@ -0,0 +1,69 @@
+from typing import Any, Callable, Iterable, List, Optional
+
+TRACE_EVENTS = ('statement', 'call', 'return', 'loop', 'exception')
+
+class TraceEvent:
+    __slots__ = ('kind', 'line', 'file', 'depth', 'voyage', 'detail', 'value')
+
+    def __init__(self, kind: str, line: Optional[int], file: Optional[str], depth: int,
+                 voyage: Optional[str], detail: str, value: Any = None):
+        self.kind = kind
+        self.line = line
+        self.file = file
+        self.depth = depth
+        self.voyage = voyage
+        self.detail = detail
+        self.value = value
+
+    def __repr__(self):
+        location = f"{self.file or '<shell>'}:{self.line}" if self.line is not None else (self.file or '<shell>')
+        return f"<TraceEvent {self.kind} {location} voyage={self.voyage} {self.detail!r}>"
+
+class Tracer:
+    def __init__(self, interpreter, hook: Callable[[TraceEvent], Any], every: int = 1,
+                 events: Iterable[str] = None):
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        events = set(events or TRACE_EVENTS)
+        unknown = events - set(TRACE_EVENTS)
+        if unknown:
+            raise ValueError(f"Unknown trace events: {', '.join(sorted(unknown))}")
+        self.interpreter = interpreter
+        self.hook = hook
+        self.every = every
+        self.events = events
+        self.countdown = every
+        self.voyages: List[tuple] = []
+
+    def _fire(self, kind: str, line: Optional[int], detail: str, value: Any = None):
+        if kind not in self.events:
+            return
+        self.countdown -= 1
+        if self.countdown:
+            return
+        self.countdown = self.every
+        if self.voyages:
+            voyage, file = self.voyages[-1]
+        else:
+            voyage, file = None, self.interpreter.current_file
+        self.hook(TraceEvent(kind, line, file, len(self.interpreter.scope_stack), voyage, detail, value))
+
+    def statement(self, command: str, line_number: Optional[int]):
+        self._fire('statement', line_number, command)
+
+    def call(self, function, args: List[Any]):
+        self.voyages.append((function.name, function.source_file))
+        self._fire('call', None, function.name, args)
+
+    def ret(self, function, result: Any):
+        self._fire('return', None, function.name, result)
+        self.voyages.pop()
+
+    def unwind(self):
+        self.voyages.pop()
+
+    def loop(self, kind: str, iteration: int, value: Any = None):
+        self._fire('loop', None, kind, (iteration, value))
+
+    def exception(self, error: Exception, line_number: Optional[int]):
+        self._fire('exception', line_number, str(getattr(error, 'message', error)), error)
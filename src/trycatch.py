@@ -1,5 +1,8 @@
 from typing import List, Any
 from .exceptions import PirateException
+from .types import PirateType
+from .patterns import CATCH_AS
+
 
 class TryCatchHandler:
     def __init__(self, interpreter):
@@ -7,6 +10,7 @@ class TryCatchHandler:
         self.in_try_block = False
         self.current_try_commands: List[str] = []
         self.error_handler: str = None
+        self.error_name: str = None
         
     def handle_try_start(self, command: str) -> bool:
         if command.strip() == "brace for impact:":
@@ -19,7 +23,12 @@ class TryCatchHandler:
         if command.startswith("if capsized"):
             if not self.in_try_block:
                 raise PirateException("Found 'if capsized' without 'brace for impact'")
-            self.error_handler = command[len("if capsized,"):].strip()
+            catch_as = CATCH_AS.match(command)
+            if catch_as:
+                self.error_name = catch_as.group(1)
+                self.error_handler = catch_as.group(2).strip()
+            else:
+                self.error_handler = command[len("if capsized,"):].strip()
             self.execute_try_block()
             return True
         return False
@@ -36,8 +45,13 @@ class TryCatchHandler:
             for cmd in self.current_try_commands:
                 self.interpreter.parse_command(cmd)
         except Exception as e:
+            if self.error_name:
+                if not isinstance(e, PirateException):
+                    e = PirateException(str(e), kind='internal')
+                self.interpreter.treasure_chest[self.error_name] = PirateType(e, 'error')
             if self.error_handler:
                 self.interpreter.parse_command(self.error_handler)
         finally:
             self.current_try_commands = []
-            self.error_handler = None
\ No newline at end of file
+            self.error_handler = None
+            self.error_name = None
\ No newline at end of file
@@ -1,5 +1,21 @@
+import operator
+from contextvars import ContextVar
+
+from .exceptions import PirateException
+
+class AllocationCounter:
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+# The counter of the interpreter running in this thread or asyncio task, so
+# interpreters running side by side each count only their own values.
+ALLOCATIONS = ContextVar('allocations', default=AllocationCounter())
+
 class PirateType:
     def __init__(self, value: any, type_name: str = None):
+        ALLOCATIONS.get().count += 1
         self.value = value
         if isinstance(value, dict):
             self.type_name = 'dict'
@@ -32,14 +48,14 @@ class PirateType:
             other = other.value
         return PirateType(op(self.value, other))
 
-    def __add__(self, other): return self.perform_op(other, lambda x, y: x + y)
-    def __sub__(self, other): return self.perform_op(other, lambda x, y: x - y)
-    def __mul__(self, other): return self.perform_op(other, lambda x, y: x * y)
-    def __truediv__(self, other): return self.perform_op(other, lambda x, y: x / y)
-    def __mod__(self, other): return self.perform_op(other, lambda x, y: x % y)
-    def __pow__(self, other): return self.perform_op(other, lambda x, y: x ** y)
-
-    def __gt__(self, other): return self.perform_op(other, lambda x, y: x > y)
-    def __lt__(self, other): return self.perform_op(other, lambda x, y: x < y)
-    def __ge__(self, other): return self.perform_op(other, lambda x, y: x >= y)
-    def __le__(self, other): return self.perform_op(other, lambda x, y: x <= y)
\ No newline at end of file
+    def __add__(self, other): return self.perform_op(other, operator.add)
+    def __sub__(self, other): return self.perform_op(other, operator.sub)
+    def __mul__(self, other): return self.perform_op(other, operator.mul)
+    def __truediv__(self, other): return self.perform_op(other, operator.truediv)
+    def __mod__(self, other): return self.perform_op(other, operator.mod)
+    def __pow__(self, other): return self.perform_op(other, operator.pow)
+
+    def __gt__(self, other): return self.perform_op(other, operator.gt)
+    def __lt__(self, other): return self.perform_op(other, operator.lt)
+    def __ge__(self, other): return self.perform_op(other, operator.ge)
+    def __le__(self, other): return self.perform_op(other, operator.le)
\ No newline at end of file
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from src.interpreter import PirateInterpreter
+
+
+def test_scripts_take_turns_on_one_event_loop():
+    log = []
+
+    async def both():
+        first, second = PirateInterpreter(), PirateInterpreter()
+        await asyncio.gather(
+            first.run_source_async('bark "a"\nbark "a"\nbark "a"', yield_every=1, output=log.append),
+            second.run_source_async('bark "b"\nbark "b"\nbark "b"', yield_every=1, output=log.append),
+        )
+
+    asyncio.run(both())
+    assert log == ["a", "b", "a", "b", "a", "b"]
+
+
+def test_async_output_sinks_are_awaited_in_order():
+    log = []
+
+    async def sink(message):
+        await asyncio.sleep(0)
+        log.append(message)
+
+    async def voyage():
+        interpreter = PirateInterpreter()
+        await interpreter.run_source_async('bark "one"\nbark "two"', output=sink)
+        assert interpreter.output_sink is None
+        assert interpreter.async_mode is False
+
+    asyncio.run(voyage())
+    assert log == ["one", "two"]
+
+
+def test_sleep_drops_anchor_without_blocking_the_loop():
+    ticks = []
+
+    async def ticker():
+        for _ in range(3):
+            ticks.append('tick')
+            await asyncio.sleep(0.01)
+
+    async def both():
+        interpreter = PirateInterpreter()
+        await asyncio.gather(interpreter.run_source_async('sleep sails with 0.05\nbark "awake"',
+                                                          output=ticks.append),
+                             ticker())
+
+    asyncio.run(both())
+    assert ticks == ['tick', 'tick', 'tick', 'awake']
+
+
+def test_parse_command_async_returns_the_result():
+    async def voyage():
+        interpreter = PirateInterpreter()
+        await interpreter.parse_command_async('x be 16')
+        return await interpreter.parse_command_async('sqrt sails with x')
+
+    assert asyncio.run(voyage()).value == 4.0
+
+
+def test_yield_every_must_be_positive():
+    with pytest.raises(ValueError):
+        asyncio.run(PirateInterpreter().run_source_async('bark 1', yield_every=0))
@@ -0,0 +1,54 @@
+import json
+
+from src.batch import collect_scripts, main, run_batch, run_job, summarize
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def test_run_job_reports_status_output_and_errors(tmp_path):
+    ok = run_job(write(tmp_path / 'ok.maroon', 'bark "ahoy"\n'))
+    assert ok['status'] == 'ok'
+    assert ok['stdout'] == "ahoy\n"
+    assert ok['errors'] == []
+    assert ok['stats']['statements'] == 1
+
+    failed = run_job(write(tmp_path / 'bad.maroon', 'x be y plus 1\nbark "still sailing"\n'))
+    assert failed['status'] == 'error'
+    assert failed['stdout'].endswith("still sailing\n")
+    assert len(failed['errors']) == 1
+
+    missing = run_job(str(tmp_path / 'nowhere.maroon'))
+    assert missing['status'] == 'crashed'
+    assert missing['errors'] == [f"FileNotFoundError: {tmp_path / 'nowhere.maroon'}"]
+
+
+def test_collect_scripts_walks_directories_once(tmp_path):
+    first = write(tmp_path / 'fleet' / 'a.maroon', 'bark 1\n')
+    second = write(tmp_path / 'fleet' / 'deck' / 'b.maroon', 'bark 2\n')
+    write(tmp_path / 'fleet' / 'notes.txt', 'not a script')
+    assert collect_scripts([str(tmp_path / 'fleet'), first]) == [first, second]
+
+
+def test_run_batch_keeps_script_order_across_the_pool(tmp_path):
+    scripts = [write(tmp_path / f'{n}.maroon', f'bark {n}\n') for n in range(4)]
+    results = run_batch(scripts, jobs=2)
+    assert [result['script'] for result in results] == scripts
+    assert [result['stdout'] for result in results] == [f"{n}\n" for n in range(4)]
+    summary = summarize(results, 1.0)
+    assert (summary['scripts'], summary['ok'], summary['error'], summary['crashed']) == (4, 4, 0, 0)
+
+
+def test_batch_cli_writes_jsonl_and_fails_on_errors(tmp_path):
+    write(tmp_path / 'fleet' / 'ok.maroon', 'bark "ahoy"\n')
+    write(tmp_path / 'fleet' / 'bad.maroon', 'x be y plus 1\n')
+    report = tmp_path / 'report.jsonl'
+    status = main([str(tmp_path / 'fleet'), '-j', '2', '-f', 'jsonl', '-o', str(report)])
+    records = [json.loads(line) for line in report.read_text().splitlines()]
+    assert status == 1
+    assert [record['status'] for record in records[:-1]] == ['error', 'ok']
+    assert records[-1]['summary'] is True
+    assert (records[-1]['ok'], records[-1]['error']) == (1, 1)
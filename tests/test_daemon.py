@@ -0,0 +1,55 @@
+from src.daemon import ScriptCache
+from src.interpreter import PirateInterpreter
+
+
+def run(lines, review=None):
+    interpreter = PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(lines, review=review):
+        pass
+    return output
+
+
+def test_script_cache_reviews_a_script_once(tmp_path):
+    path = tmp_path / 'voyage.maroon'
+    path.write_text("revive first mate\nsay ahoy\nx be 5\ny be x plus z\nfire_cannons sails with x\n")
+    cache = ScriptCache()
+    first = cache.load(str(path))
+    second = cache.load(str(path))
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first.review
+    assert run(first.lines, review=first.review) == run(path.read_text().splitlines(True))
+
+
+def test_script_cache_reviews_each_script_afresh(tmp_path):
+    declares = tmp_path / 'declares.maroon'
+    declares.write_text("revive first mate\nvoyage fire_cannons(x)\n  return x\nend voyage\n")
+    uses = tmp_path / 'uses.maroon'
+    uses.write_text("revive first mate\ny be fire_cannons sails with 1\n")
+    cache = ScriptCache()
+    cache.load(str(declares))
+    assert cache.load(str(uses)).review == ["First Mate (line 2): Voyage 'fire_cannons' hasn't been charted! Use 'voyage' to create it first."]
+
+
+def test_prepared_script_lends_its_compiled_caches(tmp_path):
+    path = tmp_path / 'voyage.maroon'
+    path.write_text('x be 2\ny be x times 3 plus 1\nchoose x:\n    case 2: bark "two"\n    default: bark "other"\nend choose\n')
+    script = ScriptCache().load(str(path))
+    outputs = []
+    for _ in range(2):
+        interpreter = PirateInterpreter()
+        output = []
+        interpreter.output_sink = output.append
+        script.lend(interpreter)
+        interpreter.stats.reset()
+        for _ in interpreter.execute_lines(script.lines, review=script.review):
+            pass
+        outputs.append(output)
+        stats = interpreter.stats.snapshot()
+        script.give_back(interpreter)
+    assert outputs[0] == outputs[1] == ['two']
+    assert stats['expression_cache_misses'] == 0
+    assert stats['switch_cache_misses'] == 0
+    assert len(script.compiled) == 1
@@ -0,0 +1,64 @@
+import re
+
+from src.dialects import PirateDialect
+from src.interpreter import PirateInterpreter
+
+
+def dialect(**mappings):
+    result = PirateDialect('test')
+    for dialect_word, core_word in mappings.items():
+        result.add_mapping(dialect_word, core_word)
+    return result
+
+
+def sequential(mappings, command):
+    # What translating word by word, one substitution after another, gives.
+    for dialect_word, core_word in mappings.items():
+        command = re.sub(r'\b' + re.escape(dialect_word) + r'\b', core_word, command)
+    return command
+
+
+def test_one_pass_translation_matches_word_by_word():
+    mappings = {'shout': 'bark', 'gains': 'plus', 'stash': 'add', 'into': 'to'}
+    caribbean = dialect(**mappings)
+    for command in ['shout "ahoy"', 'x be y gains 1 gains z', 'stash 1 into chest', 'shouting gainsay']:
+        assert caribbean.translate_to_core(command) == sequential(mappings, command)
+
+
+def test_overlapping_words_fall_back_to_word_by_word():
+    mappings = {'a': 'b', 'b': 'c'}
+    assert dialect(**mappings).translate_to_core('a b') == sequential(mappings, 'a b') == 'c c'
+
+
+def test_translations_are_cached_until_the_dialect_changes():
+    caribbean = dialect(shout='bark')
+    assert caribbean.translate_to_core('shout 1') == 'bark 1'
+    assert caribbean.translate_to_core('shout 1') == 'bark 1'
+    assert (caribbean.hits, caribbean.misses) == (1, 1)
+    caribbean.add_mapping('bark', 'say')
+    assert caribbean.translate_to_core('shout 1') == sequential({'shout': 'bark', 'bark': 'say'}, 'shout 1')
+    assert caribbean.misses == 2
+
+
+def test_cache_stays_within_its_size():
+    caribbean = dialect(shout='bark')
+    caribbean.CACHE_SIZE = 4
+    for n in range(10):
+        caribbean.translate_to_core(f'shout {n}')
+    assert len(caribbean._translations) == 4
+
+
+def test_dialect_scripts_run_and_report_cache_hits():
+    interpreter = PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    source = ('dialect Caribbean:\n    "shout" be "bark"\n    "expedition" be "voyage"\n'
+              '    "gains" be "plus"\nend dialect\n'
+              'expedition bounty(x):\n    return x gains 10\nend expedition\n'
+              'repeat 3 times reward be bounty sails with 5\nshout "reward:", reward\n')
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    assert output == ["reward: 15"]
+    stats = interpreter.stats.snapshot()
+    assert stats['dialect_cache_hits'] >= 2
+    assert stats['dialect_cache_misses'] >= 1
@@ -0,0 +1,55 @@
+from src.interpreter import PirateInterpreter
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+EVERY_KIND = """voyage bump(x):
+    return x plus 1
+end voyage
+n be bump sails with 1
+loot be list of 3, 1, 2
+add 4 to loot
+repeat 2 times n be n plus 1
+plunder each item from loot bark item
+choose n:
+    case 4: bark "four"
+    default: bark "other"
+end choose
+brace for impact:
+    oops be missing plus 1
+if capsized as e, bark "caught"
+if n be equals 4, then bark "equal"
+bark "done", n
+"""
+
+
+def test_every_statement_kind_still_reaches_its_handler():
+    interpreter, output = run(EVERY_KIND)
+    assert output == ["3", "1", "2", "4", "four", "caught", "equal", "done 4"]
+    assert interpreter.resolve_variable('loot').value == [3, 1, 2, 4]
+    assert 'bump' in interpreter.pirate_crew
+
+
+def test_keywords_inside_names_do_not_change_the_dispatch():
+    interpreter, output = run('while_count be 2\nif_flag be 1\nrepeater be while_count plus if_flag\n'
+                              'bark repeater')
+    assert output == ["3"]
+
+
+def test_plain_statements_skip_handlers_they_cannot_match():
+    interpreter = PirateInterpreter()
+    calls = []
+    loops, switches = interpreter.loop_handler.handle_loop, interpreter.switch_handler.handle_switch
+    interpreter.loop_handler.handle_loop = lambda command: calls.append('loop') or loops(command)
+    interpreter.switch_handler.handle_switch = lambda command: calls.append('switch') or switches(command)
+    run('x be 1\nbark x\ny be x plus 2', interpreter)
+    assert calls == []
+    run('repeat 2 times x be x plus 1\nchoose x:\n    case 3: bark "three"\nend choose', interpreter)
+    assert calls == ['loop', 'switch', 'switch', 'switch']
@@ -0,0 +1,13 @@
+from src.eastereggs import PirateEasterEggs
+
+def test_easter_eggs_print_without_an_interpreter(capsys):
+    eggs = PirateEasterEggs()
+    assert eggs.interpreter is None
+    assert eggs.check_for_easter_eggs("x marks the spot")
+    assert "secret treasure map" in capsys.readouterr().out
+
+def test_parrot_mode_toggles_without_an_interpreter(capsys):
+    eggs = PirateEasterEggs()
+    eggs.check_for_easter_eggs("polly wants a cracker")
+    assert eggs.parrot_mode
+    assert "Parrot mode activated" in capsys.readouterr().out
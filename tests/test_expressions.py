@@ -0,0 +1,49 @@
+import pytest
+
+from src.exceptions import PirateException
+from src.expressions import MAX_DEOPTS, WARMUP, BinaryOp, QuickAdd, QuickMod
+from src.interpreter import PirateInterpreter
+from src.types import PirateType
+
+
+def site(expr, **values):
+    interpreter = PirateInterpreter()
+    for name, value in values.items():
+        interpreter.treasure_chest[name] = PirateType(value)
+    return interpreter, interpreter.expressions.lookup(expr)
+
+
+def test_numeric_site_quickens_and_deoptimizes():
+    interpreter, node = site('a plus b', a=2, b=3)
+    for _ in range(WARMUP):
+        assert node.evaluate(interpreter) == 5
+    assert type(node) is QuickAdd
+    assert node.evaluate(interpreter) == 5
+    interpreter.treasure_chest['b'] = PirateType(0.5)
+    assert node.evaluate(interpreter) == 2.5
+    assert type(node) is BinaryOp
+    assert interpreter.expressions.deoptimizations == 1
+
+
+def test_site_stays_generic_after_too_many_deopts():
+    interpreter, node = site('a plus b', a=1, b=1)
+    for _ in range(MAX_DEOPTS):
+        for value in [1] * WARMUP + ["x"]:
+            interpreter.treasure_chest['a'] = PirateType(value)
+            interpreter.treasure_chest['b'] = PirateType(value)
+            node.evaluate(interpreter)
+    interpreter.treasure_chest['a'] = interpreter.treasure_chest['b'] = PirateType(1)
+    for _ in range(WARMUP + 1):
+        node.evaluate(interpreter)
+    assert type(node) is BinaryOp
+
+
+def test_quickened_modulo_by_zero_keeps_its_error():
+    interpreter, node = site('a modulo b', a=7, b=3)
+    for _ in range(WARMUP):
+        node.evaluate(interpreter)
+    assert type(node) is QuickMod
+    interpreter.treasure_chest['b'] = PirateType(0)
+    with pytest.raises(PirateException, match="Modulo by zero"):
+        node.evaluate(interpreter)
+    assert type(node) is QuickMod
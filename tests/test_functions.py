@@ -0,0 +1,64 @@
+import pytest
+
+from src.exceptions import PirateException
+from src.functions import VoyageBatch
+from src.interpreter import PirateInterpreter
+
+
+def ship(*lines):
+    interpreter = PirateInterpreter()
+    interpreter.output_sink = lambda message: None
+    for line in lines:
+        interpreter.parse_command(line)
+    return interpreter
+
+
+SCORE = ("voyage score(x):", "    y be x times 3", "    bark y", "    z be y plus 1", "    return z modulo 7", "end voyage")
+
+
+def test_voyage_batch_compiles_plain_assignments_once():
+    interpreter = ship(*SCORE)
+    batch = VoyageBatch(interpreter, interpreter.pirate_crew['score'])
+    assert [(target, cmd) for target, _, cmd, _ in batch.steps] == [
+        ('y', 'y be x times 3'), (None, 'bark y'), ('z', 'z be y plus 1'), (None, 'return z modulo 7')]
+    assert interpreter.pirate_map([1, 2, 3], 'score') == [4, 0, 3]
+
+
+def test_voyage_batch_errors_match_a_plain_call():
+    interpreter = ship(*SCORE)
+    with pytest.raises(PirateException) as batched:
+        interpreter.pirate_map(["a"], 'score')
+    with pytest.raises(PirateException) as called:
+        interpreter.execute_function('score', ["a"])
+    assert str(called.value) in str(batched.value)
+
+
+BAD = ("voyage bad(x):", "    y be x divided_by 0", "    return y", "end voyage",
+       "voyage worse(x):", "    return x divided_by 0", "end voyage",
+       "voyage outer(x):", "    return bad sails with x", "end voyage")
+
+
+def error_of(interpreter, command):
+    with pytest.raises(PirateException) as raised:
+        interpreter.parse_command(command)
+    return raised.value
+
+
+def test_voyages_called_from_expressions_report_their_frame():
+    interpreter = ship(*BAD)
+    statement = error_of(interpreter, "a be bad sails with 2")
+    expression = error_of(ship(*BAD), "w be 3 plus bad sails with 2")
+    assert statement.voyages == expression.voyages == ['bad']
+    assert statement.line_number == expression.line_number
+    assert "⚓ Voyage: bad" in str(expression)
+    assert error_of(ship(*BAD), "w be outer sails with 2").voyages == ['bad', 'outer']
+
+
+def test_return_line_errors_report_their_command():
+    for command in ("a be worse sails with 2", "w be 1 plus worse sails with 2"):
+        error = error_of(ship(*BAD), command)
+        assert error.voyages == ['worse']
+        assert error.context == "Error in command: return x divided_by 0"
+    with pytest.raises(PirateException) as batched:
+        ship(*BAD).pirate_map([1], 'worse')
+    assert batched.value.voyages == ['worse']
@@ -0,0 +1,27 @@
+import pytest
+
+from src.interpreter import PirateInterpreter
+
+
+def run(source, type_inference):
+    interpreter = PirateInterpreter()
+    interpreter.type_inference = type_inference
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return output
+
+
+@pytest.mark.parametrize('source, expected', [
+    ("nums be list of\n"
+     "insert_sorted sails with nums, \"x\"\n"
+     "add 1 to nums\n"
+     "bark is_list_of_type sails with nums, \"number\"\n", ["False"]),
+    ("nums be list of 1, 2\n"
+     "insert_sorted sails with nums, true\n"
+     "bark is_list_of_type sails with nums, \"number\"\n", ["False"]),
+])
+def test_insert_sorted_is_not_proven_away(source, expected):
+    assert run(source, type_inference=True) == expected
+    assert run(source, type_inference=False) == expected
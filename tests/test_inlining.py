@@ -0,0 +1,64 @@
+import pytest
+
+from src.expressions import InlineCall
+from src.interpreter import PirateInterpreter
+from src.types import PirateType
+
+RATIO = "voyage ratio(a, b):\n    return a divided_by b\nend voyage\n"
+
+
+def run(source, inline_threshold=None):
+    interpreter = PirateInterpreter()
+    if inline_threshold is not None:
+        interpreter.expressions.inline_threshold = inline_threshold
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def test_inlined_call_counts_each_voyage_call_once():
+    interpreter, output = run(RATIO + "x be 0\nrepeat 4 times x be x plus ratio sails with 6, 3\nbark x\n")
+    assert output == ["8.0"]
+    stats = interpreter.stats.snapshot()
+    assert stats['voyage_calls'] == 4
+    assert stats['inlined_sites'] == 1
+
+
+def test_failing_inlined_call_replays_the_real_call_once():
+    source = RATIO + "y be ratio sails with 1, 0\n"
+    inlined, output = run(source)
+    plain, expected = run(source, inline_threshold=0)
+    assert output == expected
+    assert inlined.stats.voyage_calls == plain.stats.voyage_calls == 1
+
+
+def test_unexpected_errors_in_an_inlined_call_are_not_hidden():
+    interpreter, _ = run(RATIO + "a be 6\nb be 3\n")
+    node = interpreter.expressions.lookup("ratio sails with a, b")
+    assert isinstance(node, InlineCall)
+    assert node.evaluate(interpreter) == 2
+
+    class Broken:
+        def evaluate(self, interpreter):
+            raise RuntimeError("broken expansion")
+
+    node.frame.result = Broken()
+    with pytest.raises(RuntimeError, match="broken expansion"):
+        node.evaluate(interpreter)
+
+
+def test_site_drops_an_expansion_the_real_call_disagrees_with():
+    interpreter, _ = run(RATIO + "a be 6\nb be 3\n")
+    node = interpreter.expressions.lookup("ratio sails with a, b")
+    node.evaluate(interpreter)
+
+    class Wrong:
+        def evaluate(self, interpreter):
+            raise TypeError("wrong expansion")
+
+    node.frame.result = Wrong()
+    assert node.evaluate(interpreter) == 2
+    assert node.frame is None
+    assert node.evaluate(interpreter) == 2
@@ -0,0 +1,77 @@
+import pickle
+
+from src.interpreter import PirateInterpreter
+
+LIBRARY = """voyage greet(name be "matey"):
+    # a comment the body drops
+
+    bark "ahoy", name
+end voyage
+voyage scale(x, rate be 3):
+    return x times rate
+end voyage
+"""
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def is_lazy(function):
+    return '_load' in function.__dict__
+
+
+def test_bodies_are_read_on_first_use_and_match_the_eager_definition():
+    interpreter, _ = run(LIBRARY)
+    greet, scale = interpreter.pirate_crew['greet'], interpreter.pirate_crew['scale']
+    assert is_lazy(greet) and is_lazy(scale)
+    _, output = run('greet sails with\ny be scale sails with 2\nbark y', interpreter)
+    assert output == ["ahoy matey", "6"]
+    assert not is_lazy(greet) and not is_lazy(scale)
+
+    eager = PirateInterpreter()
+    for line_number, line in enumerate(LIBRARY.splitlines(), 1):
+        eager.parse_command(line.strip(), line_number)
+    for name in ('greet', 'scale'):
+        lazy, defined = interpreter.pirate_crew[name], eager.pirate_crew[name]
+        assert lazy.body == defined.body
+        assert lazy.line_numbers == defined.line_numbers
+        assert [(p, d.value if d is not None else None) for p, d in lazy.params] == \
+               [(p, d.value if d is not None else None) for p, d in defined.params]
+
+
+def test_imported_voyages_stay_unread_until_called(tmp_path):
+    (tmp_path / 'harbour.maroon').write_text(LIBRARY)
+    interpreter = PirateInterpreter()
+    interpreter.search_dir = str(tmp_path)
+    _, output = run('import harbour\ngreet sails with "Anne"', interpreter)
+    assert output == ["ahoy Anne"]
+    assert not is_lazy(interpreter.pirate_crew['greet'])
+    assert is_lazy(interpreter.pirate_crew['scale'])
+
+
+def test_defaults_that_read_variables_are_defined_eagerly():
+    interpreter, output = run('base be 5\nvoyage pay(x, rate be base):\n    return x times rate\nend voyage\n'
+                              'base be 7\nbark pay sails with 2')
+    assert not is_lazy(interpreter.pirate_crew['pay'])
+    assert output == ["10"]
+
+
+def test_dialects_and_unterminated_voyages_are_read_eagerly():
+    interpreter, _ = run('dialect Caribbean:\n    "shout" be "bark"\nend dialect\n' + LIBRARY)
+    assert not is_lazy(interpreter.pirate_crew['greet'])
+    interpreter, _ = run('voyage open(x):\n    return x')
+    assert 'open' not in interpreter.pirate_crew
+    assert interpreter.current_function.body == ['return x']
+
+
+def test_pickling_reads_the_body_first():
+    interpreter, _ = run(LIBRARY)
+    copy = pickle.loads(pickle.dumps(interpreter.pirate_crew['scale']))
+    assert copy.body == ['return x times rate']
+    assert copy.line_numbers == [7]
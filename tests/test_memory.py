@@ -0,0 +1,49 @@
+from src.interpreter import PirateInterpreter
+from src.memory import deep_size
+
+
+def run(interpreter, source):
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+
+
+def test_weighing_a_stream_leaves_out_the_interpreter():
+    interpreter = PirateInterpreter()
+    interpreter.output_sink = lambda message: None
+    run(interpreter, "voyage doubled(rows):\n"
+                     "    plunder each row from rows yield row times 2\n"
+                     "end voyage\n"
+                     "nums be list of 1, 2, 3\n"
+                     "s be doubled sails with nums\n")
+    # The stream holds its voyage and frame; the interpreter alone weighs far more.
+    empty_ship = deep_size(PirateInterpreter())
+    assert interpreter.pirate_chest_weight('s') < empty_ship // 4
+    assert interpreter.pirate_chest_weight() < empty_ship // 4
+
+
+def test_charges_near_the_cap_do_not_reweigh_every_time():
+    interpreter = PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    run(interpreter, "chest be list of\nrepeat 5000 times add 7 to chest\n")
+    memory = interpreter.memory
+    memory.limit = memory.weigh() + 3000
+    weighs = []
+    weigh = memory.weigh
+    memory.weigh = lambda: weighs.append(1) or weigh()
+    run(interpreter, 'repeat 1000 times s be split_loot sails with "a b c d"\n')
+    assert output == []
+    assert len(weighs) < 300
+
+
+def test_growing_past_the_cap_raises_a_memory_error():
+    interpreter = PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    interpreter.memory.limit = 20000
+    run(interpreter, "chest be list of\n"
+                     "brace for impact:\n"
+                     "    repeat 5000 times add \"doubloon\" to chest\n"
+                     "if capsized as e, bark error_kind sails with e\n")
+    assert output == ["memory"]
+    assert interpreter.memory.weigh() < 20000 * 9 // 8 + 1000
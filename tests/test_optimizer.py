@@ -0,0 +1,60 @@
+from src.expressions import BinaryOp, Const
+from src.interpreter import PirateInterpreter
+
+
+def run(source, optimize):
+    interpreter = PirateInterpreter()
+    interpreter.optimize = optimize
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def test_constant_expressions_fold_only_under_O():
+    plain = PirateInterpreter()
+    assert isinstance(plain.expressions.compile('2 times 3 plus 1'), BinaryOp)
+    optimized = PirateInterpreter()
+    optimized.optimize = True
+    node = optimized.expressions.compile('2 times 3 plus 1')
+    assert isinstance(node, Const)
+    assert node.value == plain.expressions.compile('2 times 3 plus 1').evaluate(plain)
+
+
+def test_folding_leaves_errors_and_huge_values_for_run_time():
+    interpreter = PirateInterpreter()
+    interpreter.optimize = True
+    assert isinstance(interpreter.expressions.compile('1 divided_by 0'), BinaryOp)
+    assert isinstance(interpreter.expressions.compile('2 power 1000'), BinaryOp)
+    assert isinstance(interpreter.expressions.compile('"ab" times 1000'), BinaryOp)
+
+
+def test_literals_share_one_box_under_O():
+    interpreter = PirateInterpreter()
+    interpreter.optimize = True
+    first = interpreter.expressions.compile('7')
+    second = interpreter.expressions.compile('7')
+    assert first is not second
+    assert first.boxed(interpreter) is second.boxed(interpreter)
+
+
+def test_dead_branches_are_removed_without_changing_output():
+    source = ('if 1 be less_than 2, then bark "live" else bark "dead"\n'
+              'if 3 be equals 4, then bark "never"\n'
+              'x be 5\n'
+              'if x be greater_than 2, then bark "kept"\n')
+    plain, expected = run(source, optimize=False)
+    optimized, output = run(source, optimize=True)
+    assert output == expected == ["live", "kept"]
+    assert optimized.optimizer.eliminated == 2
+    assert optimized.optimizer.optimize(source.splitlines()) == [
+        'bark "live"', '', 'x be 5', 'if x be greater_than 2, then bark "kept"']
+    structural = ['if 1 be equals 1, then return 2']
+    assert optimized.optimizer.optimize(structural) == structural
+
+
+def test_scripts_with_dialects_are_left_alone():
+    interpreter = PirateInterpreter()
+    lines = ['dialect Caribbean:', '    "shout" be "bark"', 'end dialect', 'if 1 be equals 1, then shout "x"']
+    assert interpreter.optimizer.optimize(lines) == lines
@@ -0,0 +1,46 @@
+import multiprocessing
+
+from src.batch import run_job
+from src.interpreter import PirateInterpreter
+
+ROLLS = """voyage roll(x):
+    return roll_dice sails with 1000
+end voyage
+chest be list of 1, 2, 3, 4, 5, 6
+bark par_map sails with chest, "roll"
+plunder each coin from chest in parallel bark coin
+"""
+
+
+def run(source, workers=2, seed=None):
+    interpreter = PirateInterpreter()
+    interpreter.parallel_handler.workers = workers
+    interpreter.parallel_handler.seed = seed
+    output = []
+    interpreter.output_sink = output.append
+    try:
+        for _ in interpreter.execute_lines(source.splitlines()):
+            pass
+    finally:
+        interpreter.parallel_handler.shutdown()
+    return output
+
+
+def test_seeded_parallel_runs_repeat_exactly():
+    first = run(ROLLS, seed=7)
+    assert first == run(ROLLS, workers=3, seed=7)
+    assert first[1:] == ['1', '2', '3', '4', '5', '6']
+
+
+def test_shutdown_lets_the_workers_go():
+    run(ROLLS)
+    assert multiprocessing.active_children() == []
+
+
+def test_batch_jobs_shut_their_pool_down(tmp_path):
+    script = tmp_path / 'rolls.maroon'
+    script.write_text(ROLLS)
+    result = run_job(str(script), workers=2, seed=7)
+    assert result['status'] == 'ok'
+    assert result['stdout'].splitlines()[1:] == ['1', '2', '3', '4', '5', '6']
+    assert multiprocessing.active_children() == []
@@ -0,0 +1,52 @@
+from src.interpreter import PirateInterpreter
+
+
+NESTED = """# Voyages calling voyages
+voyage tax(x):
+    return x times 2
+end voyage
+voyage settle(x):
+    t be tax sails with x
+    return t plus 1
+end voyage
+repeat 30 times owed be settle sails with 7
+bark owed
+"""
+
+
+def profile(source):
+    interpreter = PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    with interpreter.profile() as profiler:
+        for _ in interpreter.execute_lines(source.splitlines()):
+            pass
+    counts = {line_number: stats.count for (_, line_number), stats in profiler.lines.items()}
+    return profiler, counts, output
+
+
+def test_profiler_counts_each_line_as_it_runs():
+    profiler, counts, output = profile(NESTED)
+    assert output == ["15"]
+    assert counts[3] == counts[6] == counts[7] == 30
+    assert counts[9] == 31
+    assert counts[2] == counts[5] == counts[10] == 1
+    assert 1 not in counts and 4 not in counts and 8 not in counts
+    assert profiler.voyages['tax'].count == profiler.voyages['settle'].count == 30
+
+
+def test_profiler_times_return_lines_inside_their_voyage():
+    profiler, _, _ = profile(NESTED)
+    stacks = profiler.collapsed()
+    assert "voyage settle;<shell>:6;voyage tax;<shell>:3 " in stacks
+    assert "voyage settle;<shell>:7 " in stacks
+    report = profiler.report()
+    assert report.startswith("🏴‍☠️ Hot spots by self time")
+    assert "⚓ Voyages by cumulative time" in report
+
+
+def test_profiler_times_voyages_run_by_map():
+    _, counts, output = profile("voyage double(x):\n    return x times 2\nend voyage\n"
+                                "a be list of 1, 2, 3\nb be map sails with a, \"double\"\nbark b\n")
+    assert output == ["[2, 4, 6]"]
+    assert counts[2] == 3
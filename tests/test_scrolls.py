@@ -0,0 +1,59 @@
+from src.interpreter import PirateInterpreter
+from src.scrolls import Scroll
+from src.types import PirateType
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def test_scroll_joins_its_pieces_once():
+    scroll = Scroll('ahoy')
+    scroll.append(PirateType(' matey'))
+    scroll.append(3)
+    scroll.append('')
+    other = Scroll('!')
+    scroll.append(other)
+    assert len(scroll) == 12
+    assert scroll.pieces == ['ahoy', ' matey', '3', '!']
+    assert scroll.build() == 'ahoy matey3!'
+    assert scroll.pieces == ['ahoy matey3!']
+    assert scroll == 'ahoy matey3!' and scroll == Scroll('ahoy matey3!')
+    assert other.pieces == ['!']
+
+
+def test_reports_are_built_a_line_at_a_time():
+    interpreter, output = run('report be scroll sails with "Cargo"\nappend_line sails with report\n'
+                              'cargo be list of "rum", "gold"\n'
+                              'plunder each item from cargo append_line sails with report, item\n'
+                              'append sails with report, 7\nbark report\n'
+                              'text be build sails with report\nn be count_booty sails with report\nbark n')
+    assert output == ["Cargo\nrum\ngold\n7", "16"]
+    assert interpreter.resolve_variable('text').value == "Cargo\nrum\ngold\n7"
+
+
+def test_string_builtins_take_a_scroll():
+    _, output = run('tally be scroll sails with\nappend sails with tally, "a"\n'
+                    'append sails with tally, "|"\nappend sails with tally, 2\n'
+                    'parts be split_loot sails with tally, "|"\nbark parts\n'
+                    'shout be tally upper\nbark shout')
+    assert output == ["[a, 2]", "A|2"]
+
+
+def test_bark_writes_a_scroll_without_joining_it(capsys):
+    interpreter = PirateInterpreter()
+    for _ in interpreter.execute_lines(['log be scroll sails with "a"', 'append sails with log, "b"', 'bark log']):
+        pass
+    assert capsys.readouterr().out == "ab\n"
+    assert interpreter.resolve_variable('log').value.pieces == ['a', 'b']
+
+
+def test_only_scrolls_can_be_written_or_built():
+    _, output = run('text be "plain"\nappend sails with text, "x"\ny be build sails with text')
+    assert [message.splitlines()[0] for message in output] == [
+        "💀 Arr! Ye can only write on a scroll!", "💀 Arr! Ye can only build a scroll!"]
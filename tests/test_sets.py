@@ -0,0 +1,52 @@
+from src.interpreter import PirateInterpreter
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def values(interpreter, name):
+    return interpreter.resolve_variable(name).value
+
+
+def test_sets_hold_each_value_once():
+    interpreter, output = run('seen be set of 1, 2, 2, 3\nids be list of 3, 4, 4, 5\nledger be set of ids\n'
+                              't be to_set sails with ids\nempty be set of\n'
+                              'bark count_booty sails with seen\nbark type_of sails with t\n'
+                              'bark check_type sails with t, "set"\nbark count_booty sails with empty')
+    assert output == ["3", "set", "True", "0"]
+    assert values(interpreter, 'seen') == {1, 2, 3}
+    assert values(interpreter, 'ledger') == values(interpreter, 't') == {3, 4, 5}
+    assert values(interpreter, 'ids') == [3, 4, 4, 5]
+
+
+def test_add_and_remove_change_a_set_in_place():
+    interpreter, _ = run('seen be set of 1, 2\nids be list of 2, 7\nadd 9 to seen\nadd all ids to seen\n'
+                         'remove 1 from seen\nremove 42 from seen\nremove 42 from ids')
+    assert values(interpreter, 'seen') == {2, 7, 9}
+    assert values(interpreter, 'ids') == [2, 7]
+
+
+def test_set_algebra_takes_sets_or_lists():
+    interpreter, output = run('a be set of 1, 2, 3\nb be list of 2, 3, 4\nu be union sails with a, b\n'
+                              'i be intersection sails with b, a\nd be difference sails with a, b\n'
+                              'x be union sails with a, 3')
+    assert values(interpreter, 'u') == {1, 2, 3, 4}
+    assert values(interpreter, 'i') == {2, 3}
+    assert values(interpreter, 'd') == {1}
+    assert values(interpreter, 'a') == {1, 2, 3}
+    assert output[0].splitlines()[0] == "💀 Arr! union needs sets or lists, not int"
+
+
+def test_be_in_checks_sets_lists_and_strings():
+    _, output = run('seen be set of 1, 2\nids be list of 4\n'
+                    'if 2 be in seen, then bark "set" else bark "no"\n'
+                    'if 9 be in seen, then bark "yes" else bark "not in set"\n'
+                    'if 4 be in ids, then bark "list"\nif "rat" be in "pirate", then bark "string"\n'
+                    'plunder each n from seen bark n')
+    assert output == ["set", "not in set", "list", "string", "1", "2"]
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+from src.asyncapi import run_lines_async
+from src.interpreter import PirateInterpreter
+
+BUSY = ["x be 0", "repeat 2000 times x be x plus 1"]
+QUIET = ["y be 1", "repeat 20 times y be y times 2", 'bark "done"']
+
+
+def interpreter():
+    ship = PirateInterpreter()
+    ship.output_sink = lambda message: None
+    return ship
+
+
+def allocations_alone(lines):
+    ship = interpreter()
+    for _ in ship.execute_lines(lines):
+        pass
+    return ship.stats.snapshot()['allocations']
+
+
+def test_threads_count_only_their_own_allocations():
+    ships = [interpreter() for _ in range(4)]
+    scripts = [BUSY, QUIET, BUSY, QUIET]
+    start = threading.Barrier(len(ships))
+
+    def run(ship, lines):
+        start.wait()
+        for _ in range(5):
+            ship.stats.reset()
+            for _ in ship.execute_lines(lines):
+                pass
+
+    threads = [threading.Thread(target=run, args=pair) for pair in zip(ships, scripts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    quiet = allocations_alone(QUIET)
+    assert [ship.stats.snapshot()['allocations'] for ship in ships[1::2]] == [quiet, quiet]
+
+
+def test_async_voyages_count_only_their_own_allocations():
+    busy, quiet = interpreter(), interpreter()
+
+    async def both():
+        await asyncio.gather(run_lines_async(busy, BUSY, yield_every=1),
+                             run_lines_async(quiet, QUIET, yield_every=1))
+
+    asyncio.run(both())
+    assert quiet.stats.snapshot()['allocations'] == allocations_alone(QUIET)
+    assert busy.stats.snapshot()['allocations'] == allocations_alone(BUSY)
@@ -0,0 +1,38 @@
+from src.interpreter import PirateInterpreter
+from src.slices import ListSlice
+
+
+def run(source):
+    interpreter = PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def test_adding_to_a_slice_lands_in_the_list():
+    interpreter, output = run("loot be list of 1, 2, 3, 4, 5\n"
+                              "view be loot[1:3]\n"
+                              "add 9 to view\n")
+    assert output == []
+    assert interpreter.resolve_variable('view').value == [2, 3, 9]
+    assert interpreter.resolve_variable('loot').value == [1, 2, 3, 9, 4, 5]
+
+
+def test_is_list_of_type_agrees_with_type_of_on_slices():
+    interpreter, output = run("loot be list of 1, 2, \"three\"\n"
+                              "view be loot[0:2]\n"
+                              "bark type_of sails with view\n"
+                              "bark is_list_of_type sails with view, \"number\"\n"
+                              "bark is_list_of_type sails with loot, \"number\"\n")
+    assert output == ["list", "True", "False"]
+
+
+def test_slice_insert_clamps_to_the_window():
+    items = [0, 1, 2, 3]
+    view = ListSlice(items, 1, 3)
+    view.insert(-1, 'a')
+    view.insert(10, 'b')
+    assert items == [0, 1, 'a', 2, 'b', 3]
+    assert view == [1, 'a', 2, 'b']
@@ -0,0 +1,60 @@
+from src.interpreter import PirateInterpreter
+
+KEYS = """voyage neg(x):
+    return 0 minus x
+end voyage
+voyage parity(x):
+    return x modulo 2
+end voyage
+voyage evens(rows):
+    plunder each row from rows yield row times 2
+end voyage
+loot be list of 5, 3, 8, 1, 4, 6
+"""
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def test_sort_loot_returns_a_new_list_and_keeps_ties_in_order():
+    interpreter, output = run(KEYS + 'ranked be sort_loot sails with loot\nbark ranked\n'
+                              'bark sort_loot sails with loot, "neg"\nbark sort_loot sails with loot, "parity"\n'
+                              'bark sort_loot sails with loot, "abs"\nbark loot')
+    assert output == ["[1, 3, 4, 5, 6, 8]", "[8, 6, 5, 4, 3, 1]", "[8, 4, 6, 5, 3, 1]",
+                      "[1, 3, 4, 5, 6, 8]", "[5, 3, 8, 1, 4, 6]"]
+    assert interpreter.resolve_variable('ranked').value == [1, 3, 4, 5, 6, 8]
+
+
+def test_top_and_bottom_k_pick_without_a_full_sort():
+    _, output = run(KEYS + 'bark top_k sails with loot, 2\nbark bottom_k sails with loot, 3\n'
+                    'bark bottom_k sails with loot, 2, "neg"\nbark top_k sails with loot, 0\n'
+                    'stream be evens sails with loot\nbark top_k sails with stream, 2')
+    assert output == ["[8, 6]", "[1, 3, 4]", "[8, 6]", "[]", "[16, 12]"]
+
+
+def test_find_and_insert_keep_a_list_sorted():
+    interpreter, output = run('ids be list of 3, 7, 9, 12\nbark find_sorted sails with ids, 9\n'
+                              'bark find_sorted sails with ids, 8\ninsert_sorted sails with ids, 8\n'
+                              'insert_sorted sails with ids, 1\nbark find_sorted sails with ids, 8')
+    assert output == ["2", "-1", "3"]
+    assert interpreter.resolve_variable('ids').value == [1, 3, 7, 8, 9, 12]
+
+
+def test_bad_sorts_are_pirate_errors():
+    _, output = run(KEYS + 'mixed be list of 1, "a"\nm be sort_loot sails with mixed\n'
+                    't be top_k sails with loot, "two"\nu be sort_loot sails with loot, "nobody"\n'
+                    'stream be evens sails with loot\nf be find_sorted sails with stream, 2\n'
+                    'n be sort_loot sails with 5')
+    assert [message.splitlines()[0] for message in output] == [
+        "💀 Arr! Can't sort loot of different kinds: '<' not supported between instances of 'str' and 'int'",
+        "💀 Arr! Ye need a whole number of treasures to pick!",
+        "💀 Arr! Function nobody not found",
+        "💀 Arr! find_sorted needs a list it can look back into, not a stream",
+        "💀 Arr! sort_loot requires a list as the first argument",
+    ]
@@ -0,0 +1,58 @@
+from src.interpreter import PirateInterpreter
+from src.streams import yields
+
+VOYAGES = """voyage noisy(rows):
+    bark "start"
+    plunder each row from rows yield row
+    bark "end"
+end voyage
+voyage doubled(rows):
+    plunder each row from rows yield row times 2
+end voyage
+voyage first_two():
+    yield 1
+    if 1 be equals 1, then yield 2
+    return 0
+    yield 3
+end voyage
+loot be list of 1, 2, 3
+"""
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+def test_yield_is_found_directly_and_in_loop_and_if_actions():
+    assert yields('yield x')
+    assert yields('repeat 3 times yield 1')
+    assert yields('plunder each row from rows yield row')
+    assert yields('if x be equals 1, then bark x else yield x')
+    assert not yields('plunder each row from rows in parallel yield row')
+    assert not yields('x be yield_count plus 1')
+
+
+def test_a_stream_runs_its_body_only_as_items_are_pulled():
+    interpreter, output = run(VOYAGES + 's be noisy sails with loot\nbark "made"\nplunder each v from s bark v')
+    assert output == ["made", "start", "1", "2", "3", "end"]
+    assert interpreter.scope_stack == [interpreter.scope_stack[0]]
+    assert 'row' not in interpreter.scope_stack[0]
+
+
+def test_streams_feed_builtins_and_are_walked_once():
+    _, output = run(VOYAGES + 'd be doubled sails with loot\nn be count_booty sails with d\nbark n\n'
+                    'plunder each v from d bark v\n'
+                    'f be first_two sails with\nplunder each v from f bark v\nbark type_of sails with f')
+    assert output == ["3", "1", "2", "Stream"]
+
+
+def test_errors_in_a_stream_name_the_voyage():
+    _, output = run('voyage broken():\n    yield 1\n    yield missing plus 1\nend voyage\n'
+                    'b be broken sails with\nplunder each v from b bark v')
+    assert output[0] == "1"
+    assert "Voyage: broken" in output[1]
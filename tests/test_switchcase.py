@@ -0,0 +1,49 @@
+from src.interpreter import PirateInterpreter
+
+
+def run(source, interpreter=None):
+    interpreter = interpreter or PirateInterpreter()
+    output = []
+    interpreter.output_sink = output.append
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, output
+
+
+CLASSIFY = """voyage classify(n):
+    score be 99
+    choose n:
+        case 1: score be n plus 10
+        case 2: bark "two"
+        default: score be 0
+    end choose
+    return score
+end voyage
+a be classify sails with 1
+b be classify sails with 2
+c be classify sails with 7
+"""
+
+
+def test_switch_actions_are_parsed_once():
+    interpreter, output = run(CLASSIFY)
+    assert output == ["two"]
+    assert interpreter.resolve_variable('a').value == 11
+    assert interpreter.resolve_variable('b').value == 99
+    assert interpreter.resolve_variable('c').value == 0
+    handler = interpreter.switch_handler
+    (table,) = handler.tables.values()
+    assert (table.actions[0].target, table.actions[0].value) == ('score', 'n plus 10')
+    assert table.actions[1].target is None
+    assert table.default.target == 'score'
+    assert (handler.hits, handler.misses) == (2, 1)
+
+
+def test_switch_tables_are_capped():
+    interpreter = PirateInterpreter()
+    handler = interpreter.switch_handler
+    handler.CACHE_SIZE = 2
+    for value in range(4):
+        run(f"choose {value}:\n    case {value}: x be {value}\nend choose\n", interpreter)
+    assert len(handler.tables) == 2
+    assert interpreter.resolve_variable('x').value == 3
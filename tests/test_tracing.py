@@ -0,0 +1,64 @@
+import pytest
+
+from src.interpreter import PirateInterpreter
+
+SOURCE = """voyage double(x):
+    return x times 2
+end voyage
+total be 0
+repeat 3 times total be total plus 1
+y be double sails with total
+z be nothing plus 1
+"""
+
+
+def trace(every=1, events=None, source=SOURCE):
+    interpreter = PirateInterpreter()
+    interpreter.output_sink = lambda message: None
+    seen = []
+    interpreter.set_trace(seen.append, every, events)
+    for _ in interpreter.execute_lines(source.splitlines()):
+        pass
+    return interpreter, seen
+
+
+def test_trace_reports_statements_calls_loops_and_errors():
+    interpreter, seen = trace()
+    kinds = [event.kind for event in seen]
+    assert kinds.count('loop') == 3
+    assert kinds.count('call') == kinds.count('return') == 1
+    assert kinds.count('exception') == 1
+    call = next(event for event in seen if event.kind == 'call')
+    ret = next(event for event in seen if event.kind == 'return')
+    assert (call.detail, ret.detail, ret.value.value) == ('double', 'double', 6)
+    assert ret.voyage == 'double'
+    loops = [event.value for event in seen if event.kind == 'loop']
+    assert [iteration for iteration, _ in loops] == [0, 1, 2]
+    statements = [(event.line, event.detail) for event in seen if event.kind == 'statement']
+    assert (4, 'total be 0') in statements
+    error = next(event for event in seen if event.kind == 'exception')
+    assert error.line == 7
+
+
+def test_trace_can_pick_events_and_sample():
+    _, only_calls = trace(events=['call', 'return'])
+    assert [event.kind for event in only_calls] == ['call', 'return']
+    _, everything = trace()
+    _, sampled = trace(every=3)
+    assert len(sampled) == len(everything) // 3
+
+
+def test_trace_hook_can_be_removed():
+    interpreter, seen = trace()
+    count = len(seen)
+    assert interpreter.set_trace(None) is None
+    interpreter.parse_command("w be 1")
+    assert len(seen) == count
+
+
+def test_bad_trace_settings_are_refused():
+    interpreter = PirateInterpreter()
+    with pytest.raises(ValueError):
+        interpreter.set_trace(print, every=0)
+    with pytest.raises(ValueError, match="Unknown trace events: jump"):
+        interpreter.set_trace(print, events=['jump'])